@@ -0,0 +1,209 @@
+"""
+CPU and memory benchmark of the parse -> to_dict -> save_json hot paths.
+
+Run from the repository root:
+
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --width 20 --depth 3 --body-length 500 --more-ratio 0.1
+
+Record a baseline and check a later build against it:
+
+    python benchmarks/bench_pipeline.py --json baseline.json
+    python benchmarks/bench_pipeline.py --compare baseline.json --tolerance 0.15
+
+--compare exits with status 1 if any stage got slower (comments/s) or
+hungrier (peak memory) than the baseline by more than the tolerance.
+Timings vary between machines; compare baselines from the same machine.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import getred
+from getred.models import iter_comments
+from getred.parser import parse_thread
+from getred.utils import save_json
+from synthetic import synthetic_thread
+
+# name -> synthetic_thread arguments
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "wide": {"width": 30, "depth": 3, "body_length": 200, "more_ratio": 0.0},
+    "deep": {"width": 2, "depth": 14, "body_length": 200, "more_ratio": 0.0},
+    "long-bodies": {"width": 12, "depth": 3, "body_length": 4000, "more_ratio": 0.0},
+    "with-more": {"width": 30, "depth": 3, "body_length": 200, "more_ratio": 0.2},
+}
+
+
+def stages(json_data, out_dir: Path) -> List[Tuple[str, Callable[[], Any], Callable[[], Any]]]:
+    """(name, setup, stage) triples; setup builds the stage's input outside the measurement."""
+    thread = parse_thread(json_data)
+    return [
+        ("parse_thread", lambda: json_data, lambda data: parse_thread(data)),
+        ("to_dict", lambda: thread, lambda t: t.to_dict()),
+        ("save_json", lambda: thread, lambda t: save_json(t, out_dir / "pretty.json", pretty=True)),
+        ("save_json_compact", lambda: thread, lambda t: save_json(t, out_dir / "compact.json", pretty=False)),
+    ]
+
+
+def measure(setup, stage, repeat: int, min_time: float = 0.2) -> Tuple[float, int]:
+    """
+    Best time per call, and peak traced memory of one call.
+
+    Like timeit, fast stages are looped until a timed round takes at least
+    `min_time`, the best of `repeat` rounds is kept to filter out noise,
+    and the garbage collector is paused while timing.
+    """
+    value = setup()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        best = _best_time(stage, value, repeat, min_time)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    # Separate run: tracemalloc slows allocation-heavy code considerably
+    tracemalloc.start()
+    try:
+        stage(value)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def _best_time(stage, value, repeat: int, min_time: float) -> float:
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            stage(value)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            stage(value)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def run(scenarios: Dict[str, Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    """Benchmark every stage of every scenario."""
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, params in scenarios.items():
+            json_data = synthetic_thread(**params)
+            comments = sum(1 for _ in iter_comments(parse_thread(json_data).comments))
+            results[name] = {"params": params, "comments": comments, "stages": {}}
+            for stage_name, setup, stage in stages(json_data, Path(tmp)):
+                seconds, peak = measure(setup, stage, repeat)
+                results[name]["stages"][stage_name] = {
+                    "seconds": seconds,
+                    "comments_per_sec": comments / seconds,
+                    "peak_bytes": peak,
+                }
+    return {
+        "getred": getred.__version__,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"{'scenario':<14} {'stage':<18} {'comments':>9} {'time':>10} {'comments/s':>12} {'peak MB':>9}")
+    for name, result in report["results"].items():
+        for stage_name, stats in result["stages"].items():
+            print(
+                f"{name:<14} {stage_name:<18} {result['comments']:>9} "
+                f"{stats['seconds'] * 1000:>8.1f}ms {stats['comments_per_sec']:>12,.0f} "
+                f"{stats['peak_bytes'] / 1e6:>9.1f}"
+            )
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Describe every stage that regressed beyond the tolerance."""
+    regressions = []
+    for name, result in report["results"].items():
+        base_result = baseline["results"].get(name)
+        if base_result is None or base_result["params"] != result["params"]:
+            continue
+        for stage_name, stats in result["stages"].items():
+            base = base_result["stages"].get(stage_name)
+            if base is None:
+                continue
+            speed = stats["comments_per_sec"] / base["comments_per_sec"]
+            memory = stats["peak_bytes"] / base["peak_bytes"] if base["peak_bytes"] else 1.0
+            if speed < 1 - tolerance:
+                regressions.append(f"{name}/{stage_name}: {speed:.0%} of baseline comments/s")
+            if memory > 1 + tolerance:
+                regressions.append(f"{name}/{stage_name}: {memory:.0%} of baseline peak memory")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Only run these scenarios")
+    parser.add_argument("--width", type=int, help="Comments per list (custom scenario)")
+    parser.add_argument("--depth", type=int, help="Nesting levels (custom scenario)")
+    parser.add_argument("--body-length", type=int, help="Characters per comment body (overrides the scenarios)")
+    parser.add_argument(
+        "--more-ratio", type=float, help="Share of each list hidden behind 'more' (overrides the scenarios)"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per stage (best is reported)")
+    parser.add_argument("--json", type=Path, help="Write results as a baseline JSON file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression")
+    args = parser.parse_args(argv)
+
+    if args.width or args.depth:
+        scenarios = {
+            "custom": {
+                "width": args.width or 10,
+                "depth": args.depth or 3,
+                "body_length": 200,
+                "more_ratio": 0.0,
+            }
+        }
+    else:
+        scenarios = {name: dict(SCENARIOS[name]) for name in args.scenario or SCENARIOS}
+    for params in scenarios.values():
+        if args.body_length is not None:
+            params["body_length"] = args.body_length
+        if args.more_ratio is not None:
+            params["more_ratio"] = args.more_ratio
+
+    report = run(scenarios, args.repeat)
+    print_report(report)
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Baseline written to {args.json}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
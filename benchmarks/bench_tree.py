@@ -0,0 +1,89 @@
+"""
+Compare recursive and iterative comment tree parsing/serialization.
+
+Run from the repository root:
+
+    python benchmarks/bench_tree.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from getred.models import Comment
+from getred.parser import parse_comment, parse_timestamp
+from synthetic import deep_chain, wide_tree
+
+
+def parse_comment_recursive(comment_data, depth=0):
+    """The previous recursive implementation of parse_comment."""
+    data = comment_data.get('data', {})
+    comment = Comment(
+        id=data.get('id', ''),
+        author=data.get('author', '[deleted]'),
+        body=data.get('body', '[deleted]'),
+        score=data.get('score', 0),
+        created_utc=parse_timestamp(data.get('created_utc', 0)),
+        depth=depth,
+        replies=[]
+    )
+    replies_data = data.get('replies')
+    if replies_data and isinstance(replies_data, dict):
+        for reply_data in replies_data.get('data', {}).get('children', []):
+            if reply_data.get('kind') == 't1':
+                comment.replies.append(parse_comment_recursive(reply_data, depth + 1))
+    return comment
+
+
+def to_dict_recursive(comment):
+    """The previous recursive implementation of Comment.to_dict."""
+    return {
+        "id": comment.id,
+        "author": comment.author,
+        "body": comment.body,
+        "score": comment.score,
+        "created_utc": comment.created_utc,
+        "depth": comment.depth,
+        "replies": [to_dict_recursive(reply) for reply in comment.replies]
+    }
+
+
+def bench(label, recursive, iterative, number):
+    try:
+        recursive_time = min(timeit.repeat(recursive, number=number, repeat=5))
+        recursive_text = f"{recursive_time * 1000 / number:8.2f} ms"
+    except RecursionError:
+        recursive_time = None
+        recursive_text = "RecursionError"
+    iterative_time = min(timeit.repeat(iterative, number=number, repeat=5))
+    speedup = f"{recursive_time / iterative_time:5.2f}x" if recursive_time else "n/a"
+    print(f"{label:<28} {recursive_text:>14} {iterative_time * 1000 / number:8.2f} ms {speedup:>8}")
+
+
+def main():
+    print(f"{'case':<28} {'recursive':>14} {'iterative':>11} {'speedup':>8}")
+    cases = {
+        "deep chain (depth 500)": [deep_chain(500)],
+        "deep chain (depth 20000)": [deep_chain(20000)],
+        "wide tree (8^5)": wide_tree(8, 5),
+    }
+    for name, listing in cases.items():
+        bench(
+            f"parse {name}",
+            lambda: [parse_comment_recursive(item) for item in listing],
+            lambda: [parse_comment(item) for item in listing],
+            number=3,
+        )
+        comments = [parse_comment(item) for item in listing]
+        bench(
+            f"to_dict {name}",
+            lambda: [to_dict_recursive(comment) for comment in comments],
+            lambda: [comment.to_dict() for comment in comments],
+            number=3,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Synthetic Reddit API responses for benchmarks."""
+
+import random
+from typing import Any, Dict, List
+
+# Mix of ASCII and multi-byte text, so encoders see realistic escapes
+_BODY_WORDS = ["lorem", "ipsum", "dolor", "sit", "amet", "naïve", "café", "✓", "🐍", "\"quoted\"", "line\nbreak"]
+
+
+def make_comment(comment_id: str, replies: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build a raw t1 comment with the given raw replies."""
+    return {
+        "kind": "t1",
+        "data": {
+            "id": comment_id,
+            "author": f"user_{comment_id}",
+            "body": f"Comment body {comment_id}",
+            "score": len(comment_id),
+            "created_utc": 1609459200.0,
+            "replies": {"kind": "Listing", "data": {"children": replies}} if replies else "",
+        },
+    }
+
+
+def deep_chain(depth: int) -> Dict[str, Any]:
+    """A single reply chain `depth` comments long."""
+    comment = make_comment(f"d{depth - 1}", [])
+    for i in range(depth - 2, -1, -1):
+        comment = make_comment(f"d{i}", [comment])
+    return comment
+
+
+def wide_tree(width: int, depth: int) -> List[Dict[str, Any]]:
+    """`width` top-level comments, each with `width` replies, `depth` levels deep."""
+    def build(prefix: str, level: int) -> List[Dict[str, Any]]:
+        if level == depth:
+            return []
+        return [make_comment(f"{prefix}{i}", build(f"{prefix}{i}_", level + 1)) for i in range(width)]
+
+    return build("w", 0)
+
+
+def make_more(ids: List[str]) -> Dict[str, Any]:
+    """Build a raw "load more comments" stub hiding the given ids."""
+    return {"kind": "more", "data": {"count": len(ids), "children": ids}}
+
+
+def make_body(rng: random.Random, length: int) -> str:
+    """Random text of exactly `length` characters."""
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(_BODY_WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+
+def synthetic_thread(
+    width: int,
+    depth: int,
+    body_length: int = 200,
+    more_ratio: float = 0.0,
+    authors: int = 1000,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    A full thread response ([post listing, comments listing]) of a regular tree.
+
+    Every comment list holds `width` entries, `depth` levels deep. A
+    `more_ratio` share of each list is replaced by one "more" stub listing
+    the hidden ids, as Reddit does for large threads. Authors are drawn
+    from a pool of `authors` names so that they repeat like in real threads.
+    """
+    rng = random.Random(seed)
+    hidden = min(width, int(width * more_ratio))
+    visible = width - hidden
+    count = 0
+
+    def comment(comment_id: str, replies: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "kind": "t1",
+            "data": {
+                "id": comment_id,
+                "author": f"user_{rng.randrange(authors)}",
+                "body": make_body(rng, body_length),
+                "score": rng.randint(-20, 5000),
+                "created_utc": 1609459200.0 + rng.randrange(86400 * 30),
+                "replies": {"kind": "Listing", "data": {"children": replies}} if replies else "",
+            },
+        }
+
+    # Recursion depth equals `depth`; use deep_chain for very deep threads
+    def build(prefix: str, level: int) -> List[Dict[str, Any]]:
+        nonlocal count
+        if level == depth:
+            return []
+        children = []
+        for i in range(visible):
+            count += 1
+            children.append(comment(f"{prefix}{i:x}", build(f"{prefix}{i:x}_", level + 1)))
+        if hidden:
+            children.append(make_more([f"{prefix}{i:x}" for i in range(visible, width)]))
+        return children
+
+    comments = build("c", 0)
+    post = {
+        "kind": "t3",
+        "data": {
+            "id": "synthetic",
+            "title": f"Synthetic thread {width}x{depth}",
+            "author": "op",
+            "subreddit": "benchmarks",
+            "url": "https://www.reddit.com/r/benchmarks/comments/synthetic/thread/",
+            "selftext": make_body(rng, body_length),
+            "score": 1000,
+            "created_utc": 1609459200.0,
+            "num_comments": count,
+        },
+    }
+    return [
+        {"kind": "Listing", "data": {"children": [post]}},
+        {"kind": "Listing", "data": {"children": comments}},
+    ]
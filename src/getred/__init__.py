@@ -1,9 +1,33 @@
 """getred - A CLI tool to fetch Reddit threads and save them as structured JSON."""
 
-import importlib.metadata
+from importlib import import_module
 
-__version__ = importlib.metadata.version("getred")
+# Exported name -> defining module, imported on first access so that
+# `import getred` (and with it every CLI start) stays cheap
+_LAZY_EXPORTS = {
+    "Thread": "getred.models",
+    "Comment": "getred.models",
+    "CommentTable": "getred.table",
+    "CommentIndex": "getred.index",
+    "load_archive": "getred.archive",
+    "ThreadView": "getred.view",
+}
 
-from getred.models import Thread, Comment
+__all__ = ["Thread", "Comment", "CommentTable", "CommentIndex", "ThreadView", "load_archive", "__version__"]
 
-__all__ = ["Thread", "Comment", "__version__"]
+
+def __getattr__(name):
+    if name == "__version__":
+        # Reading the installed metadata costs more than the rest of the import
+        import importlib.metadata
+        value = importlib.metadata.version("getred")
+    elif name in _LAZY_EXPORTS:
+        value = getattr(import_module(_LAZY_EXPORTS[name]), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
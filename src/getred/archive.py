@@ -0,0 +1,425 @@
+"""Compact binary archive format for threads, with a memory-mapped reader."""
+
+import math
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
+
+from getred.models import Comment, Thread, iter_comments, timestamp_from_iso
+from getred.parser import parse_timestamp
+
+# File layout (all integers little-endian):
+#
+#   header    HEADER
+#   thread    THREAD, the thread's fields as string refs and integers
+#   comments  COMMENT * comment_count, one fixed-width record per comment
+#             in pre-order (a parent precedes its replies)
+#   offsets   uint64 * (string_count + 1), start of each string in the data
+#   data      UTF-8 bytes of every distinct string, back to back
+#
+# Strings (ids, authors, bodies, ...) are stored once in the string table
+# and referenced by index. A comment's timestamp is stored as a float;
+# only when the ISO string cannot be rebuilt from it exactly is the
+# original string kept as well, so round trips are lossless.
+
+MAGIC = b"GRDA"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHIIQQ")
+# id, title, author, subreddit, url, selftext, score, created_utc,
+# fetched_at, comment_count, pruned_count (NO_PRUNED_COUNT if None)
+THREAD = struct.Struct("<6Iq2Iqq")
+# score, timestamp, id, parent row, subtree end row, depth, author, body, raw timestamp
+COMMENT = struct.Struct("<qdIiIiIII")
+
+# String ref meaning "not stored"
+NO_STRING = 0xFFFFFFFF
+# pruned_count of a thread parsed without a filter
+NO_PRUNED_COUNT = -1
+
+
+class _StringTable:
+    """Deduplicating string table under construction."""
+
+    def __init__(self):
+        self.lookup: Dict[str, int] = {}
+        self.encoded: List[bytes] = []
+
+    def add(self, value: str) -> int:
+        index = self.lookup.get(value)
+        if index is None:
+            index = len(self.encoded)
+            self.lookup[value] = index
+            self.encoded.append(value.encode("utf-8"))
+        return index
+
+
+def _encode_timestamp(value: Union[float, str]):
+    """Return (float timestamp, whether the float alone reproduces value)."""
+    if type(value) is float:
+        return value, True
+    # A string Comment.created_utc is stored as is, with its timestamp if it has one
+    try:
+        return timestamp_from_iso(value), False
+    except (TypeError, ValueError, OverflowError):
+        return math.nan, False
+
+
+def write_archive(thread: Thread, fp: BinaryIO) -> None:
+    """
+    Write a thread in the binary archive format.
+
+    Args:
+        thread: Thread to serialize
+        fp: Binary file opened for writing
+
+    Raises:
+        ValueError: If the thread was parsed with a field projection; the
+            format has fixed columns
+    """
+    if thread.fields is not None:
+        raise ValueError("The archive format does not support --fields; use json or ndjson")
+
+    strings = _StringTable()
+    add = strings.add
+
+    rows: Dict[int, int] = {}
+    comments: List[Comment] = []
+    parents: List[int] = []
+    for comment, parent in iter_comments(thread.comments):
+        rows[id(comment)] = len(comments)
+        comments.append(comment)
+        parents.append(rows[id(parent)] if parent is not None else -1)
+
+    # Subtree sizes, accumulated bottom-up; a row's subtree ends at row + size
+    sizes = [1] * len(comments)
+    for row in range(len(comments) - 1, 0, -1):
+        parent = parents[row]
+        if parent >= 0:
+            sizes[parent] += sizes[row]
+
+    thread_record = THREAD.pack(
+        add(thread.id), add(thread.title), add(thread.author), add(thread.subreddit),
+        add(thread.url), add(thread.selftext), thread.score,
+        add(thread.created_utc), add(thread.fetched_at), thread.comment_count,
+        NO_PRUNED_COUNT if thread.pruned_count is None else thread.pruned_count,
+    )
+
+    records = bytearray(COMMENT.size * len(comments))
+    pack_into = COMMENT.pack_into
+    for row, comment in enumerate(comments):
+        timestamp, canonical = _encode_timestamp(comment.created_utc)
+        pack_into(
+            records, row * COMMENT.size,
+            comment.score, timestamp, add(comment.id), parents[row], row + sizes[row],
+            comment.depth, add(comment.author), add(comment.body),
+            NO_STRING if canonical else add(comment.created_utc),
+        )
+
+    offsets = [0]
+    for encoded in strings.encoded:
+        offsets.append(offsets[-1] + len(encoded))
+
+    offsets_pos = HEADER.size + THREAD.size + len(records)
+    data_pos = offsets_pos + 8 * len(offsets)
+
+    fp.write(HEADER.pack(MAGIC, VERSION, 0, len(comments), len(strings.encoded), offsets_pos, data_pos))
+    fp.write(thread_record)
+    fp.write(records)
+    fp.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+    for encoded in strings.encoded:
+        fp.write(encoded)
+
+
+def save_archive(thread: Thread, output_path: Path) -> None:
+    """
+    Save a thread as a binary archive.
+
+    Args:
+        thread: Thread to save
+        output_path: Path where to save the file
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(output_path, 'wb') as f:
+        write_archive(thread, f)
+
+
+class ThreadArchive:
+    """
+    Read-only, memory-mapped view of a binary thread archive.
+
+    Opening an archive reads only the header. Thread fields, comments and
+    strings are decoded on access, so any comment can be read without
+    decoding the rest of the file. Use archive[i] for a lazy
+    ArchivedComment; rows are in pre-order.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        with open(path, 'rb') as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"Not a getred archive: {path}") from None
+
+        if len(self._mm) < HEADER.size + THREAD.size:
+            self.close()
+            raise ValueError(f"Not a getred archive: {path}")
+        magic, version, _, count, string_count, offsets_pos, data_pos = HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not a getred archive: {path}")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported archive version {version}: {path}")
+
+        self._count = count
+        self._string_count = string_count
+        self._offsets_pos = offsets_pos
+        self._data_pos = data_pos
+        self._records_pos = HEADER.size + THREAD.size
+        self._thread = THREAD.unpack_from(self._mm, HEADER.size)
+
+    def __enter__(self) -> 'ThreadArchive':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, row: int) -> 'ArchivedComment':
+        if row < 0:
+            row += self._count
+        if not 0 <= row < self._count:
+            raise IndexError("comment row out of range")
+        return ArchivedComment(self, row)
+
+    def __iter__(self) -> Iterator['ArchivedComment']:
+        return (ArchivedComment(self, row) for row in range(self._count))
+
+    def string(self, index: int) -> str:
+        """Decode entry `index` of the string table."""
+        if not 0 <= index < self._string_count:
+            raise IndexError("string index out of range")
+        start, end = struct.unpack_from("<QQ", self._mm, self._offsets_pos + 8 * index)
+        return self._mm[self._data_pos + start:self._data_pos + end].decode("utf-8")
+
+    def record(self, row: int) -> tuple:
+        """Raw COMMENT record of a row."""
+        return COMMENT.unpack_from(self._mm, self._records_pos + row * COMMENT.size)
+
+    @property
+    def id(self) -> str:
+        return self.string(self._thread[0])
+
+    @property
+    def title(self) -> str:
+        return self.string(self._thread[1])
+
+    @property
+    def author(self) -> str:
+        return self.string(self._thread[2])
+
+    @property
+    def subreddit(self) -> str:
+        return self.string(self._thread[3])
+
+    @property
+    def url(self) -> str:
+        return self.string(self._thread[4])
+
+    @property
+    def selftext(self) -> str:
+        return self.string(self._thread[5])
+
+    @property
+    def score(self) -> int:
+        return self._thread[6]
+
+    @property
+    def created_utc(self) -> str:
+        return self.string(self._thread[7])
+
+    @property
+    def fetched_at(self) -> str:
+        return self.string(self._thread[8])
+
+    @property
+    def comment_count(self) -> int:
+        return self._thread[9]
+
+    @property
+    def pruned_count(self) -> Optional[int]:
+        if self._thread[10] == NO_PRUNED_COUNT:
+            return None
+        return self._thread[10]
+
+    def children(self, row: int) -> List[int]:
+        """Rows of the direct replies to a row, in order."""
+        end = self.record(row)[4]
+        child = row + 1
+        children = []
+        while child < end:
+            children.append(child)
+            child = self.record(child)[4]
+        return children
+
+    def roots(self) -> List[int]:
+        """Rows of the top-level comments, in order."""
+        roots = []
+        row = 0
+        while row < self._count:
+            roots.append(row)
+            row = self.record(row)[4]
+        return roots
+
+    def _make_comment(self, row: int) -> Comment:
+        score, timestamp, id_ref, _, _, depth, author_ref, body_ref, raw_ref = self.record(row)
+        return Comment(
+            id=self.string(id_ref),
+            author=self.string(author_ref),
+            body=self.string(body_ref),
+            score=score,
+            created_utc=timestamp if raw_ref == NO_STRING else self.string(raw_ref),
+            depth=depth,
+            replies=[]
+        )
+
+    def to_comments(self) -> List[Comment]:
+        """Materialize every comment as Comment trees."""
+        nodes: List[Comment] = []
+        roots: List[Comment] = []
+        for row in range(self._count):
+            comment = self._make_comment(row)
+            nodes.append(comment)
+            parent = self.record(row)[3]
+            if parent < 0:
+                roots.append(comment)
+            else:
+                nodes[parent].replies.append(comment)
+        return roots
+
+    def to_thread(self) -> Thread:
+        """Materialize the whole archive as a Thread."""
+        return Thread(
+            id=self.id,
+            title=self.title,
+            author=self.author,
+            subreddit=self.subreddit,
+            url=self.url,
+            selftext=self.selftext,
+            score=self.score,
+            created_utc=self.created_utc,
+            fetched_at=self.fetched_at,
+            comment_count=self.comment_count,
+            comments=self.to_comments(),
+            pruned_count=self.pruned_count
+        )
+
+
+class ArchivedComment:
+    """Read-only, lazily decoded view of one comment in a ThreadArchive."""
+
+    __slots__ = ('_archive', '_row')
+
+    def __init__(self, archive: ThreadArchive, row: int):
+        self._archive = archive
+        self._row = row
+
+    def __repr__(self) -> str:
+        return f"ArchivedComment(id={self.id!r}, depth={self.depth})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ArchivedComment):
+            return NotImplemented
+        return self._archive is other._archive and self._row == other._row
+
+    def __hash__(self) -> int:
+        return hash((id(self._archive), self._row))
+
+    @property
+    def row(self) -> int:
+        return self._row
+
+    @property
+    def id(self) -> str:
+        return self._archive.string(self._archive.record(self._row)[2])
+
+    @property
+    def author(self) -> str:
+        return self._archive.string(self._archive.record(self._row)[6])
+
+    @property
+    def body(self) -> str:
+        return self._archive.string(self._archive.record(self._row)[7])
+
+    @property
+    def score(self) -> int:
+        return self._archive.record(self._row)[0]
+
+    @property
+    def created_utc(self) -> str:
+        record = self._archive.record(self._row)
+        if record[8] != NO_STRING:
+            return self._archive.string(record[8])
+        return parse_timestamp(record[1])
+
+    @property
+    def created_utc_timestamp(self) -> float:
+        """Raw Unix timestamp (NaN if the stored string is not a timestamp)."""
+        return self._archive.record(self._row)[1]
+
+    @property
+    def depth(self) -> int:
+        return self._archive.record(self._row)[5]
+
+    @property
+    def parent(self) -> Optional['ArchivedComment']:
+        parent = self._archive.record(self._row)[3]
+        return ArchivedComment(self._archive, parent) if parent >= 0 else None
+
+    @property
+    def replies(self) -> List['ArchivedComment']:
+        return [ArchivedComment(self._archive, row) for row in self._archive.children(self._row)]
+
+    def to_comment(self) -> Comment:
+        """Materialize this comment and its subtree as a Comment."""
+        archive = self._archive
+        root = archive._make_comment(self._row)
+        stack = [(self._row, root)]
+        while stack:
+            row, comment = stack.pop()
+            for child in archive.children(row):
+                reply = archive._make_comment(child)
+                comment.replies.append(reply)
+                stack.append((child, reply))
+        return root
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert this comment and its subtree to dictionary format."""
+        return self.to_comment().to_dict()
+
+
+def load_archive(path: Union[str, Path]) -> ThreadArchive:
+    """
+    Open a binary thread archive written by save_archive.
+
+    The file is memory-mapped, not read; close the archive (or use it as a
+    context manager) when done.
+
+    Args:
+        path: Path of the archive file
+
+    Returns:
+        ThreadArchive giving random access to the thread and its comments
+
+    Raises:
+        ValueError: If the file is not a getred archive
+    """
+    return ThreadArchive(path)
@@ -0,0 +1,336 @@
+"""Concurrent fetching of many Reddit threads with one shared HTTP client."""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Union
+
+from getred.expand import expand_more
+from getred.fetcher import RedditFetcher
+from getred.filters import CommentFilter
+from getred.models import Thread
+from getred.parser import parse_thread, collect_more_ids
+from getred.sqlite import ThreadDatabase
+from getred.timings import Timings, measure
+from getred.utils import OUTPUT_FORMATS, validate_reddit_url, get_default_output_path, save_thread
+
+
+@dataclass
+class BatchItem:
+    """Outcome of fetching a single URL in a batch."""
+
+    url: str
+    output_path: Optional[Path] = None
+    comment_count: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchResult:
+    """Summary of a finished batch run."""
+
+    items: List[BatchItem] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for item in self.items if item.ok)
+
+    @property
+    def failed(self) -> int:
+        return len(self.items) - self.succeeded
+
+    @property
+    def threads_per_second(self) -> float:
+        return self.succeeded / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def read_urls(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Yield thread URLs from lines of text.
+
+    Blank lines and lines starting with '#' are skipped.
+    """
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+
+def output_path_for(url: str, output_dir: Optional[Path] = None, output_format: str = "json") -> Path:
+    """Return the output path for a URL, optionally inside a custom directory."""
+    default_path = get_default_output_path(url, OUTPUT_FORMATS[output_format])
+    if output_dir is None:
+        return default_path
+    return output_dir / default_path.name
+
+
+def fetch_parsed(
+    fetcher: RedditFetcher,
+    url: str,
+    expand: bool = False,
+    comment_filter: Optional[CommentFilter] = None,
+    fields: Optional[FrozenSet[str]] = None,
+) -> Thread:
+    """Fetch and parse a thread, resolving "more" placeholders and applying a filter and projection if asked."""
+    params = comment_filter.query_params() if comment_filter is not None else None
+    json_data = fetcher.fetch_thread(url, params)
+    with measure(fetcher.timings, "parse"):
+        thread = parse_thread(json_data, comment_filter, fields)
+    if expand:
+        more_ids = collect_more_ids(json_data[1]['data']['children'])
+        expand_more(thread, more_ids, fetcher, comment_filter=comment_filter)
+    if fetcher.timings is not None:
+        fetcher.timings.add_thread(thread)
+    return thread
+
+
+def batch_output_path(
+    url: str,
+    output_dir: Optional[Path] = None,
+    output_format: str = "json",
+    database: Optional[ThreadDatabase] = None,
+) -> Optional[Path]:
+    """
+    Output file for a URL, or None when it only goes to the database.
+
+    With a database, a file is only written if output_dir is also given.
+    """
+    if database is not None and output_dir is None:
+        return None
+    return output_path_for(url, output_dir, output_format)
+
+
+def save_fetched(
+    thread: Thread,
+    output_path: Optional[Path],
+    output_format: str = "json",
+    pretty: bool = True,
+    database: Optional[ThreadDatabase] = None,
+    timings: Optional[Timings] = None,
+) -> None:
+    """Save a thread to the database and/or output file."""
+    with measure(timings, "write"):
+        if database is not None:
+            database.save(thread)
+        if output_path is not None:
+            save_thread(thread, output_path, output_format, pretty=pretty)
+
+
+def fetch_one(
+    fetcher: RedditFetcher,
+    url: str,
+    output_dir: Optional[Path] = None,
+    pretty: bool = True,
+    expand: bool = False,
+    output_format: str = "json",
+    database: Optional[ThreadDatabase] = None,
+    comment_filter: Optional[CommentFilter] = None,
+    fields: Optional[FrozenSet[str]] = None,
+) -> BatchItem:
+    """Fetch, parse and save a single thread, capturing any error."""
+    if not validate_reddit_url(url):
+        return BatchItem(url=url, error="Invalid Reddit thread URL")
+
+    output_path = batch_output_path(url, output_dir, output_format, database)
+    try:
+        thread = fetch_parsed(fetcher, url, expand, comment_filter, fields)
+        save_fetched(thread, output_path, output_format, pretty, database, fetcher.timings)
+    except Exception as e:
+        return BatchItem(url=url, output_path=output_path, error=str(e) or type(e).__name__)
+
+    return BatchItem(url=url, output_path=output_path, comment_count=thread.comment_count)
+
+
+def run_batch(
+    urls: Iterable[str],
+    workers: int = 8,
+    output_dir: Optional[Path] = None,
+    pretty: bool = True,
+    expand: bool = False,
+    fetcher: Optional[RedditFetcher] = None,
+    on_result: Optional[Callable[[BatchItem], None]] = None,
+    output_format: str = "json",
+    database: Optional[ThreadDatabase] = None,
+    processes: Optional[int] = None,
+    chunksize: int = 1,
+    comment_filter: Optional[CommentFilter] = None,
+    fields: Optional[FrozenSet[str]] = None,
+) -> BatchResult:
+    """
+    Fetch many threads concurrently through a bounded worker pool.
+
+    All workers share a single pooled HTTP client. A failing URL is recorded
+    in the result and does not stop the remaining fetches.
+
+    Parsing and writing are pure Python and hold the GIL, so with many
+    large threads they keep a single core busy while the fetch threads
+    wait. Given `processes`, the fetch threads only download the response
+    bodies, and a pool of that many worker processes decodes, parses and
+    saves them; only a small status record per thread comes back.
+
+    Args:
+        urls: Reddit thread URLs to fetch
+        workers: Maximum number of concurrent fetches
+        output_dir: Directory for output files (default: ~/Downloads)
+        pretty: Whether to pretty-print the JSON
+        expand: Whether to resolve "more" placeholders
+        fetcher: Fetcher to use (default: a new RedditFetcher)
+        on_result: Called with each BatchItem as soon as it finishes
+        output_format: Output format, a key of utils.OUTPUT_FORMATS
+        database: Save threads to this database; files are then only
+            written if output_dir is given
+        processes: Parse and save in this many worker processes instead
+            of the fetch threads; not supported with `expand`
+        chunksize: With processes, the number of threads sent to a worker
+            at once while all workers are busy
+        comment_filter: Only keep the comments that pass this filter
+        fields: Only extract and save these fields (see models.parse_fields)
+
+    Returns:
+        BatchResult with one item per URL, in completion order
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    if processes is not None:
+        if processes < 1:
+            raise ValueError("processes must be at least 1")
+        if chunksize < 1:
+            raise ValueError("chunksize must be at least 1")
+        if expand:
+            raise ValueError("expand cannot be combined with processes")
+
+    fetcher = fetcher if fetcher is not None else RedditFetcher()
+    result = BatchResult()
+    start = time.perf_counter()
+
+    if processes is not None:
+        _run_in_processes(
+            urls, workers, processes, chunksize, output_dir, pretty, output_format, database, fetcher, result,
+            on_result, comment_filter, fields,
+        )
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    # At most 2 * workers URLs are in flight, so a long or streamed URL
+    # source is read as fetches finish instead of all up front
+    url_iter = iter(urls)
+    pending: Set[Future] = set()
+    with fetcher.shared_client(), ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            for url in islice(url_iter, 2 * workers - len(pending)):
+                pending.add(executor.submit(
+                    fetch_one, fetcher, url, output_dir, pretty, expand, output_format, database, comment_filter,
+                    fields,
+                ))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = future.result()
+                result.items.append(item)
+                if on_result is not None:
+                    on_result(item)
+
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _run_in_processes(
+    urls: Iterable[str],
+    workers: int,
+    processes: int,
+    chunksize: int,
+    output_dir: Optional[Path],
+    pretty: bool,
+    output_format: str,
+    database: Optional[ThreadDatabase],
+    fetcher: RedditFetcher,
+    result: BatchResult,
+    on_result: Optional[Callable[[BatchItem], None]],
+    comment_filter: Optional[CommentFilter],
+    fields: Optional[FrozenSet[str]],
+) -> None:
+    """
+    run_batch with fetching on threads and parsing and saving in processes.
+
+    Fetched bodies are collected into chunks of up to `chunksize`. A chunk
+    is sent off when it is full, when a worker process is idle, or when no
+    fetches are left. A fetch thread takes a permit before downloading a
+    body and the permit is returned once the body has been saved, so
+    bodies cannot pile up in memory when the workers fall behind.
+    """
+    from getred.process import SaveJob, chunk_results, process_pool, save_raw_threads
+
+    timings = fetcher.timings
+    database_path = str(database.path) if database is not None else None
+    permits = threading.Semaphore(workers + 2 * processes * chunksize)
+    params = comment_filter.query_params() if comment_filter is not None else None
+
+    def fetch(url: str) -> bytes:
+        permits.acquire()
+        try:
+            return fetcher.fetch_thread_bytes(url, params)
+        except BaseException:
+            permits.release()
+            raise
+
+    def finish(item: BatchItem):
+        result.items.append(item)
+        if on_result is not None:
+            on_result(item)
+
+    # future -> URL being fetched, or the chunk of jobs being saved
+    pending: Dict[Future, Union[str, List[SaveJob]]] = {}
+    fetches = saving = 0
+    chunk: List[SaveJob] = []
+
+    with fetcher.shared_client(), ThreadPoolExecutor(max_workers=workers) as threads, process_pool(processes) as pool:
+        for url in urls:
+            if not validate_reddit_url(url):
+                finish(BatchItem(url=url, error="Invalid Reddit thread URL"))
+                continue
+            pending[threads.submit(fetch, url)] = url
+            fetches += 1
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = pending.pop(future)
+                if isinstance(task, str):
+                    fetches -= 1
+                    output_path = batch_output_path(task, output_dir, output_format, database)
+                    try:
+                        chunk.append((task, future.result(), output_path))
+                    except Exception as e:
+                        finish(BatchItem(url=task, output_path=output_path, error=str(e) or type(e).__name__))
+                    continue
+
+                saving -= 1
+                for _ in task:
+                    permits.release()
+                for (url, _, output_path), processed in chunk_results(future, task):
+                    if timings is not None:
+                        for phase, seconds in processed.phases.items():
+                            timings.add(phase, seconds)
+                        if processed.error is None:
+                            timings.count("threads")
+                            timings.count("comments", processed.parsed_comments)
+                    finish(BatchItem(url, output_path, processed.comment_count, processed.error))
+
+            if chunk and (len(chunk) >= chunksize or saving < processes or not fetches):
+                future = pool.submit(
+                    save_raw_threads, chunk, output_format, pretty, database_path, comment_filter, fields
+                )
+                pending[future] = chunk
+                saving += 1
+                chunk = []
@@ -0,0 +1,227 @@
+"""Persistent on-disk HTTP cache implemented as an httpx transport."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+# Headers that describe the original connection, not the cached body
+_HOP_BY_HOP = {"connection", "keep-alive", "transfer-encoding"}
+
+
+@dataclass
+class CacheStats:
+    """Counters for cache activity."""
+
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    evictions: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        """Convert stats to dictionary format."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "evictions": self.evictions,
+        }
+
+
+class CachingTransport(httpx.BaseTransport):
+    """
+    Transport wrapper that caches successful GET responses on disk.
+
+    Responses are keyed by request URL (with sorted query parameters).
+    A cached response younger than `ttl` seconds is served without touching
+    the network. Older entries are revalidated with If-None-Match /
+    If-Modified-Since when the response carried an ETag or Last-Modified
+    header; a 304 refreshes the entry. Once the cached bodies exceed
+    `max_bytes`, the least recently used entries are evicted.
+
+    Bodies are stored as received (before content decoding), so the client
+    decodes cached and fresh responses the same way.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl: float = 300.0,
+        max_bytes: int = 256 * 1024 * 1024,
+        transport: Optional[httpx.BaseTransport] = None,
+    ):
+        """
+        Args:
+            cache_dir: Directory holding the cache files (created if missing)
+            ttl: Seconds a cached response is served without revalidation
+            max_bytes: Upper bound on the total size of cached bodies
+            transport: Transport used for network requests
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._transport = transport if transport is not None else httpx.HTTPTransport()
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # key -> [body size, last used]
+        self._index: Dict[str, list] = self._load_index()
+
+    @staticmethod
+    def cache_key(url: httpx.URL) -> str:
+        normalized = url.copy_with(query=None, fragment=None)
+        params = sorted(url.params.multi_items())
+        if params:
+            normalized = normalized.copy_merge_params(params)
+        return hashlib.sha256(str(normalized).encode("utf-8")).hexdigest()
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(size for size, _ in self._index.values())
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self.cache_dir / f"{key}.meta", self.cache_dir / f"{key}.body"
+
+    def _load_index(self) -> Dict[str, list]:
+        index = {}
+        for meta_path in self.cache_dir.glob("*.meta"):
+            body_path = meta_path.with_suffix(".body")
+            try:
+                index[meta_path.stem] = [body_path.stat().st_size, meta_path.stat().st_mtime]
+            except OSError:
+                continue
+        return index
+
+    def _read(self, key: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        meta_path, body_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        return meta, body
+
+    def _write(self, key: str, meta: Dict[str, Any], body: bytes) -> None:
+        meta_path, body_path = self._paths(key)
+        # Write to temporary files first so readers never see partial entries
+        for path, data in ((body_path, body), (meta_path, json.dumps(meta).encode("utf-8"))):
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        with self._lock:
+            self._index[key] = [len(body), time.time()]
+            self._evict()
+
+    def _touch(self, key: str, meta: Optional[Dict[str, Any]] = None) -> None:
+        meta_path, _ = self._paths(key)
+        if meta is not None:
+            meta_path.write_text(json.dumps(meta), encoding="utf-8")
+        now = time.time()
+        try:
+            os.utime(meta_path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            if key in self._index:
+                self._index[key][1] = now
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until under budget (lock held)."""
+        total = self.total_bytes
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            del self._index[key]
+            total -= size
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Delete every cached entry."""
+        with self._lock:
+            for key in list(self._index):
+                for path in self._paths(key):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+            self._index.clear()
+
+    @staticmethod
+    def _cached_response(meta: Dict[str, Any], body: bytes, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            status_code=meta["status"],
+            headers=meta["headers"],
+            content=body,
+            request=request,
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return self._transport.handle_request(request)
+
+        key = self.cache_key(request.url)
+        cached = self._read(key) if key in self._index else None
+
+        if cached is not None:
+            meta, body = cached
+            if time.time() - meta["stored_at"] < self.ttl:
+                self._count("hits")
+                self._touch(key)
+                return self._cached_response(meta, body, request)
+            if meta.get("etag"):
+                request.headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request.headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = self._transport.handle_request(request)
+
+        if cached is not None and response.status_code == 304:
+            response.close()
+            meta, body = cached
+            meta["stored_at"] = time.time()
+            self._count("revalidated")
+            self._touch(key, meta)
+            return self._cached_response(meta, body, request)
+
+        self._count("misses")
+        if response.status_code != 200:
+            return response
+
+        try:
+            # Iterate the transport stream directly to get the undecoded bytes
+            body = b"".join(response.stream)
+        finally:
+            response.close()
+        headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower() not in _HOP_BY_HOP
+        ]
+        meta = {
+            "url": str(request.url),
+            "status": response.status_code,
+            "headers": headers,
+            "stored_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        self._write(key, meta, body)
+        return self._cached_response(meta, body, request)
+
+    def close(self) -> None:
+        self._transport.close()
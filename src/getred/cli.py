@@ -1,20 +1,332 @@
-"""Command-line interface for getred."""
+"""
+Command-line interface for getred.
 
+Only what is needed to build the commands and validate their arguments is
+imported at module level; httpx, the parser and the output writers are
+imported inside the commands that use them, so `getred --version`, --help
+and argument errors return without loading them.
+"""
+
+from __future__ import annotations
+
+import json
 import sys
 import click
 from pathlib import Path
-from getred import __version__
-from getred.fetcher import RedditFetcher
-from getred.parser import parse_thread
-from getred.utils import validate_reddit_url, get_default_output_path, save_json
+from typing import TYPE_CHECKING, FrozenSet, Optional
+from getred.crawl import LISTING_SORTS, TIME_FILTERS, parse_subreddit
+from getred.utils import OUTPUT_FORMATS, validate_reddit_url, get_default_output_path
+
+if TYPE_CHECKING:
+    from getred.batch import BatchItem
+    from getred.fetcher import RedditFetcher
+    from getred.filters import CommentFilter
+    from getred.timings import Timings
+
+
+class DefaultCommandGroup(click.Group):
+    """Group that runs the default command when no subcommand is given."""
+
+    default_command = 'fetch'
+
+    def parse_args(self, ctx, args):
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names + ['--version']:
+            args = [self.default_command] + list(args)
+        return super().parse_args(ctx, args)
+
+
+def cache_options(command):
+    """Add the on-disk cache options to a command."""
+    command = click.option(
+        '--cache-max-mb',
+        type=click.FloatRange(min=0),
+        default=256.0,
+        show_default=True,
+        help='Evict least recently used cache entries beyond this size'
+    )(command)
+    command = click.option(
+        '--cache-ttl',
+        type=click.FloatRange(min=0),
+        default=300.0,
+        show_default=True,
+        help='Seconds to serve cached responses before revalidating'
+    )(command)
+    command = click.option(
+        '--cache-dir',
+        type=click.Path(file_okay=False, path_type=Path),
+        help='Cache responses on disk in this directory'
+    )(command)
+    return command
+
+
+def format_option(command):
+    """Add the output format option to a command."""
+    return click.option(
+        '-f', '--format', 'output_format',
+        type=click.Choice(list(OUTPUT_FORMATS)),
+        default='json',
+        show_default=True,
+        help='Nested JSON document, NDJSON with one line per comment, or binary archive'
+    )(command)
+
+
+def sqlite_option(command):
+    """Add the SQLite sink option to a command."""
+    return click.option(
+        '--sqlite', 'sqlite_path',
+        type=click.Path(dir_okay=False, path_type=Path),
+        help='Save into this SQLite database (instead of a file, unless an output is given)'
+    )(command)
+
+
+def timings_option(command):
+    """Add the --timings option to a command."""
+    return click.option(
+        '--timings', 'timings_format',
+        is_flag=False,
+        flag_value='text',
+        type=click.Choice(['text', 'json']),
+        help='Print where the time went (connect, download, parse, write, ...) to stderr; --timings=json for JSON'
+    )(command)
+
+
+def echo_timings(timings: Optional[Timings], timings_format: Optional[str]):
+    """Print collected timings to stderr in the requested format."""
+    if timings is None:
+        return
+    if timings_format == 'json':
+        click.echo(json.dumps(timings.to_dict()), err=True)
+    else:
+        click.echo(timings.format(), err=True)
+
+
+def filter_options(command):
+    """Add the comment filter options to a command."""
+    def since_timestamp(ctx, param, value):
+        if value is None:
+            return None
+        from getred.filters import parse_since
+        try:
+            return parse_since(value)
+        except ValueError as e:
+            raise click.BadParameter(str(e), ctx=ctx, param=param)
+
+    command = click.option(
+        '--since',
+        callback=since_timestamp,
+        help='Only keep comments posted since this age (24h, 7d) or date (2024-01-31)'
+    )(command)
+    command = click.option(
+        '--top',
+        type=click.IntRange(min=1),
+        help='Only keep the N highest-scored top-level comments'
+    )(command)
+    command = click.option(
+        '--min-score',
+        type=int,
+        help='Only keep comments with at least this score'
+    )(command)
+    command = click.option(
+        '--max-depth',
+        type=click.IntRange(min=0),
+        help='Only keep comments up to this depth (0 = top-level only)'
+    )(command)
+    return command
+
+
+def make_comment_filter(
+    max_depth: Optional[int] = None,
+    min_score: Optional[int] = None,
+    top: Optional[int] = None,
+    since: Optional[float] = None,
+) -> Optional[CommentFilter]:
+    """Build the filter for the given options, or None if none was given."""
+    if max_depth is None and min_score is None and top is None and since is None:
+        return None
+    from getred.filters import CommentFilter
+    return CommentFilter(max_depth=max_depth, min_score=min_score, since=since, top=top)
+
+
+def fields_option(command):
+    """Add the field projection option to a command."""
+    def projection(ctx, param, value):
+        if value is None:
+            return None
+        from getred.models import parse_fields
+        try:
+            return parse_fields(value.split(','))
+        except ValueError as e:
+            raise click.BadParameter(str(e), ctx=ctx, param=param)
+
+    return click.option(
+        '--fields',
+        callback=projection,
+        help='Only extract and save these comma-separated fields, e.g. id,author,score,created_utc'
+    )(command)
+
+
+def reject_archive_fields(output_format: str, fields: Optional[FrozenSet[str]]) -> None:
+    """Exit with an error for --fields with the archive format, which has fixed columns."""
+    if fields is not None and output_format == 'archive':
+        click.echo("Error: --fields cannot be combined with --format archive", err=True)
+        sys.exit(1)
+
+
+def json_backend_option(command):
+    """Add the JSON library option to a command."""
+    def select_backend(ctx, param, value):
+        if value is None:
+            return
+        from getred.jsonbackend import set_backend
+        try:
+            set_backend(value)
+        except ValueError as e:
+            raise click.BadParameter(str(e), ctx=ctx, param=param)
+
+    return click.option(
+        '--json-backend',
+        callback=select_backend,
+        expose_value=False,
+        help='JSON library: auto, orjson, msgspec, ujson or json (default: $GETRED_JSON_BACKEND, else auto)'
+    )(command)
+
+
+def rate_options(command):
+    """Add the request rate and retry options to a command."""
+    command = click.option(
+        '--max-retries',
+        type=click.IntRange(min=0),
+        default=3,
+        show_default=True,
+        help='Retries for rate-limited, 5xx or failed requests'
+    )(command)
+    command = click.option(
+        '--rate',
+        type=click.FloatRange(min=0, min_open=True),
+        default=1.0,
+        show_default=True,
+        help="Requests per second until Reddit's rate limit headers say otherwise"
+    )(command)
+    return command
+
+
+def pool_options(command):
+    """Add the connection pool options to a command."""
+    command = click.option(
+        '--http2/--no-http2',
+        default=None,
+        help='Negotiate HTTP/2 (default: if the getred[http2] extra is installed)'
+    )(command)
+    command = click.option(
+        '--max-connections',
+        type=click.IntRange(min=1),
+        help='Most connections open to Reddit at once (default: 32)'
+    )(command)
+    return command
+
+
+def make_fetcher(
+    cache_dir=None,
+    cache_ttl: float = 300.0,
+    cache_max_mb: float = 256.0,
+    rate: float = 1.0,
+    max_retries: int = 3,
+    timings: Optional[Timings] = None,
+    max_connections: Optional[int] = None,
+    http2: Optional[bool] = None,
+) -> RedditFetcher:
+    """
+    Create a rate-limited fetcher, wrapped in an on-disk cache if a directory is given.
+
+    The limiter sits below the cache, so cache hits do not use up requests,
+    and above the pooled network transport, which is built with the
+    fetcher's pool limits and HTTP/2 setting.
+    """
+    from getred.cache import CachingTransport
+    from getred.fetcher import RedditFetcher
+    from getred.pool import http2_available, network_transport, pool_limits
+    from getred.ratelimit import RateLimiter, RateLimitedTransport, RetryPolicy
+
+    if http2 and not http2_available():
+        raise click.UsageError("--http2 requires the h2 package: pip install getred[http2]")
+    if http2 is None:
+        http2 = http2_available()
+    limits = pool_limits(max_connections)
+    transport = RateLimitedTransport(RateLimiter(rate=rate), network_transport(limits, http2))
+    if cache_dir is not None:
+        transport = CachingTransport(
+            cache_dir, ttl=cache_ttl, max_bytes=int(cache_max_mb * 1024 * 1024), transport=transport
+        )
+    return RedditFetcher(
+        transport=transport, retry=RetryPolicy(max_retries=max_retries), timings=timings, limits=limits, http2=http2
+    )
 
 
-@click.command()
+def echo_cache_stats(fetcher: RedditFetcher):
+    """Print cache hit/miss counters if the fetcher uses the cache."""
+    from getred.cache import CachingTransport
+
+    if isinstance(fetcher.transport, CachingTransport):
+        stats = fetcher.transport.stats
+        click.echo(
+            f"Cache: {stats.hits} hits, {stats.misses} misses, "
+            f"{stats.revalidated} revalidated, {stats.evictions} evicted"
+        )
+
+
+def echo_connection_stats(fetcher: RedditFetcher):
+    """Print how many requests reused a kept-alive connection, if any went out."""
+    stats = fetcher.connection_stats
+    if stats.requests:
+        http2 = f", {stats.http2} over HTTP/2" if stats.http2 else ""
+        click.echo(
+            f"Connections: {stats.opened} opened, {stats.reused}/{stats.requests} requests "
+            f"on a reused connection{http2}"
+        )
+
+
+def batch_reporter(quiet: bool, sqlite_path=None):
+    """Return an on_result callback printing one line per finished thread."""
+    def report(item: BatchItem):
+        destination = item.output_path or sqlite_path
+        if not item.ok:
+            click.echo(f"Error: {item.url}: {item.error}", err=True)
+        elif quiet:
+            click.echo(str(destination))
+        else:
+            click.echo(f"✓ {item.url} -> {destination} ({item.comment_count} comments)")
+    return report
+
+
+def echo_batch_summary(result, fetcher: RedditFetcher):
+    """Print the totals of a batch or crawl run."""
+    click.echo(
+        f"Fetched {result.succeeded}/{len(result.items)} threads "
+        f"in {result.elapsed:.2f}s ({result.threads_per_second:.2f} threads/s), "
+        f"{result.failed} failed"
+    )
+    echo_cache_stats(fetcher)
+    echo_connection_stats(fetcher)
+
+
+@click.group(cls=DefaultCommandGroup)
+@click.version_option(package_name='getred', prog_name='getred')
+def main():
+    """
+    Fetch Reddit threads and save them as structured JSON.
+
+    Run `getred URL` to fetch a single thread, `getred batch FILE` to
+    fetch many threads at once, or `getred crawl r/SUB` to fetch the
+    threads of a subreddit.
+    """
+
+
+@main.command()
 @click.argument('url')
 @click.option(
     '-o', '--output',
     type=click.Path(path_type=Path),
-    help='Custom output path (default: ~/Downloads/<slug>.json)'
+    help='Custom output path (default: ~/Downloads/<slug>.<format>)'
 )
 @click.option(
     '-p', '--pretty/--no-pretty',
@@ -26,8 +338,32 @@ from getred.utils import validate_reddit_url, get_default_output_path, save_json
     is_flag=True,
     help='Suppress progress output'
 )
-@click.version_option(version=__version__, prog_name='getred')
-def main(url: str, output: Path, pretty: bool, quiet: bool):
+@click.option(
+    '--expand-more', 'expand',
+    is_flag=True,
+    help='Resolve "load more comments" placeholders for a complete tree'
+)
+@click.option(
+    '--stream',
+    is_flag=True,
+    help='Parse comments while the response downloads (lower peak memory)'
+)
+@format_option
+@sqlite_option
+@cache_options
+@rate_options
+@pool_options
+@filter_options
+@fields_option
+@timings_option
+@json_backend_option
+def fetch(url: str, output: Path, pretty: bool, quiet: bool, expand: bool, stream: bool, output_format: str,
+          sqlite_path: Path,
+          cache_dir: Path, cache_ttl: float, cache_max_mb: float,
+          rate: float, max_retries: int, max_connections: Optional[int], http2: Optional[bool],
+          timings_format: Optional[str],
+          max_depth: Optional[int], min_score: Optional[int], top: Optional[int], since: Optional[float],
+          fields: Optional[FrozenSet[str]]):
     """
     Fetch a Reddit thread and save it as structured JSON.
 
@@ -39,39 +375,506 @@ def main(url: str, output: Path, pretty: bool, quiet: bool):
         click.echo("Error: Invalid Reddit thread URL", err=True)
         click.echo("Expected format: https://www.reddit.com/r/SUBREDDIT/comments/ID/TITLE/", err=True)
         sys.exit(1)
+    reject_archive_fields(output_format, fields)
+
+    from getred.expand import expand_more
+    from getred.parser import parse_thread, collect_more_ids
+    from getred.sqlite import ThreadDatabase
+    from getred.timings import Timings, measure
+    from getred.utils import save_thread
 
-    # Determine output path
-    output_path = output if output else get_default_output_path(url)
+    # Determine output path; a database replaces the default output file
+    if output:
+        output_path = output
+    elif sqlite_path:
+        output_path = None
+    else:
+        output_path = get_default_output_path(url, OUTPUT_FORMATS[output_format])
 
     if not quiet:
         click.echo(f"Fetching thread from Reddit...")
 
+    timings = Timings() if timings_format else None
+    comment_filter = make_comment_filter(max_depth, min_score, top, since)
     try:
-        # Fetch thread data
-        fetcher = RedditFetcher()
-        json_data = fetcher.fetch_thread(url)
+        with make_fetcher(cache_dir, cache_ttl, cache_max_mb, rate, max_retries, timings,
+                          max_connections=max_connections, http2=http2) as fetcher:
+            if stream:
+                # Fetch and parse in one pass
+                more_ids = []
+                thread = fetcher.stream_thread(
+                    url, more_ids=more_ids, comment_filter=comment_filter, fields=fields
+                )
+            else:
+                # Fetch thread data; the server already drops what it can of the filtered comments
+                params = comment_filter.query_params() if comment_filter is not None else None
+                json_data = fetcher.fetch_thread(url, params)
+
+                if not quiet:
+                    click.echo(f"Parsing comments...")
+
+                # Parse into structured format
+                with measure(timings, "parse"):
+                    thread = parse_thread(json_data, comment_filter, fields)
+                if timings is not None:
+                    timings.add_thread(thread)
+                more_ids = collect_more_ids(json_data[1]['data']['children']) if expand else []
+
+            if expand:
+                if not quiet:
+                    click.echo(f"Resolving {len(more_ids)} hidden comments...")
+                expand_more(thread, more_ids, fetcher, comment_filter=comment_filter)
 
         if not quiet:
-            click.echo(f"Parsing comments...")
+            pruned = f", pruned {thread.pruned_count}" if thread.pruned_count is not None else ""
+            click.echo(f"Found {thread.comment_count} comments (parsed {len(thread.comments)} top-level{pruned})")
+            echo_cache_stats(fetcher)
+            echo_connection_stats(fetcher)
+
+        saved = []
+        with measure(timings, "write"):
+            if sqlite_path:
+                with ThreadDatabase(sqlite_path) as database:
+                    database.save(thread)
+                saved.append(sqlite_path)
+
+            # Save to file
+            if output_path:
+                save_thread(thread, output_path, output_format, pretty=pretty)
+                saved.append(output_path)
+
+        for path in saved:
+            if not quiet:
+                click.echo(f"✓ Saved to: {path}")
+            else:
+                click.echo(str(path))
+
+        echo_timings(timings, timings_format)
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@main.command()
+@click.argument('source', type=click.File('r', encoding='utf-8'))
+@click.option(
+    '-d', '--output-dir',
+    type=click.Path(file_okay=False, path_type=Path),
+    help='Directory for output files (default: ~/Downloads)'
+)
+@click.option(
+    '-w', '--workers',
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help='Number of concurrent fetches'
+)
+@click.option(
+    '-P', '--processes',
+    type=click.IntRange(min=1),
+    help='Parse and save in this many worker processes (default: in the fetch threads)'
+)
+@click.option(
+    '--chunksize',
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help='Threads handed to a worker process at once while all are busy'
+)
+@click.option(
+    '-p', '--pretty/--no-pretty',
+    default=True,
+    help='Pretty-print JSON (default: enabled)'
+)
+@click.option(
+    '-q', '--quiet',
+    is_flag=True,
+    help='Only print output paths and errors'
+)
+@click.option(
+    '--expand-more', 'expand',
+    is_flag=True,
+    help='Resolve "load more comments" placeholders for a complete tree'
+)
+@format_option
+@sqlite_option
+@cache_options
+@rate_options
+@pool_options
+@filter_options
+@fields_option
+@timings_option
+@json_backend_option
+def batch(source, output_dir: Path, workers: int, processes: Optional[int], chunksize: int,
+          pretty: bool, quiet: bool, expand: bool, output_format: str,
+          sqlite_path: Path,
+          cache_dir: Path, cache_ttl: float, cache_max_mb: float,
+          rate: float, max_retries: int, max_connections: Optional[int], http2: Optional[bool],
+          timings_format: Optional[str],
+          max_depth: Optional[int], min_score: Optional[int], top: Optional[int], since: Optional[float],
+          fields: Optional[FrozenSet[str]]):
+    """
+    Fetch many Reddit threads listed in SOURCE, one URL per line.
+
+    Use - to read URLs from stdin. Blank lines and lines starting with #
+    are ignored. A failing URL is reported and the run continues.
+
+    Parsing and saving large threads is CPU-bound; with --processes it
+    runs on that many cores while the fetch threads keep downloading.
+    """
+    if processes and expand:
+        click.echo("Error: --expand-more cannot be combined with --processes", err=True)
+        sys.exit(1)
+    reject_archive_fields(output_format, fields)
+
+    from getred.batch import read_urls, run_batch
+    from getred.sqlite import ThreadDatabase
+    from getred.timings import Timings
+
+    report = batch_reporter(quiet, sqlite_path)
+    timings = Timings() if timings_format else None
+    fetcher = make_fetcher(cache_dir, cache_ttl, cache_max_mb, rate, max_retries, timings,
+                           max_connections=max_connections, http2=http2)
+    database = ThreadDatabase(sqlite_path) if sqlite_path else None
+    try:
+        result = run_batch(
+            read_urls(source),
+            workers=workers,
+            output_dir=output_dir,
+            pretty=pretty,
+            expand=expand,
+            fetcher=fetcher,
+            on_result=report,
+            output_format=output_format,
+            database=database,
+            processes=processes,
+            chunksize=chunksize,
+            comment_filter=make_comment_filter(max_depth, min_score, top, since),
+            fields=fields,
+        )
+    finally:
+        if database is not None:
+            database.close()
+
+    if not quiet:
+        echo_batch_summary(result, fetcher)
+    echo_timings(timings, timings_format)
+
+    if result.failed:
+        sys.exit(1)
+
+
+@main.command()
+@click.argument('subreddit')
+@click.option(
+    '--sort',
+    type=click.Choice(LISTING_SORTS),
+    default='new',
+    show_default=True,
+    help='Listing order'
+)
+@click.option(
+    '--time', 'time_filter',
+    type=click.Choice(TIME_FILTERS),
+    help='Time window for --sort top/controversial'
+)
+@click.option(
+    '-n', '--limit',
+    type=click.IntRange(min=1),
+    default=100,
+    show_default=True,
+    help='Maximum number of threads to fetch'
+)
+@click.option(
+    '-d', '--output-dir',
+    type=click.Path(file_okay=False, path_type=Path),
+    help='Directory for output files (default: ~/Downloads)'
+)
+@click.option(
+    '-w', '--workers',
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help='Number of concurrent fetches'
+)
+@click.option(
+    '-p', '--pretty/--no-pretty',
+    default=True,
+    help='Pretty-print JSON (default: enabled)'
+)
+@click.option(
+    '-q', '--quiet',
+    is_flag=True,
+    help='Only print output paths and errors'
+)
+@click.option(
+    '--expand-more', 'expand',
+    is_flag=True,
+    help='Resolve "load more comments" placeholders for a complete tree'
+)
+@format_option
+@sqlite_option
+@cache_options
+@rate_options
+@pool_options
+@filter_options
+@fields_option
+@timings_option
+@json_backend_option
+def crawl(subreddit: str, sort: str, time_filter: str, limit: int, output_dir: Path, workers: int,
+          pretty: bool, quiet: bool, expand: bool, output_format: str, sqlite_path: Path,
+          cache_dir: Path, cache_ttl: float, cache_max_mb: float, rate: float, max_retries: int,
+          max_connections: Optional[int], http2: Optional[bool],
+          timings_format: Optional[str],
+          max_depth: Optional[int], min_score: Optional[int], top: Optional[int], since: Optional[float],
+          fields: Optional[FrozenSet[str]]):
+    """
+    Fetch the threads of a subreddit listing, e.g. `getred crawl r/python`.
+
+    Listing pages are fetched while earlier threads are still being
+    downloaded and saved. A failing thread is reported and the crawl
+    continues.
+    """
+    try:
+        name = parse_subreddit(subreddit)
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+    reject_archive_fields(output_format, fields)
+
+    from getred.crawl import crawl as crawl_listing
+    from getred.sqlite import ThreadDatabase
+    from getred.timings import Timings
+
+    timings = Timings() if timings_format else None
+    fetcher = make_fetcher(cache_dir, cache_ttl, cache_max_mb, rate, max_retries, timings,
+                           max_connections=max_connections, http2=http2)
+    database = ThreadDatabase(sqlite_path) if sqlite_path else None
+    try:
+        result = crawl_listing(
+            name,
+            sort=sort,
+            limit=limit,
+            time_filter=time_filter,
+            workers=workers,
+            output_dir=output_dir,
+            pretty=pretty,
+            expand=expand,
+            output_format=output_format,
+            database=database,
+            fetcher=fetcher,
+            on_result=batch_reporter(quiet, sqlite_path),
+            comment_filter=make_comment_filter(max_depth, min_score, top, since),
+            fields=fields,
+        )
+    except Exception as e:
+        click.echo(f"Error: listing r/{name}: {e}", err=True)
+        sys.exit(1)
+    finally:
+        if database is not None:
+            database.close()
 
-        # Parse into structured format
-        thread = parse_thread(json_data)
+    if not quiet:
+        echo_batch_summary(result, fetcher)
+    echo_timings(timings, timings_format)
 
+    if result.failed:
+        sys.exit(1)
+
+
+@main.command()
+@click.argument('existing', type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    '-o', '--output',
+    type=click.Path(path_type=Path),
+    help='Write the merged thread here instead of updating EXISTING'
+)
+@click.option(
+    '--delta',
+    type=click.Path(path_type=Path),
+    help='Also write only the added and changed comments to this file'
+)
+@click.option(
+    '-p', '--pretty/--no-pretty',
+    default=True,
+    help='Pretty-print JSON (default: enabled)'
+)
+@click.option(
+    '-q', '--quiet',
+    is_flag=True,
+    help='Suppress progress output'
+)
+@click.option(
+    '--expand-more', 'expand',
+    is_flag=True,
+    help='Resolve "load more comments" placeholders for a complete tree'
+)
+@cache_options
+@rate_options
+@pool_options
+@json_backend_option
+def refresh(existing: Path, output: Path, delta: Path, pretty: bool, quiet: bool, expand: bool,
+            cache_dir: Path, cache_ttl: float, cache_max_mb: float,
+            rate: float, max_retries: int, max_connections: Optional[int], http2: Optional[bool]):
+    """
+    Refetch a previously saved thread and merge in what changed.
+
+    New comments are added under their parents and edited bodies or
+    changed scores are updated; nothing is removed. The file is only
+    rewritten when something changed.
+    """
+    from getred import jsonbackend
+    from getred.expand import expand_more
+    from getred.merge import merge_thread, thread_permalink
+    from getred.models import Thread
+    from getred.parser import parse_thread, collect_more_ids
+    from getred.utils import save_json
+
+    output_path = output if output else existing
+
+    try:
+        thread = Thread.from_dict(jsonbackend.loads(existing.read_bytes()))
+
+        url = thread_permalink(thread)
         if not quiet:
-            click.echo(f"Found {thread.comment_count} comments (parsed {len(thread.comments)} top-level)")
+            click.echo(f"Refreshing {url}...")
+
+        with make_fetcher(cache_dir, cache_ttl, cache_max_mb, rate, max_retries,
+                          max_connections=max_connections, http2=http2) as fetcher:
+            json_data = fetcher.fetch_thread(url)
+            fresh = parse_thread(json_data, fields=thread.fields)
+            if expand:
+                expand_more(fresh, collect_more_ids(json_data[1]['data']['children']), fetcher)
 
-        # Save to file
-        save_json(thread.to_dict(), output_path, pretty=pretty)
+        changes = merge_thread(thread, fresh)
 
         if not quiet:
-            click.echo(f"✓ Saved to: {output_path}")
-        else:
-            click.echo(str(output_path))
+            click.echo(
+                f"{len(changes.added)} new comments, {len(changes.updated)} updated comments"
+                + (f", thread fields changed: {', '.join(changes.thread_changes)}" if changes.thread_changes else "")
+            )
+
+        if delta:
+            save_json(changes.to_dict(), delta, pretty=pretty)
+
+        if changes.changed or output_path != existing:
+            save_json(thread, output_path, pretty=pretty)
+            if not quiet:
+                click.echo(f"✓ Saved to: {output_path}")
+            else:
+                click.echo(str(output_path))
+        elif not quiet:
+            click.echo("No changes; file left untouched")
 
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
 
 
+@main.command('import')
+@click.argument('database', type=click.Path(dir_okay=False, path_type=Path))
+@click.argument('files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    '-q', '--quiet',
+    is_flag=True,
+    help='Only print errors'
+)
+@json_backend_option
+def import_json(database: Path, files, quiet: bool):
+    """
+    Import JSON files saved by getred into a SQLite DATABASE.
+
+    Threads already in the database are updated in place. A file that
+    cannot be imported is reported and the rest are still imported.
+    """
+    from getred.sqlite import ThreadDatabase
+
+    failed = 0
+    with ThreadDatabase(database) as db:
+        for path in files:
+            try:
+                thread = db.import_json(path)
+            except Exception as e:
+                failed += 1
+                click.echo(f"Error: {path}: {e}", err=True)
+                continue
+            if not quiet:
+                # comment_count is not saved by every --fields projection
+                count = thread.comment_count if thread.comment_count is not None else "?"
+                click.echo(f"✓ {path} -> {thread.id} ({count} comments)")
+
+    if not quiet:
+        click.echo(f"Imported {len(files) - failed}/{len(files)} files into {database}")
+    if failed:
+        sys.exit(1)
+
+
+@main.command()
+@click.argument('url')
+@click.option(
+    '--min-interval',
+    type=click.FloatRange(min=0.1),
+    default=2.0,
+    show_default=True,
+    help='Shortest delay between polls in seconds'
+)
+@click.option(
+    '--max-interval',
+    type=click.FloatRange(min=0.1),
+    default=60.0,
+    show_default=True,
+    help='Longest delay between polls in seconds'
+)
+@click.option(
+    '--max-idle',
+    type=click.FloatRange(min=0),
+    help='Stop after this many seconds without new comments'
+)
+@click.option(
+    '--new-only',
+    is_flag=True,
+    help='Only emit comments posted after following started'
+)
+@rate_options
+@pool_options
+@json_backend_option
+def follow(url: str, min_interval: float, max_interval: float, max_idle: float, new_only: bool,
+           rate: float, max_retries: int, max_connections: Optional[int], http2: Optional[bool]):
+    """
+    Follow a live thread, printing new comments as NDJSON.
+
+    Each line is one comment with its id, parent_id (null for top-level
+    comments) and depth. Polling speeds up while comments keep arriving
+    and backs off when the thread is quiet. Stop with Ctrl+C.
+    """
+    if not validate_reddit_url(url):
+        click.echo("Error: Invalid Reddit thread URL", err=True)
+        sys.exit(1)
+    if min_interval > max_interval:
+        click.echo("Error: --min-interval must not exceed --max-interval", err=True)
+        sys.exit(1)
+
+    from getred.follow import follow_thread
+
+    def report_error(error: Exception):
+        click.echo(f"Error: {error}", err=True)
+
+    try:
+        with make_fetcher(rate=rate, max_retries=max_retries, max_connections=max_connections, http2=http2) as fetcher:
+            for record in follow_thread(
+                fetcher,
+                url,
+                min_interval=min_interval,
+                max_interval=max_interval,
+                max_idle=max_idle,
+                skip_existing=new_only,
+                on_error=report_error,
+            ):
+                click.echo(json.dumps(record, ensure_ascii=False))
+    except KeyboardInterrupt:
+        pass
+
+
 if __name__ == '__main__':
     main()
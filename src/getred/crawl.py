@@ -0,0 +1,242 @@
+"""Crawling a subreddit's listing into fetched and saved threads."""
+
+from __future__ import annotations
+
+import queue
+import re
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, FrozenSet, Iterator, List, Optional, Set
+
+from getred.utils import OUTPUT_FORMATS
+
+if TYPE_CHECKING:
+    from getred.batch import BatchItem, BatchResult
+    from getred.fetcher import RedditFetcher
+    from getred.filters import CommentFilter
+    from getred.sqlite import ThreadDatabase
+
+LISTING_SORTS = ("new", "hot", "top", "rising", "controversial")
+TIME_FILTERS = ("hour", "day", "week", "month", "year", "all")
+
+_SUBREDDIT_NAME = re.compile(r'^[A-Za-z0-9_]+$')
+_SUBREDDIT_IN_PATH = re.compile(r'(?:^|/)r/([^/?#]+)')
+
+# Marks the end of a stage's output
+_DONE = object()
+
+
+def parse_subreddit(value: str) -> str:
+    """
+    Extract a subreddit name from "python", "r/python" or a subreddit URL.
+
+    Raises:
+        ValueError: If no valid subreddit name is found
+    """
+    match = _SUBREDDIT_IN_PATH.search(value.strip())
+    name = match.group(1) if match else value.strip()
+    if not _SUBREDDIT_NAME.match(name):
+        raise ValueError(f"Invalid subreddit: {value}")
+    return name
+
+
+def iter_listing(
+    fetcher: RedditFetcher,
+    subreddit: str,
+    sort: str = "new",
+    limit: Optional[int] = None,
+    time_filter: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Yield thread permalinks from a subreddit listing, page by page.
+
+    Pages are requested with the previous page's `after` cursor until the
+    listing ends or `limit` threads have been yielded. Threads that show
+    up again on a later page (listings shift while new posts arrive) are
+    skipped.
+
+    Args:
+        fetcher: Fetcher used for the listing requests
+        subreddit: Subreddit name without the r/ prefix
+        sort: Listing order, one of LISTING_SORTS
+        limit: Maximum number of threads (default: the whole listing)
+        time_filter: Time window for top/controversial, one of TIME_FILTERS
+
+    Yields:
+        Full thread URLs
+    """
+    seen: Set[str] = set()
+    after = None
+    while limit is None or len(seen) < limit:
+        page_size = fetcher.LISTING_PAGE_SIZE if limit is None else limit - len(seen)
+        data = fetcher.fetch_listing(subreddit, sort=sort, after=after, limit=page_size, time_filter=time_filter)
+        for child in data.get("children", []):
+            post = child.get("data", {})
+            if child.get("kind") != "t3" or not post.get("permalink") or post.get("id") in seen:
+                continue
+            seen.add(post.get("id"))
+            yield f"https://www.reddit.com{post['permalink']}"
+            if limit is not None and len(seen) >= limit:
+                return
+        after = data.get("after")
+        if not after:
+            return
+
+
+def crawl(
+    subreddit: str,
+    sort: str = "new",
+    limit: Optional[int] = None,
+    time_filter: Optional[str] = None,
+    workers: int = 8,
+    output_dir: Optional[Path] = None,
+    pretty: bool = True,
+    expand: bool = False,
+    output_format: str = "json",
+    database: Optional[ThreadDatabase] = None,
+    fetcher: Optional[RedditFetcher] = None,
+    on_result: Optional[Callable[[BatchItem], None]] = None,
+    queue_size: Optional[int] = None,
+    comment_filter: Optional[CommentFilter] = None,
+    fields: Optional[FrozenSet[str]] = None,
+) -> BatchResult:
+    """
+    Fetch and save every thread of a subreddit listing as a pipeline.
+
+    Three stages run concurrently and hand work over through bounded
+    queues: one thread pages through the listing, `workers` threads fetch
+    and parse threads, and the calling thread saves them. A full queue
+    blocks the stage feeding it, so the listing never runs far ahead of
+    the fetches and parsed threads never pile up in memory waiting to be
+    written. All stages share the fetcher's client and rate limiter.
+
+    Args:
+        subreddit: Subreddit name without the r/ prefix
+        sort: Listing order, one of LISTING_SORTS
+        limit: Maximum number of threads (default: the whole listing)
+        time_filter: Time window for top/controversial, one of TIME_FILTERS
+        workers: Number of concurrent thread fetches
+        output_dir: Directory for output files (default: ~/Downloads)
+        pretty: Whether to pretty-print the JSON
+        expand: Whether to resolve "more" placeholders
+        output_format: Output format, a key of utils.OUTPUT_FORMATS
+        database: Save threads to this database; files are then only
+            written if output_dir is given
+        fetcher: Fetcher to use (default: a new RedditFetcher)
+        on_result: Called with each BatchItem as soon as it is saved
+        queue_size: Capacity of each queue (default: 2 * workers)
+        comment_filter: Only keep the comments that pass this filter
+        fields: Only extract and save these fields (see models.parse_fields)
+
+    Returns:
+        BatchResult with one item per thread, in completion order
+
+    Raises:
+        httpx.HTTPError, ValueError: If a listing page cannot be fetched;
+            threads saved before the failure are kept
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if sort not in LISTING_SORTS:
+        raise ValueError(f"Unknown listing sort: {sort}")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+
+    # Imported here so the CLI can validate arguments without loading httpx
+    from getred.batch import BatchItem, BatchResult, batch_output_path, fetch_parsed, save_fetched
+    from getred.fetcher import RedditFetcher
+
+    fetcher = fetcher if fetcher is not None else RedditFetcher()
+    queue_size = queue_size if queue_size is not None else 2 * workers
+    urls: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    fetched: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    listing_errors: List[BaseException] = []
+    result = BatchResult()
+    start = time.perf_counter()
+
+    def put(target: "queue.Queue", item) -> bool:
+        """Put with backpressure; give up if the crawl is being stopped."""
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(source: "queue.Queue"):
+        """Get the next item, or _DONE if the crawl is being stopped."""
+        while not stop.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def list_threads():
+        try:
+            for url in iter_listing(fetcher, subreddit, sort=sort, limit=limit, time_filter=time_filter):
+                if not put(urls, url):
+                    return
+        except Exception as e:
+            listing_errors.append(e)
+        finally:
+            for _ in range(workers):
+                put(urls, _DONE)
+
+    def fetch_threads():
+        while True:
+            url = get(urls)
+            if url is _DONE:
+                put(fetched, _DONE)
+                return
+            try:
+                item = (url, fetch_parsed(fetcher, url, expand, comment_filter, fields), None)
+            except Exception as e:
+                item = (url, None, str(e) or type(e).__name__)
+            if not put(fetched, item):
+                return
+
+    with fetcher.shared_client():
+        stages = [threading.Thread(target=list_threads, name="getred-listing", daemon=True)]
+        stages.extend(
+            threading.Thread(target=fetch_threads, name=f"getred-fetch-{i}", daemon=True)
+            for i in range(workers)
+        )
+        for stage in stages:
+            stage.start()
+
+        try:
+            remaining = workers
+            while remaining:
+                entry = fetched.get()
+                if entry is _DONE:
+                    remaining -= 1
+                    continue
+                url, thread, error = entry
+                output_path = batch_output_path(url, output_dir, output_format, database)
+                if thread is not None:
+                    try:
+                        save_fetched(thread, output_path, output_format, pretty, database, fetcher.timings)
+                    except Exception as e:
+                        error = str(e) or type(e).__name__
+                item = BatchItem(
+                    url=url,
+                    output_path=output_path,
+                    comment_count=thread.comment_count if error is None else 0,
+                    error=error,
+                )
+                result.items.append(item)
+                if on_result is not None:
+                    on_result(item)
+        finally:
+            stop.set()
+            for stage in stages:
+                stage.join()
+
+    result.elapsed = time.perf_counter() - start
+    if listing_errors:
+        raise listing_errors[0]
+    return result
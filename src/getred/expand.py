@@ -0,0 +1,139 @@
+"""Resolution of "more" comment placeholders via the morechildren endpoint."""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+
+from getred.fetcher import RedditFetcher
+from getred.filters import CommentFilter
+from getred.models import Comment, Thread
+from getred.parser import parse_comment
+
+
+def _index_comments(comments: List[Comment]) -> Dict[str, Comment]:
+    """Map comment id to Comment for a whole tree."""
+    by_id = {}
+    stack = list(comments)
+    while stack:
+        comment = stack.pop()
+        by_id[comment.id] = comment
+        stack.extend(comment.replies)
+    return by_id
+
+
+def _stitch(
+    thread: Thread,
+    by_id: Dict[str, Comment],
+    things: List[Dict[str, Any]],
+    comment_filter: Optional[CommentFilter] = None,
+    pruned_ids: Optional[Set[str]] = None,
+) -> int:
+    """
+    Attach resolved t1 things under their parents.
+
+    Things whose parent is not known yet are retried until no more progress
+    is made, so the order of the input does not matter. With a filter,
+    things that fail it, replies to those, and (with `top`) new top-level
+    comments are not attached; their ids are added to `pruned_ids`.
+
+    Returns:
+        Number of comments attached
+    """
+    thread_fullname = f"t3_{thread.id}"
+    attached = 0
+    pending = [thing for thing in things if thing.get('kind') == 't1']
+    pruned_ids = pruned_ids if pruned_ids is not None else set()
+
+    while pending:
+        deferred = []
+        for thing in pending:
+            data = thing.get('data', {})
+            thing_id = data.get('id', '')
+            if thing_id in by_id or thing_id in pruned_ids:
+                continue
+
+            parent_id = data.get('parent_id', '')
+            if parent_id == thread_fullname:
+                parent, depth = None, 0
+            elif parent_id[3:] in by_id:
+                parent = by_id[parent_id[3:]]
+                depth = parent.depth + 1
+            elif parent_id[3:] in pruned_ids:
+                pruned_ids.add(thing_id)
+                continue
+            else:
+                deferred.append(thing)
+                continue
+
+            if comment_filter is not None and (
+                not comment_filter.keep(data, depth) or (parent is None and comment_filter.top is not None)
+            ):
+                pruned_ids.add(thing_id)
+                continue
+
+            comment = parse_comment(thing, depth=depth, comment_filter=comment_filter, fields=thread.fields)
+            if parent is None:
+                thread.comments.append(comment)
+            else:
+                parent.replies.append(comment)
+
+            by_id[comment.id] = comment
+            attached += 1
+
+        if len(deferred) == len(pending):
+            break
+        pending = deferred
+
+    return attached
+
+
+def expand_more(
+    thread: Thread,
+    more_ids: List[str],
+    fetcher: RedditFetcher,
+    workers: int = 4,
+    comment_filter: Optional[CommentFilter] = None,
+) -> int:
+    """
+    Resolve "more" placeholders and stitch the comments into the thread.
+
+    Ids are sent in batches of RedditFetcher.MORECHILDREN_BATCH_SIZE, with
+    up to `workers` batches in flight. Placeholders returned by a round are
+    resolved in the next round until none are left.
+
+    Args:
+        thread: Parsed thread to complete in place
+        more_ids: Ids collected with parser.collect_more_ids
+        fetcher: Fetcher used for the morechildren requests
+        workers: Maximum number of concurrent requests
+        comment_filter: The filter the thread was parsed with; hidden
+            comments that fail it are left out and counted in
+            thread.pruned_count. With `top`, no top-level comments are
+            added, since the top ones were already picked.
+
+    Returns:
+        Number of comments added to the thread
+    """
+    by_id = _index_comments(thread.comments)
+    batch_size = fetcher.MORECHILDREN_BATCH_SIZE
+    seen = set(by_id)
+    pruned_ids: Set[str] = set()
+    added = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while more_ids:
+            ids = [i for i in dict.fromkeys(more_ids) if i not in seen]
+            seen.update(ids)
+            batches = [ids[i:i + batch_size] for i in range(0, len(ids), batch_size)]
+            results = executor.map(lambda batch: fetcher.fetch_more_children(thread.id, batch), batches)
+
+            things = [thing for batch_things in results for thing in batch_things]
+            added += _stitch(thread, by_id, things, comment_filter, pruned_ids)
+            more_ids = [
+                child
+                for thing in things if thing.get('kind') == 'more'
+                for child in thing.get('data', {}).get('children', [])
+            ]
+
+    if comment_filter is not None:
+        thread.pruned_count = (thread.pruned_count or 0) + len(pruned_ids)
+    return added
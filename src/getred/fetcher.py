@@ -2,32 +2,221 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
-from urllib.parse import urlsplit, urlunsplit
+import asyncio
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import httpx
-import importlib.metadata
+
+from getred import jsonbackend
+from getred.filters import CommentFilter
+from getred.models import Thread
+from getred.parser import parse_thread
+from getred.pool import DEFAULT_LIMITS, ConnectionStats, accept_encoding, http2_available, network_transport
+from getred.ratelimit import AsyncRateLimitedTransport, RateLimiter, RateLimitedTransport, RetryPolicy
+from getred.timings import Timings, measure
+from getred.stream import ThreadStreamParser
+
+
+def _non_json_error(response: httpx.Response) -> ValueError:
+    content_type = response.headers.get("Content-Type", "<missing>")
+    return ValueError(
+        f"Non-JSON response from Reddit endpoint "
+        f"(url={response.url!s}, status={response.status_code}, content_type={content_type})"
+    )
+
+
+def _bytes_received(response: httpx.Response) -> int:
+    """Body bytes as transferred, falling back to the body size for prebuilt responses."""
+    if response.num_bytes_downloaded:
+        return response.num_bytes_downloaded
+    try:
+        return len(response.content)
+    except httpx.ResponseNotRead:
+        return 0
+
+
+def _decode_json(response: httpx.Response) -> Any:
+    """Raise for HTTP errors and decode a JSON response body with the configured JSON backend."""
+    response.raise_for_status()
+    try:
+        return jsonbackend.loads(response.content)
+    except ValueError as e:
+        raise _non_json_error(response) from e
+
+
+class _UserAgent:
+    """Class attribute holding the User-Agent, built on first access from the installed version."""
+
+    def __get__(self, instance, owner) -> str:
+        import getred
+        return f"getred/{getred.__version__} (Reddit Thread Fetcher CLI)"
 
 
 class RedditFetcher:
-    """Fetches Reddit thread data using the public JSON API."""
+    """
+    Fetches Reddit thread data using the public JSON API.
+
+    Use it as a context manager to send every request through one pooled
+    client, so connections (and their TLS sessions) are kept alive across
+    fetches; outside a with block each call opens its own client.
+    """
 
-    USER_AGENT = f"getred/{importlib.metadata.version('getred')} (Reddit Thread Fetcher CLI)"
+    USER_AGENT = _UserAgent()
     TIMEOUT = 30.0
+    MORECHILDREN_URL = "https://www.reddit.com/api/morechildren.json"
+    MORECHILDREN_BATCH_SIZE = 100
+    LISTING_URL = "https://www.reddit.com/r/{subreddit}/{sort}.json"
+    LISTING_PAGE_SIZE = 100
+
+    def __init__(
+        self,
+        transport: Optional[httpx.BaseTransport] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        timings: Optional[Timings] = None,
+        limits: Optional[httpx.Limits] = None,
+        http2: Optional[bool] = None,
+    ):
+        """
+        Initialize the fetcher with custom headers.
 
-    def __init__(self, transport: Optional[httpx.BaseTransport] = None):
-        """Initialize the fetcher with custom headers."""
+        Args:
+            transport: Custom httpx transport (e.g. for tests or caching);
+                it brings its own connection pool, see pool.network_transport
+            rate_limiter: Limiter applied to every request sent through
+                `transport`; share one instance between fetchers to share
+                the budget
+            retry: Retry policy for transient failures (default: RetryPolicy())
+            timings: Record per-phase timings and transfer counters here
+            limits: Connection and keep-alive limits of the fetcher's own
+                pool, used without a custom transport (default: pool.DEFAULT_LIMITS)
+            http2: Negotiate HTTP/2 on the fetcher's own pool (default: if
+                the getred[http2] extra is installed)
+        """
         self.headers = {
-            "User-Agent": self.USER_AGENT
+            "User-Agent": self.USER_AGENT,
+            "Accept-Encoding": accept_encoding(),
         }
+        self.limits = limits if limits is not None else DEFAULT_LIMITS
+        self.http2 = http2_available() if http2 is None else http2
+        if rate_limiter is not None:
+            if transport is None:
+                transport = network_transport(self.limits, self.http2)
+            transport = RateLimitedTransport(rate_limiter, transport)
         self._transport = transport
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.retry_count = 0
+        self.timings = timings
+        self.connection_stats = ConnectionStats()
+        self._client: Optional[httpx.Client] = None
+
+    @property
+    def transport(self) -> Optional[httpx.BaseTransport]:
+        """The custom transport requests are sent through, if any."""
+        return self._transport
+
+    def __enter__(self) -> "RedditFetcher":
+        """Open a shared client that is reused by every fetch until exit."""
+        self._client = self._make_client()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def _make_client(self) -> httpx.Client:
+        return httpx.Client(
+            headers=self.headers,
+            timeout=self.TIMEOUT,
+            follow_redirects=True,
+            transport=self._transport,
+            limits=self.limits,
+            http2=self.http2,
+        )
+
+    @contextmanager
+    def shared_client(self) -> Iterator["RedditFetcher"]:
+        """
+        Share one client between the fetches in a with block, like
+        `with fetcher:`, unless a shared client is already open; that one
+        is used and left open for the block that opened it.
+        """
+        owns_client = self._client is None
+        if owns_client:
+            self.__enter__()
+        try:
+            yield self
+        finally:
+            if owns_client:
+                self.__exit__(None, None, None)
+
+    @contextmanager
+    def _session(self) -> Iterator[httpx.Client]:
+        """Yield the shared client, or a one-off client outside a with block."""
+        if self._client is not None:
+            yield self._client
+        else:
+            with self._make_client() as client:
+                yield client
+
+    def _send(
+        self,
+        client: httpx.Client,
+        url: str,
+        params: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """
+        Send a GET request, retrying transient failures per self.retry.
+
+        Unless `stream` is set the body is read before returning, so that
+        download time and size can be recorded in self.timings.
+        """
+        timings = self.timings
+        attempt = 0
+        while True:
+            request = client.build_request("GET", url, params=params)
+            timer = timings.request() if timings is not None else None
+            request.extensions["trace"] = self.connection_stats.tracer(timer.trace if timer is not None else None)
+            try:
+                response = client.send(request, stream=True)
+                try:
+                    if timer is not None:
+                        timer.headers_received()
+                    if not stream:
+                        response.read()
+                        if timer is not None:
+                            timer.body_received(_bytes_received(response))
+                except BaseException:
+                    response.close()
+                    raise
+            except httpx.TransportError:
+                delay = self.retry.delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self.retry.delay(attempt, response)
+                if delay is None:
+                    return response
+                response.close()
+            attempt += 1
+            self.retry_count += 1
+            if timings is not None:
+                timings.count("retries")
+            with measure(timings, "wait"):
+                time.sleep(delay)
 
     @staticmethod
-    def _build_json_url(url: str) -> str:
+    def _build_json_url(url: str, params: Optional[Dict[str, str]] = None) -> str:
         """
         Construct a Reddit .json endpoint URL from a thread URL.
 
-        - Preserves query parameters
+        - Preserves query parameters; `params` are added, replacing
+          parameters of the same name
         - Avoids double-appending .json
         - Drops fragments
         """
@@ -37,14 +226,21 @@ class RedditFetcher:
         if not path.endswith(".json"):
             path = path + ".json"
 
-        return urlunsplit((parts.scheme, parts.netloc, path, parts.query, ""))
+        query = parts.query
+        if params:
+            merged = dict(parse_qsl(query, keep_blank_values=True))
+            merged.update(params)
+            query = urlencode(merged)
 
-    def fetch_thread(self, url: str) -> Dict[str, Any]:
+        return urlunsplit((parts.scheme, parts.netloc, path, query, ""))
+
+    def fetch_thread(self, url: str, params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
         Fetch a Reddit thread as JSON.
 
         Args:
             url: Reddit thread URL (will be converted to JSON endpoint)
+            params: Extra query parameters, e.g. CommentFilter.query_params()
 
         Returns:
             Dict containing Reddit API response
@@ -52,21 +248,323 @@ class RedditFetcher:
         Raises:
             httpx.HTTPError: If request fails
         """
-        json_url = self._build_json_url(url)
+        json_url = self._build_json_url(url, params)
+
+        with self._session() as client:
+            response = self._send(client, json_url)
+
+        with measure(self.timings, "decode"):
+            return _decode_json(response)
+
+    def fetch_thread_bytes(self, url: str, params: Optional[Dict[str, str]] = None) -> bytes:
+        """
+        Fetch a Reddit thread's JSON response body without decoding it.
+
+        For handing the body to another process, which decodes and parses
+        it there.
+
+        Args:
+            url: Reddit thread URL (will be converted to JSON endpoint)
+            params: Extra query parameters, e.g. CommentFilter.query_params()
+
+        Returns:
+            The raw response body
+
+        Raises:
+            httpx.HTTPError: If request fails
+        """
+        json_url = self._build_json_url(url, params)
+
+        with self._session() as client:
+            response = self._send(client, json_url)
+
+        response.raise_for_status()
+        return response.content
+
+    def stream_thread(
+        self,
+        url: str,
+        more_ids: Optional[List[str]] = None,
+        comment_filter: Optional[CommentFilter] = None,
+        fields: Optional[FrozenSet[str]] = None,
+    ) -> Thread:
+        """
+        Fetch and parse a Reddit thread while the response body downloads.
+
+        Comments are built as soon as their JSON closes, so decoding overlaps
+        the download and the raw response is never held in memory as a whole.
+
+        Args:
+            url: Reddit thread URL (will be converted to JSON endpoint)
+            more_ids: Optional list that collects ids behind "more" placeholders
+            comment_filter: Only build the comments that pass this filter; its
+                query parameters are sent along
+            fields: Only extract these fields (see models.parse_fields)
+
+        Returns:
+            Parsed Thread
+
+        Raises:
+            httpx.HTTPError: If request fails
+            ValueError: If the response is not a JSON thread listing
+        """
+        json_url = self._build_json_url(url, comment_filter.query_params() if comment_filter is not None else None)
+
+        with self._session() as client:
+            response = self._send(client, json_url, stream=True)
+            try:
+                response.raise_for_status()
+                parser = ThreadStreamParser(more_ids, comment_filter, fields)
+                try:
+                    # Decoding and parsing overlap the download, so they count towards it
+                    with measure(self.timings, "download"):
+                        for chunk in response.iter_bytes():
+                            parser.feed(chunk)
+                        thread = parser.close()
+                except (ValueError, LookupError) as e:
+                    raise _non_json_error(response) from e
+            finally:
+                response.close()
+
+        if self.timings is not None:
+            self.timings.count("bytes_received", _bytes_received(response))
+            self.timings.add_thread(thread)
+        return thread
+
+    def fetch_more_children(self, link_id: str, children: List[str]) -> List[Dict[str, Any]]:
+        """
+        Resolve "more" placeholder ids through the morechildren endpoint.
 
-        with httpx.Client(
+        Args:
+            link_id: Thread fullname (t3_...) or bare thread id
+            children: Comment ids to resolve, at most MORECHILDREN_BATCH_SIZE
+
+        Returns:
+            List of raw "things" (t1 comments and nested "more" stubs), each
+            carrying its parent_id
+
+        Raises:
+            httpx.HTTPError: If request fails
+            ValueError: If too many ids are requested or Reddit reports errors
+        """
+        if len(children) > self.MORECHILDREN_BATCH_SIZE:
+            raise ValueError(
+                f"At most {self.MORECHILDREN_BATCH_SIZE} ids can be resolved per request, got {len(children)}"
+            )
+        if not link_id.startswith("t3_"):
+            link_id = f"t3_{link_id}"
+
+        params = {
+            "api_type": "json",
+            "link_id": link_id,
+            "children": ",".join(children),
+            "limit_children": "false",
+        }
+
+        with self._session() as client:
+            response = self._send(client, self.MORECHILDREN_URL, params=params)
+
+        with measure(self.timings, "decode"):
+            payload = _decode_json(response).get("json", {})
+        errors = payload.get("errors")
+        if errors:
+            raise ValueError(f"Reddit morechildren error: {errors}")
+        return payload.get("data", {}).get("things", [])
+
+    def fetch_listing(
+        self,
+        subreddit: str,
+        sort: str = "new",
+        after: Optional[str] = None,
+        limit: int = LISTING_PAGE_SIZE,
+        time_filter: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Fetch one page of a subreddit's thread listing.
+
+        Args:
+            subreddit: Subreddit name without the r/ prefix
+            sort: Listing order (new, hot, top, rising, controversial)
+            after: Fullname cursor from the previous page's "after"
+            limit: Threads per page, at most LISTING_PAGE_SIZE
+            time_filter: Time window for top/controversial (hour ... all)
+
+        Returns:
+            The listing's data dict, with "children" and the next "after"
+
+        Raises:
+            httpx.HTTPError: If request fails
+            ValueError: If the response is not a listing
+        """
+        params = {"limit": str(min(limit, self.LISTING_PAGE_SIZE))}
+        if after:
+            params["after"] = after
+        if time_filter:
+            params["t"] = time_filter
+
+        url = self.LISTING_URL.format(subreddit=subreddit, sort=sort)
+        with self._session() as client:
+            response = self._send(client, url, params=params)
+
+        with measure(self.timings, "decode"):
+            payload = _decode_json(response)
+        if not isinstance(payload, dict) or payload.get("kind") != "Listing":
+            raise ValueError(f"Not a subreddit listing: {response.url}")
+        return payload["data"]
+
+
+class AsyncRedditFetcher:
+    """Asyncio counterpart of RedditFetcher built on httpx.AsyncClient."""
+
+    USER_AGENT = _UserAgent()
+    TIMEOUT = RedditFetcher.TIMEOUT
+
+    _build_json_url = staticmethod(RedditFetcher._build_json_url)
+
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        limits: Optional[httpx.Limits] = None,
+        http2: Optional[bool] = None,
+    ):
+        """
+        Initialize the fetcher with custom headers.
+
+        Args:
+            transport: Custom httpx async transport (e.g. for tests)
+            rate_limiter: Limiter applied to every request; the same
+                instance can be shared with threaded RedditFetchers
+            retry: Retry policy for transient failures (default: RetryPolicy())
+            limits: Connection and keep-alive limits, as for RedditFetcher
+            http2: Negotiate HTTP/2, as for RedditFetcher
+        """
+        self.headers = {
+            "User-Agent": self.USER_AGENT,
+            "Accept-Encoding": accept_encoding(),
+        }
+        self.limits = limits if limits is not None else DEFAULT_LIMITS
+        self.http2 = http2_available() if http2 is None else http2
+        if rate_limiter is not None:
+            if transport is None:
+                transport = httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2)
+            transport = AsyncRateLimitedTransport(rate_limiter, transport)
+        self._transport = transport
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.retry_count = 0
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "AsyncRedditFetcher":
+        """Open a shared client that is reused by every fetch until exit."""
+        self._client = self._make_client()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _make_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
             headers=self.headers,
             timeout=self.TIMEOUT,
             follow_redirects=True,
             transport=self._transport,
-        ) as client:
-            response = client.get(json_url)
-            response.raise_for_status()
+            limits=self.limits,
+            http2=self.http2,
+        )
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the shared client, or a one-off client outside an async with block."""
+        if self._client is not None:
+            yield self._client
+        else:
+            async with self._make_client() as client:
+                yield client
+
+    async def _send(self, client: httpx.AsyncClient, url: str) -> httpx.Response:
+        """Send a GET request, retrying transient failures per self.retry."""
+        attempt = 0
+        while True:
             try:
-                return response.json()
-            except ValueError as e:
-                content_type = response.headers.get("Content-Type", "<missing>")
-                raise ValueError(
-                    f"Non-JSON response from Reddit endpoint "
-                    f"(url={response.url!s}, status={response.status_code}, content_type={content_type})"
-                ) from e
+                response = await client.get(url)
+            except httpx.TransportError:
+                delay = self.retry.delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self.retry.delay(attempt, response)
+                if delay is None:
+                    return response
+            attempt += 1
+            self.retry_count += 1
+            await asyncio.sleep(delay)
+
+    async def fetch_thread(self, url: str) -> Dict[str, Any]:
+        """
+        Fetch a Reddit thread as JSON.
+
+        Args:
+            url: Reddit thread URL (will be converted to JSON endpoint)
+
+        Returns:
+            Dict containing Reddit API response
+
+        Raises:
+            httpx.HTTPError: If request fails
+        """
+        json_url = self._build_json_url(url)
+
+        async with self._session() as client:
+            response = await self._send(client, json_url)
+
+        return _decode_json(response)
+
+    async def fetch_many(self, urls: Iterable[str], concurrency: int = 10) -> AsyncIterator[Thread]:
+        """
+        Fetch and parse many threads, yielding each Thread as it finishes.
+
+        At most `concurrency` requests are in flight at once, and all of them
+        share one client. Threads are yielded in completion order, not input
+        order. If a fetch fails, the remaining fetches are cancelled and the
+        error is raised.
+
+        Args:
+            urls: Reddit thread URLs
+            concurrency: Maximum number of simultaneous requests
+
+        Yields:
+            Parsed Thread objects
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        async def fetch_and_parse(url: str) -> Thread:
+            return parse_thread(await self.fetch_thread(url))
+
+        owns_client = self._client is None
+        if owns_client:
+            await self.__aenter__()
+
+        pending: Set["asyncio.Task[Thread]"] = set()
+        url_iter = iter(urls)
+        try:
+            while True:
+                for url in url_iter:
+                    pending.add(asyncio.ensure_future(fetch_and_parse(url)))
+                    if len(pending) >= concurrency:
+                        break
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            if owns_client:
+                await self.__aexit__(None, None, None)
@@ -0,0 +1,83 @@
+"""Comment filters applied while parsing, so pruned subtrees are never built."""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+_RELATIVE = re.compile(r'^(\d+(?:\.\d+)?)([smhdw])$')
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+@dataclass(frozen=True)
+class CommentFilter:
+    """
+    Which comments to keep when parsing a thread.
+
+    A comment that fails a condition is dropped together with all of its
+    replies, whatever their own scores and dates.
+
+    Attributes:
+        max_depth: Keep comments up to this depth (0 = top-level only)
+        min_score: Keep comments with at least this score
+        since: Keep comments created at or after this Unix timestamp
+        top: Keep the `top` highest-scored top-level comments (after the
+            other conditions), ordered by score
+    """
+
+    max_depth: Optional[int] = None
+    min_score: Optional[int] = None
+    since: Optional[float] = None
+    top: Optional[int] = None
+
+    def keep(self, data: Dict[str, Any], depth: int) -> bool:
+        """Whether a comment, given its raw data dict and depth, passes max_depth, min_score and since."""
+        if self.max_depth is not None and depth > self.max_depth:
+            return False
+        if self.min_score is not None and data.get('score', 0) < self.min_score:
+            return False
+        if self.since is not None and data.get('created_utc', 0) < self.since:
+            return False
+        return True
+
+    def query_params(self) -> Dict[str, str]:
+        """
+        Query parameters that make Reddit send less of what this filter drops.
+
+        Reddit's depth counts the top level as 1. Its limit caps the total
+        number of comments, so it only stands in for `top` when replies
+        are not wanted anyway. min_score and since have no equivalent.
+        """
+        params = {}
+        if self.max_depth is not None:
+            params["depth"] = str(self.max_depth + 1)
+        if self.top is not None:
+            params["sort"] = "top"
+            if self.max_depth == 0:
+                params["limit"] = str(self.top)
+        return params
+
+
+def parse_since(value: str, now: Optional[datetime] = None) -> float:
+    """
+    Convert a --since value to a Unix timestamp.
+
+    Accepts a relative age ("90m", "24h", "7d", "2w") or an ISO 8601
+    date or date and time, taken as UTC if it has no offset.
+
+    Raises:
+        ValueError: If the value is neither
+    """
+    value = value.strip()
+    match = _RELATIVE.match(value)
+    if match:
+        now = now if now is not None else datetime.now(timezone.utc)
+        age = timedelta(seconds=float(match.group(1)) * _UNIT_SECONDS[match.group(2)])
+        return (now - age).timestamp()
+    try:
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"Invalid time: {value} (use e.g. 24h, 7d or 2024-01-31)") from None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
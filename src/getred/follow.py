@@ -0,0 +1,112 @@
+"""Polling a live thread and emitting comments as they appear."""
+
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import httpx
+
+from getred.fetcher import RedditFetcher
+from getred.parser import build_comment
+from getred.writer import comment_record
+
+
+def sorted_by_new(url: str) -> str:
+    """Return the thread URL with sort=new, replacing any other sort."""
+    return str(httpx.URL(url).copy_set_param("sort", "new"))
+
+
+def _unseen_comments(
+    listing: List[Dict[str, Any]], seen: Set[str]
+) -> Iterator[Tuple[Dict[str, Any], Optional[str], int]]:
+    """
+    Walk a raw comment listing in pre-order, yielding the comments whose
+    ids are not in `seen` and adding them to it.
+
+    Seen comments are only descended into, so a poll builds nothing for
+    the comments it has already emitted.
+
+    Yields:
+        (comment data, parent id, depth) tuples
+    """
+    stack = [(item, None, 0) for item in reversed(listing)]
+    while stack:
+        item, parent_id, depth = stack.pop()
+        # Skip "more" placeholders
+        if item.get('kind') != 't1':
+            continue
+        data = item.get('data', {})
+        comment_id = data.get('id', '')
+        if comment_id not in seen:
+            seen.add(comment_id)
+            yield data, parent_id, depth
+        replies = data.get('replies')
+        if replies and isinstance(replies, dict):
+            children = replies.get('data', {}).get('children', [])
+            stack.extend((reply, comment_id, depth + 1) for reply in reversed(children))
+
+
+def follow_thread(
+    fetcher: RedditFetcher,
+    url: str,
+    min_interval: float = 2.0,
+    max_interval: float = 60.0,
+    max_idle: Optional[float] = None,
+    skip_existing: bool = False,
+    on_error: Optional[Callable[[Exception], None]] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Poll a thread and yield each comment the first time it is seen.
+
+    The polling interval halves (down to min_interval) after a poll that
+    found new comments and doubles (up to max_interval) after a quiet or
+    failed poll.
+
+    Args:
+        fetcher: Fetcher used for polling
+        url: Reddit thread URL
+        min_interval: Shortest delay between polls, in seconds
+        max_interval: Longest delay between polls, in seconds
+        max_idle: Stop after this many seconds without new comments
+            (default: follow forever)
+        skip_existing: Do not emit comments present at the first poll
+        on_error: Called with the exception when a poll fails; if not
+            given, the exception is raised
+        sleep: Function used to wait between polls
+        clock: Monotonic clock used for max_idle
+
+    Yields:
+        Flat comment records (see writer.comment_record), oldest poll first
+    """
+    poll_url = sorted_by_new(url)
+    seen: Set[str] = set()
+    interval = min_interval
+    last_activity = clock()
+    first_poll = True
+
+    while True:
+        try:
+            listing = fetcher.fetch_thread(poll_url)[1]['data']['children']
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(e)
+            interval = min(max_interval, interval * 2)
+        else:
+            found = 0
+            for data, parent_id, depth in _unseen_comments(listing, seen):
+                found += 1
+                if not (first_poll and skip_existing):
+                    yield comment_record(build_comment(data, depth), parent_id)
+
+            if found and not first_poll:
+                interval = max(min_interval, interval / 2)
+                last_activity = clock()
+            elif not first_poll:
+                interval = min(max_interval, interval * 2)
+            first_poll = False
+
+        if max_idle is not None and clock() - last_activity >= max_idle:
+            return
+        sleep(interval)
@@ -0,0 +1,155 @@
+"""Index of a parsed comment tree: lookup by id, parent links, subtree sizes and top-k queries."""
+
+import heapq
+from typing import Callable, Dict, Iterable, List, Optional
+
+from getred.models import Comment, iter_comments, timestamp_from_iso
+
+
+def _created_key(comment: Comment) -> float:
+    created = comment.created_utc
+    if type(created) is float:
+        return created
+    # None under a field projection, or a string kept from a file
+    if created is None:
+        return float("-inf")
+    try:
+        return timestamp_from_iso(created)
+    except (TypeError, ValueError, OverflowError):
+        return float("-inf")
+
+
+# Sort keys for CommentIndex.top
+TOP_KEYS: Dict[str, Callable[[Comment], object]] = {
+    "score": lambda comment: comment.score,
+    "recent": _created_key,
+}
+
+
+class CommentIndex:
+    """
+    Comments of a thread indexed by id, with their parents and depths.
+
+    Filled while parsing by passing it to parser.parse_thread(index=...),
+    or afterwards with from_comments(). Comments are added parent first;
+    subtree sizes are computed from that order on first use. The index
+    does not follow later changes to the tree, e.g. by expand_more().
+    """
+
+    __slots__ = ('_by_id', '_parents', '_order', '_by_depth', '_sizes')
+
+    def __init__(self):
+        self._by_id: Dict[str, Comment] = {}
+        self._parents: Dict[str, Optional[Comment]] = {}
+        self._order: List[Comment] = []
+        self._by_depth: List[List[Comment]] = []
+        self._sizes: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def from_comments(cls, comments: Iterable[Comment]) -> 'CommentIndex':
+        """Index comment trees, e.g. thread.comments, in one walk."""
+        index = cls()
+        add = index.add
+        for comment, parent in iter_comments(list(comments)):
+            add(comment, parent)
+        return index
+
+    def add(self, comment: Comment, parent: Optional[Comment] = None) -> None:
+        """
+        Add one comment (not its replies); its parent must already be indexed.
+
+        Args:
+            comment: Comment to add
+            parent: Its parent comment, or None for a top-level comment
+        """
+        self._by_id[comment.id] = comment
+        self._parents[comment.id] = parent
+        self._order.append(comment)
+        depth = comment.depth
+        while len(self._by_depth) <= depth:
+            self._by_depth.append([])
+        self._by_depth[depth].append(comment)
+        self._sizes = None
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, comment_id: object) -> bool:
+        return comment_id in self._by_id
+
+    def __getitem__(self, comment_id: str) -> Comment:
+        return self._by_id[comment_id]
+
+    def get(self, comment_id: str, default: Optional[Comment] = None) -> Optional[Comment]:
+        """The comment with this id, or `default`."""
+        return self._by_id.get(comment_id, default)
+
+    def parent(self, comment_id: str) -> Optional[Comment]:
+        """
+        The parent of a comment, or None for a top-level comment.
+
+        Raises:
+            KeyError: If the comment is not indexed
+        """
+        return self._parents[comment_id]
+
+    def ancestors(self, comment_id: str) -> List[Comment]:
+        """
+        The path from the top-level comment down to the comment's parent.
+
+        Raises:
+            KeyError: If the comment is not indexed
+        """
+        path = []
+        parent = self._parents[comment_id]
+        while parent is not None:
+            path.append(parent)
+            parent = self._parents[parent.id]
+        path.reverse()
+        return path
+
+    def subtree_size(self, comment_id: str) -> int:
+        """
+        Number of comments in a comment's subtree, the comment included.
+
+        Raises:
+            KeyError: If the comment is not indexed
+        """
+        if self._sizes is None:
+            # Parents come before their replies, so a reverse pass sees
+            # every reply's final size before adding it to its parent
+            sizes = dict.fromkeys(self._by_id, 1)
+            parents = self._parents
+            for comment in reversed(self._order):
+                parent = parents[comment.id]
+                if parent is not None:
+                    sizes[parent.id] += sizes[comment.id]
+            self._sizes = sizes
+        return self._sizes[comment_id]
+
+    def at_depth(self, depth: int) -> List[Comment]:
+        """Comments at a depth (0 = top-level), in the order they were added."""
+        return list(self._by_depth[depth]) if 0 <= depth < len(self._by_depth) else []
+
+    @property
+    def max_depth(self) -> int:
+        """Depth of the deepest comment, or -1 if the index is empty."""
+        return len(self._by_depth) - 1
+
+    def top(self, k: int, by: str = "score") -> List[Comment]:
+        """
+        The k highest-scored or most recent comments anywhere in the tree.
+
+        Uses a heap of size k, so it is O(n log k) rather than a full sort.
+        Ties keep the order the comments were added in.
+
+        Args:
+            k: Number of comments
+            by: "score" or "recent"
+
+        Raises:
+            ValueError: If `by` is not a key of TOP_KEYS
+        """
+        if by not in TOP_KEYS:
+            raise ValueError(f"Unknown top key: {by} (expected one of {', '.join(TOP_KEYS)})")
+        return heapq.nlargest(k, self._order, key=TOP_KEYS[by])
@@ -0,0 +1,160 @@
+"""Pluggable JSON decoding and encoding: orjson, msgspec or ujson when installed, else the stdlib."""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+# Environment variable selecting the backend, one of BACKENDS or "auto"
+ENV_VAR = "GETRED_JSON_BACKEND"
+
+# Backends in the order "auto" tries them
+BACKENDS = ("orjson", "msgspec", "ujson", "json")
+
+
+@dataclass(frozen=True)
+class JSONBackend:
+    """
+    A JSON library behind a bytes-in, bytes-out interface.
+
+    `loads(data)` decodes UTF-8 JSON bytes. `dumps(obj, pretty)` encodes
+    to UTF-8 bytes with non-ASCII characters kept as is, indented by two
+    spaces when pretty. Compact output is each library's own and only
+    matches the stdlib's separators for the "json" backend.
+
+    Anything a fast backend rejects (nesting beyond its depth limit,
+    integers wider than 64 bits to encode, invalid documents) is retried
+    with the stdlib, so all backends accept and reject the same input.
+    One difference remains: orjson decodes integers wider than 64 bits
+    as floats, which does not occur in Reddit's responses.
+    """
+
+    name: str
+    loads: Callable[[bytes], Any]
+    dumps: Callable[[Any, bool], bytes]
+
+
+def _stdlib_loads(data: bytes) -> Any:
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any, pretty: bool = False) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, indent=2 if pretty else None).encode("utf-8")
+
+
+def _with_fallback(loads: Callable[[bytes], Any], dumps: Callable[[Any, bool], bytes], errors: tuple):
+    def fallback_loads(data: bytes) -> Any:
+        try:
+            return loads(data)
+        except errors:
+            return _stdlib_loads(data)
+
+    def fallback_dumps(obj: Any, pretty: bool = False) -> bytes:
+        try:
+            return dumps(obj, pretty)
+        except errors:
+            return _stdlib_dumps(obj, pretty)
+
+    return fallback_loads, fallback_dumps
+
+
+def _orjson() -> JSONBackend:
+    import orjson
+
+    def dumps(obj: Any, pretty: bool) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+    loads, dumps = _with_fallback(orjson.loads, dumps, (orjson.JSONDecodeError, orjson.JSONEncodeError))
+    return JSONBackend("orjson", loads, dumps)
+
+
+def _msgspec() -> JSONBackend:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def dumps(obj: Any, pretty: bool) -> bytes:
+        data = encoder.encode(obj)
+        return msgspec.json.format(data, indent=2) if pretty else data
+
+    loads, dumps = _with_fallback(decoder.decode, dumps, (msgspec.MsgspecError, TypeError, ValueError))
+    return JSONBackend("msgspec", loads, dumps)
+
+
+def _ujson() -> JSONBackend:
+    import ujson
+
+    def dumps(obj: Any, pretty: bool) -> bytes:
+        text = ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False, indent=2 if pretty else 0)
+        return text.encode("utf-8")
+
+    loads, dumps = _with_fallback(ujson.loads, dumps, (ValueError, TypeError, OverflowError))
+    return JSONBackend("ujson", loads, dumps)
+
+
+_FACTORIES: Dict[str, Callable[[], JSONBackend]] = {
+    "orjson": _orjson,
+    "msgspec": _msgspec,
+    "ujson": _ujson,
+    "json": lambda: JSONBackend("json", _stdlib_loads, _stdlib_dumps),
+}
+
+_backend: Optional[JSONBackend] = None
+
+
+def load_backend(name: str = "auto") -> JSONBackend:
+    """
+    Create the backend called `name`, or the fastest installed one for "auto".
+
+    Raises:
+        ValueError: If the name is unknown or the library is not installed
+    """
+    if name == "auto":
+        for candidate in BACKENDS:
+            try:
+                return _FACTORIES[candidate]()
+            except ImportError:
+                continue
+    if name not in _FACTORIES:
+        raise ValueError(f"Unknown JSON backend: {name} (expected auto or one of {', '.join(BACKENDS)})")
+    try:
+        return _FACTORIES[name]()
+    except ImportError:
+        raise ValueError(f"JSON backend {name} is not installed") from None
+
+
+def available_backends() -> List[str]:
+    """Names of the backends whose library is installed, fastest first."""
+    available = []
+    for name in BACKENDS:
+        try:
+            load_backend(name)
+        except ValueError:
+            continue
+        available.append(name)
+    return available
+
+
+def set_backend(name: str) -> JSONBackend:
+    """Use the backend called `name` (or "auto") from now on."""
+    global _backend
+    _backend = load_backend(name)
+    return _backend
+
+
+def get_backend() -> JSONBackend:
+    """The backend in use, selected by $GETRED_JSON_BACKEND (default: auto) on first use."""
+    if _backend is None:
+        return set_backend(os.environ.get(ENV_VAR) or "auto")
+    return _backend
+
+
+def loads(data: bytes) -> Any:
+    """Decode JSON bytes with the current backend."""
+    return get_backend().loads(data)
+
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Encode an object to JSON bytes with the current backend."""
+    return get_backend().dumps(obj, pretty)
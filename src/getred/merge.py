@@ -0,0 +1,122 @@
+"""Merging a freshly fetched thread into a previously saved one."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from getred.models import Comment, Thread, iter_comments
+
+# Comment fields that can change after posting
+COMMENT_MUTABLE_FIELDS = ("author", "body", "score")
+# Thread fields that can change after posting
+THREAD_MUTABLE_FIELDS = ("title", "selftext", "score", "comment_count")
+
+
+@dataclass
+class ThreadDelta:
+    """Changes applied by merge_thread."""
+
+    thread_id: str
+    fetched_at: str
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    updated: List[Dict[str, Any]] = field(default_factory=list)
+    thread_changes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.thread_changes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert delta to dictionary format."""
+        return {
+            "id": self.thread_id,
+            "fetched_at": self.fetched_at,
+            "thread_changes": self.thread_changes,
+            "added": self.added,
+            "updated": self.updated,
+        }
+
+
+def thread_permalink(thread: Thread, sort: Optional[str] = "new") -> str:
+    """
+    Build the Reddit permalink of a saved thread.
+
+    Thread.url is the submission's link, which for link posts points
+    elsewhere, so the permalink is rebuilt from subreddit and id. A thread
+    saved without its subreddit (see models.parse_fields) gets the short
+    form, which Reddit redirects to the full one.
+    """
+    if thread.subreddit is None:
+        url = f"https://www.reddit.com/comments/{thread.id}/"
+    else:
+        url = f"https://www.reddit.com/r/{thread.subreddit}/comments/{thread.id}/"
+    return f"{url}?sort={sort}" if sort else url
+
+
+def merge_thread(existing: Thread, fresh: Thread) -> ThreadDelta:
+    """
+    Merge new and changed comments from a fresh fetch into an existing thread.
+
+    Comments are matched by id. New comments are attached under their
+    parent (in pre-order, so a new parent is in place before its replies);
+    existing comments get their author, body and score updated. Comments
+    missing from the fresh fetch are kept, so the archive never loses data.
+    The existing thread is modified in place. For a thread saved with a
+    field projection only the projected fields are compared.
+
+    Args:
+        existing: Previously saved thread (modified in place)
+        fresh: Newly fetched thread
+
+    Returns:
+        ThreadDelta describing what changed
+    """
+    delta = ThreadDelta(thread_id=existing.id, fetched_at=fresh.fetched_at)
+    fields = existing.fields
+    thread_fields = [name for name in THREAD_MUTABLE_FIELDS if fields is None or name in fields]
+    comment_fields = [name for name in COMMENT_MUTABLE_FIELDS if fields is None or name in fields]
+
+    for name in thread_fields:
+        value = getattr(fresh, name)
+        if getattr(existing, name) != value:
+            setattr(existing, name, value)
+            delta.thread_changes[name] = value
+
+    by_id = {comment.id: comment for comment, _ in iter_comments(existing.comments)}
+
+    for comment, parent in iter_comments(fresh.comments):
+        current = by_id.get(comment.id)
+        if current is not None:
+            changes = {
+                name: getattr(comment, name)
+                for name in comment_fields
+                if getattr(current, name) != getattr(comment, name)
+            }
+            if changes:
+                for name, value in changes.items():
+                    setattr(current, name, value)
+                delta.updated.append({"id": comment.id, **changes})
+            continue
+
+        target = by_id[parent.id].replies if parent is not None else existing.comments
+        depth = by_id[parent.id].depth + 1 if parent is not None else 0
+        added = Comment(
+            id=comment.id,
+            author=comment.author,
+            body=comment.body,
+            score=comment.score,
+            created_utc=comment.created_utc,
+            depth=depth,
+            replies=[]
+        )
+        target.append(added)
+        by_id[added.id] = added
+
+        record = added.to_dict(existing.fields)
+        del record["replies"]
+        record["parent_id"] = parent.id if parent is not None else None
+        delta.added.append(record)
+
+    if delta.changed:
+        existing.fetched_at = fresh.fetched_at
+
+    return delta
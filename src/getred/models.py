@@ -1,37 +1,173 @@
 """Data models for Reddit threads and comments."""
 
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timezone
+from typing import FrozenSet, Iterable, Iterator, List, Optional, Dict, Any, Tuple, Union
 
+# Slotted dataclasses drop the per-instance __dict__ (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Serialized fields, in output order
+THREAD_FIELDS = (
+    "id", "title", "author", "subreddit", "url", "selftext",
+    "score", "created_utc", "fetched_at", "comment_count",
+)
+COMMENT_FIELDS = ("id", "author", "body", "score", "created_utc", "depth")
+
+
+def parse_fields(names: Iterable[str]) -> FrozenSet[str]:
+    """
+    Validate a field projection, e.g. from "--fields id,author,score".
+
+    A name selects that field on both threads and comments wherever it
+    exists; "id" is always included. Fields left out are neither parsed
+    nor stored, except the numbers tree walks, `top` filters and summaries
+    rely on (comment depth and score, thread comment_count), which are
+    only left out of the output.
+
+    Raises:
+        ValueError: If a name is not in THREAD_FIELDS or COMMENT_FIELDS
+    """
+    fields = {name.strip() for name in names if name.strip()}
+    unknown = sorted(fields.difference(THREAD_FIELDS, COMMENT_FIELDS))
+    if unknown:
+        known = ", ".join(dict.fromkeys(THREAD_FIELDS + COMMENT_FIELDS))
+        raise ValueError(f"Unknown field: {', '.join(unknown)} (expected some of {known})")
+    return frozenset(fields | {"id"})
+
+
+def format_timestamp(timestamp: float) -> str:
+    """Convert Unix timestamp to ISO format string."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def timestamp_from_iso(value: str) -> float:
+    """Convert an ISO string produced by format_timestamp back to a Unix timestamp."""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def created_iso(value: Union[float, str, None]) -> Optional[str]:
+    """Output form of Comment.created_utc: timestamps are formatted, anything else is kept."""
+    return format_timestamp(value) if type(value) is float else value
+
+
+def created_timestamp(value: Optional[str]) -> Union[float, str, None]:
+    """
+    Comment.created_utc for a value read back from output: an ISO string
+    that format_timestamp produced becomes its timestamp again, anything
+    else is kept as is.
+    """
+    if type(value) is not str:
+        return value
+    try:
+        timestamp = timestamp_from_iso(value)
+        if format_timestamp(timestamp) == value:
+            return timestamp
+    except (ValueError, OverflowError, OSError):
+        pass
+    return value
+
+
+@dataclass(**_SLOTS)
 class Comment:
-    """Represents a Reddit comment."""
+    """
+    Represents a Reddit comment.
+
+    created_utc holds the raw Unix timestamp, formatted as an ISO string
+    only on output (see created_iso); a string read from a file that is
+    not a timestamp getred wrote is kept as is. Comments parsed with a
+    field projection hold None in the fields that were not requested.
+    """
 
     id: str
     author: str
     body: str
     score: int
-    created_utc: str
+    created_utc: Union[float, str]
     depth: int
     replies: List['Comment'] = field(default_factory=list)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert comment to dictionary format."""
+    def _to_flat_dict(self, fields: Optional[FrozenSet[str]] = None) -> Dict[str, Any]:
+        if fields is not None:
+            result = {key: getattr(self, key) for key in COMMENT_FIELDS if key in fields}
+            if "created_utc" in result:
+                result["created_utc"] = created_iso(self.created_utc)
+            result["replies"] = []
+            return result
         return {
             "id": self.id,
             "author": self.author,
             "body": self.body,
             "score": self.score,
-            "created_utc": self.created_utc,
+            "created_utc": created_iso(self.created_utc),
             "depth": self.depth,
-            "replies": [reply.to_dict() for reply in self.replies]
+            "replies": []
         }
 
+    def to_dict(self, fields: Optional[FrozenSet[str]] = None) -> Dict[str, Any]:
+        """
+        Convert comment to dictionary format.
 
-@dataclass
+        Replies are converted with an explicit stack rather than recursion.
+
+        Args:
+            fields: Only include these fields (and replies); default: all
+        """
+        result = self._to_flat_dict(fields)
+        stack = [(self, result)]
+        while stack:
+            comment, comment_dict = stack.pop()
+            replies = comment_dict["replies"]
+            for reply in comment.replies:
+                reply_dict = reply._to_flat_dict(fields)
+                replies.append(reply_dict)
+                stack.append((reply, reply_dict))
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], depth: int = 0) -> 'Comment':
+        """
+        Create a comment (with replies) from the output of to_dict().
+
+        Fields left out by a projection are set to None, except depth,
+        which is taken from the comment's place in the tree.
+
+        Args:
+            data: Comment dictionary
+            depth: Depth of the comment if `data` has none
+        """
+        def build(item: Dict[str, Any], depth: int) -> 'Comment':
+            return cls(
+                id=item["id"],
+                author=item.get("author"),
+                body=item.get("body"),
+                score=item.get("score"),
+                created_utc=created_timestamp(item.get("created_utc")),
+                depth=item.get("depth", depth),
+                replies=[]
+            )
+
+        root = build(data, depth)
+        stack = [(root, data)]
+        while stack:
+            comment, item = stack.pop()
+            for reply_data in item.get("replies", []):
+                reply = build(reply_data, comment.depth + 1)
+                comment.replies.append(reply)
+                stack.append((reply, reply_data))
+        return root
+
+
+@dataclass(**_SLOTS)
 class Thread:
-    """Represents a Reddit thread."""
+    """
+    Represents a Reddit thread.
+
+    A thread parsed with a field projection records it in `fields`: the
+    fields it and its comments were not parsed with hold None, and are
+    left out of to_dict() and the writers' output.
+    """
 
     id: str
     title: str
@@ -44,10 +180,22 @@ class Thread:
     fetched_at: str
     comment_count: int
     comments: List[Comment] = field(default_factory=list)
+    # Comments dropped by a parser filter; None when no filter was applied
+    pruned_count: Optional[int] = None
+    # Field projection (see parse_fields); None when every field was kept
+    fields: Optional[FrozenSet[str]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert thread to dictionary format."""
-        return {
+        fields = self.fields
+        if fields is not None:
+            result = {key: getattr(self, key) for key in THREAD_FIELDS if key in fields}
+            if self.pruned_count is not None:
+                result["pruned_count"] = self.pruned_count
+            result["comments"] = [comment.to_dict(fields) for comment in self.comments]
+            return result
+
+        result = {
             "id": self.id,
             "title": self.title,
             "author": self.author,
@@ -58,5 +206,60 @@ class Thread:
             "created_utc": self.created_utc,
             "fetched_at": self.fetched_at,
             "comment_count": self.comment_count,
-            "comments": [comment.to_dict() for comment in self.comments]
         }
+        if self.pruned_count is not None:
+            result["pruned_count"] = self.pruned_count
+        result["comments"] = [comment.to_dict() for comment in self.comments]
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Thread':
+        """
+        Create a thread from the output of to_dict(), e.g. a saved JSON file.
+
+        Output written with a field projection (--fields) is recognised by
+        its missing keys: the projection is restored in `fields`, and the
+        fields left out are None.
+        """
+        comments = data.get("comments", [])
+        return cls(
+            id=data["id"],
+            title=data.get("title"),
+            author=data.get("author"),
+            subreddit=data.get("subreddit"),
+            url=data.get("url"),
+            selftext=data.get("selftext"),
+            score=data.get("score"),
+            created_utc=data.get("created_utc"),
+            fetched_at=data.get("fetched_at"),
+            comment_count=data.get("comment_count"),
+            comments=[Comment.from_dict(comment) for comment in comments],
+            pruned_count=data.get("pruned_count"),
+            fields=_saved_fields(data, comments[0] if comments else None)
+        )
+
+
+def _saved_fields(data: Dict[str, Any], comment: Optional[Dict[str, Any]]) -> Optional[FrozenSet[str]]:
+    """The projection a thread dictionary was written with, or None if it has every field."""
+    keys = [key for key in THREAD_FIELDS if key in data]
+    if comment is not None:
+        keys.extend(key for key in COMMENT_FIELDS if key in comment)
+        if len(keys) == len(THREAD_FIELDS) + len(COMMENT_FIELDS):
+            return None
+    elif len(keys) == len(THREAD_FIELDS):
+        return None
+    return parse_fields(keys)
+
+
+def iter_comments(comments: List[Comment]) -> Iterator[Tuple[Comment, Optional[Comment]]]:
+    """
+    Walk comment trees in pre-order without recursion.
+
+    Yields:
+        (comment, parent) pairs; parent is None for top-level comments
+    """
+    stack: List[Tuple[Comment, Optional[Comment]]] = [(c, None) for c in reversed(comments)]
+    while stack:
+        comment, parent = stack.pop()
+        yield comment, parent
+        stack.extend((reply, comment) for reply in reversed(comment.replies))
@@ -1,79 +1,312 @@
 """Parser for Reddit JSON responses."""
 
+import sys
 from datetime import datetime, timezone
-from typing import Dict, Any, List
-from getred.models import Thread, Comment
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+from getred.filters import CommentFilter
+from getred.index import CommentIndex
+from getred.models import Thread, Comment, format_timestamp
 
 
 def parse_timestamp(timestamp: float) -> str:
     """Convert Unix timestamp to ISO format string."""
-    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat().replace('+00:00', 'Z')
+    return format_timestamp(timestamp)
 
 
-def parse_comment(comment_data: Dict[str, Any], depth: int = 0) -> Comment:
+def build_comment(data: Dict[str, Any], depth: int, fields: Optional[FrozenSet[str]] = None) -> Comment:
     """
-    Parse a comment from Reddit JSON data.
-
-    Args:
-        comment_data: Raw comment data from Reddit API
-        depth: Nesting depth of the comment
+    Build a Comment without replies from a comment's data dict, projected to `fields` if given.
 
-    Returns:
-        Comment object with nested replies
+    For callers that walk the reply tree themselves, like the follower.
     """
-    data = comment_data.get('data', {})
+    if fields is not None:
+        return Comment(
+            id=data.get('id', ''),
+            author=sys.intern(data.get('author') or '[deleted]') if 'author' in fields else None,
+            body=data.get('body', '[deleted]') if 'body' in fields else None,
+            score=data.get('score', 0),
+            created_utc=float(data.get('created_utc', 0)) if 'created_utc' in fields else None,
+            depth=depth,
+            replies=[]
+        )
 
-    # Handle deleted/removed comments
-    author = data.get('author', '[deleted]')
+    # Handle deleted/removed comments; author names repeat, so share them
+    author = sys.intern(data.get('author') or '[deleted]')
     body = data.get('body', '[deleted]')
 
-    comment = Comment(
+    return Comment(
         id=data.get('id', ''),
         author=author,
         body=body,
         score=data.get('score', 0),
-        created_utc=parse_timestamp(data.get('created_utc', 0)),
+        created_utc=float(data.get('created_utc', 0)),
         depth=depth,
         replies=[]
     )
 
-    # Parse nested replies
-    replies_data = data.get('replies')
-    if replies_data and isinstance(replies_data, dict):
-        replies_listing = replies_data.get('data', {}).get('children', [])
-        for reply_data in replies_listing:
+
+def count_comments(comment_data: Dict[str, Any]) -> int:
+    """Count a raw comment and all of its nested replies ("more" placeholders excluded)."""
+    count = 0
+    stack = [comment_data]
+    while stack:
+        item = stack.pop()
+        if item.get('kind') != 't1':
+            continue
+        count += 1
+        replies_data = item.get('data', {}).get('replies')
+        if replies_data and isinstance(replies_data, dict):
+            stack.extend(replies_data.get('data', {}).get('children', []))
+    return count
+
+
+def parse_comment(
+    comment_data: Dict[str, Any],
+    depth: int = 0,
+    comment_filter: Optional[CommentFilter] = None,
+    fields: Optional[FrozenSet[str]] = None,
+    index: Optional[CommentIndex] = None,
+) -> Comment:
+    """
+    Parse a comment from Reddit JSON data.
+
+    Nested replies are parsed with an explicit stack rather than recursion,
+    so arbitrarily deep reply chains cannot hit the recursion limit.
+
+    Args:
+        comment_data: Raw comment data from Reddit API
+        depth: Nesting depth of the comment
+        comment_filter: Drop replies (with their subtrees) that fail it;
+            the comment itself is not checked
+        fields: Only extract these fields (see models.parse_fields)
+        index: Add the comment (as a top-level comment) and its replies
+            to this index as they are built
+
+    Returns:
+        Comment object with nested replies
+    """
+    return _parse_comment(comment_data, depth, comment_filter, fields, index)[0]
+
+
+def _parse_comment(
+    comment_data: Dict[str, Any],
+    depth: int,
+    comment_filter: Optional[CommentFilter],
+    fields: Optional[FrozenSet[str]] = None,
+    index: Optional[CommentIndex] = None,
+) -> Tuple[Comment, int]:
+    """parse_comment, also returning the number of comments pruned by the filter."""
+    data = comment_data.get('data', {})
+    comment = build_comment(data, depth, fields)
+    keep = comment_filter.keep if comment_filter is not None else None
+    add_to_index = index.add if index is not None else None
+    if add_to_index is not None:
+        add_to_index(comment, None)
+    pruned = 0
+
+    stack = [(comment, data)]
+    push = stack.append
+    pop = stack.pop
+    intern = sys.intern
+    while stack:
+        parent, parent_data = pop()
+
+        # Parse nested replies
+        replies_data = parent_data.get('replies')
+        if not replies_data or not isinstance(replies_data, dict):
+            continue
+
+        child_depth = parent.depth + 1
+        append_reply = parent.replies.append
+        for reply_data in replies_data.get('data', {}).get('children', []):
             # Skip "more" objects that indicate additional comments
             if reply_data.get('kind') == 't1':
-                comment.replies.append(parse_comment(reply_data, depth + 1))
+                # Same fields as build_comment, inlined on this hot path
+                child_data = reply_data.get('data', {})
+                if keep is not None and not keep(child_data, child_depth):
+                    pruned += count_comments(reply_data)
+                    continue
+                if fields is not None:
+                    child = build_comment(child_data, child_depth, fields)
+                else:
+                    child = Comment(
+                        id=child_data.get('id', ''),
+                        author=intern(child_data.get('author') or '[deleted]'),
+                        body=child_data.get('body', '[deleted]'),
+                        score=child_data.get('score', 0),
+                        created_utc=float(child_data.get('created_utc', 0)),
+                        depth=child_depth,
+                        replies=[]
+                    )
+                append_reply(child)
+                push((child, child_data))
+                if add_to_index is not None:
+                    add_to_index(child, parent)
 
-    return comment
+    return comment, pruned
 
 
-def parse_comments(comments_listing: List[Dict[str, Any]]) -> List[Comment]:
+def parse_comments(
+    comments_listing: List[Dict[str, Any]],
+    comment_filter: Optional[CommentFilter] = None,
+    fields: Optional[FrozenSet[str]] = None,
+    index: Optional[CommentIndex] = None,
+) -> List[Comment]:
     """
     Parse all top-level comments from the comments listing.
 
     Args:
         comments_listing: List of comment objects from Reddit API
+        comment_filter: Only build the comments that pass this filter
+        fields: Only extract these fields (see models.parse_fields)
+        index: Add the comments to this index as they are built
 
     Returns:
         List of Comment objects
     """
+    return _parse_comments(comments_listing, comment_filter, fields, index)[0]
+
+
+def _parse_comments(
+    comments_listing: List[Dict[str, Any]],
+    comment_filter: Optional[CommentFilter],
+    fields: Optional[FrozenSet[str]] = None,
+    index: Optional[CommentIndex] = None,
+) -> Tuple[List[Comment], int]:
+    """parse_comments, also returning the number of comments pruned by the filter."""
+    # Only parse actual comments (kind = t1), skip "more" objects
+    items = [item for item in comments_listing if item.get('kind') == 't1']
+    if comment_filter is None:
+        return [parse_comment(item, depth=0, fields=fields, index=index) for item in items], 0
+
+    pruned = 0
+    kept = []
+    for item in items:
+        if comment_filter.keep(item.get('data', {}), 0):
+            kept.append(item)
+        else:
+            pruned += count_comments(item)
+    if comment_filter.top is not None and len(kept) > comment_filter.top:
+        # Stable sort: ties keep Reddit's order
+        kept.sort(key=lambda item: item.get('data', {}).get('score', 0), reverse=True)
+        pruned += sum(count_comments(item) for item in kept[comment_filter.top:])
+        del kept[comment_filter.top:]
+
     comments = []
-    for item in comments_listing:
-        # Only parse actual comments (kind = t1), skip "more" objects
-        if item.get('kind') == 't1':
-            comments.append(parse_comment(item, depth=0))
+    for item in kept:
+        comment, subtree_pruned = _parse_comment(item, 0, comment_filter, fields, index)
+        comments.append(comment)
+        pruned += subtree_pruned
+    return comments, pruned
+
+
+def collect_more_ids(comments_listing: List[Dict[str, Any]]) -> List[str]:
+    """
+    Collect the comment ids hidden behind "more" placeholders.
 
-    return comments
+    Walks the whole raw comment tree, including nested replies. Placeholders
+    without ids ("continue this thread" links) are ignored.
 
+    Args:
+        comments_listing: List of comment objects from Reddit API
 
-def parse_thread(json_data: List[Dict[str, Any]]) -> Thread:
+    Returns:
+        Comment ids in the order they appear in the listing
+    """
+    more_ids = []
+    stack = [iter(comments_listing)]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            continue
+
+        kind = item.get('kind')
+        data = item.get('data', {})
+        if kind == 'more':
+            more_ids.extend(data.get('children', []))
+        elif kind == 't1':
+            replies_data = data.get('replies')
+            if replies_data and isinstance(replies_data, dict):
+                stack.append(iter(replies_data.get('data', {}).get('children', [])))
+
+    return more_ids
+
+
+def build_thread(
+    post_data: Dict[str, Any],
+    comments: List[Comment],
+    pruned_count: Optional[int] = None,
+    fields: Optional[FrozenSet[str]] = None,
+) -> Thread:
+    """
+    Build a Thread from the post's data dict and its parsed comments.
+
+    Args:
+        post_data: The "data" dict of the t3 post object
+        comments: Parsed top-level comments
+        pruned_count: Number of comments dropped by a CommentFilter, if
+            one was applied
+        fields: Only extract these fields (see models.parse_fields); the
+            comments must have been parsed with the same projection
+
+    Returns:
+        Thread object
+    """
+    if fields is not None:
+        def get(key: str, default: Any) -> Any:
+            return post_data.get(key, default) if key in fields else None
+
+        fetched_at = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+        return Thread(
+            id=post_data.get('id', ''),
+            title=get('title', ''),
+            author=get('author', '[deleted]'),
+            subreddit=get('subreddit', ''),
+            url=get('url', ''),
+            selftext=get('selftext', ''),
+            score=get('score', 0),
+            created_utc=parse_timestamp(post_data.get('created_utc', 0)) if 'created_utc' in fields else None,
+            fetched_at=fetched_at if 'fetched_at' in fields else None,
+            comment_count=post_data.get('num_comments', 0),
+            comments=comments,
+            pruned_count=pruned_count,
+            fields=fields
+        )
+
+    return Thread(
+        id=post_data.get('id', ''),
+        title=post_data.get('title', ''),
+        author=post_data.get('author', '[deleted]'),
+        subreddit=post_data.get('subreddit', ''),
+        url=post_data.get('url', ''),
+        selftext=post_data.get('selftext', ''),
+        score=post_data.get('score', 0),
+        created_utc=parse_timestamp(post_data.get('created_utc', 0)),
+        fetched_at=datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+        comment_count=post_data.get('num_comments', 0),
+        comments=comments,
+        pruned_count=pruned_count
+    )
+
+
+def parse_thread(
+    json_data: List[Dict[str, Any]],
+    comment_filter: Optional[CommentFilter] = None,
+    fields: Optional[FrozenSet[str]] = None,
+    index: Optional[CommentIndex] = None,
+) -> Thread:
     """
     Parse a Reddit thread from JSON response.
 
     Args:
         json_data: Raw JSON response from Reddit API (list with 2 elements)
+        comment_filter: Only build the comments that pass this filter;
+            the number dropped is stored in Thread.pruned_count
+        fields: Only extract these fields (see models.parse_fields); the
+            projection is stored in Thread.fields
+        index: Fill this CommentIndex with the comments in the same pass
 
     Returns:
         Thread object with all data and nested comments
@@ -82,18 +315,8 @@ def parse_thread(json_data: List[Dict[str, Any]]) -> Thread:
     post_listing = json_data[0]['data']['children'][0]['data']
     comments_listing = json_data[1]['data']['children']
 
-    thread = Thread(
-        id=post_listing.get('id', ''),
-        title=post_listing.get('title', ''),
-        author=post_listing.get('author', '[deleted]'),
-        subreddit=post_listing.get('subreddit', ''),
-        url=post_listing.get('url', ''),
-        selftext=post_listing.get('selftext', ''),
-        score=post_listing.get('score', 0),
-        created_utc=parse_timestamp(post_listing.get('created_utc', 0)),
-        fetched_at=datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
-        comment_count=post_listing.get('num_comments', 0),
-        comments=parse_comments(comments_listing)
-    )
-
-    return thread
+    if comment_filter is None:
+        comments = parse_comments(comments_listing, fields=fields, index=index)
+        return build_thread(post_listing, comments, fields=fields)
+    comments, pruned = _parse_comments(comments_listing, comment_filter, fields, index)
+    return build_thread(post_listing, comments, pruned, fields)
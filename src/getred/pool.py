@@ -0,0 +1,118 @@
+"""Connection pool settings, compression negotiation and connection reuse statistics."""
+
+import importlib.util
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+# Reddit is a single host, so a small pool covers a batch's fetch threads;
+# idle connections are kept long enough to span rate-limit pauses
+DEFAULT_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60.0)
+
+Trace = Callable[[str, Dict[str, Any]], None]
+
+
+@lru_cache(maxsize=None)
+def accept_encoding() -> str:
+    """
+    Accept-Encoding header value: gzip and deflate, plus br if a Brotli
+    decoder is installed, since httpx can only decode br then.
+    """
+    encodings = ["gzip", "deflate"]
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+        encodings.append("br")
+    return ", ".join(encodings)
+
+
+@lru_cache(maxsize=None)
+def http2_available() -> bool:
+    """Whether the h2 package (the getred[http2] extra) is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def pool_limits(max_connections: Optional[int] = None) -> httpx.Limits:
+    """
+    Pool limits for at most `max_connections` connections, all of which may
+    be kept alive; DEFAULT_LIMITS if not given.
+    """
+    if max_connections is None:
+        return DEFAULT_LIMITS
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=DEFAULT_LIMITS.keepalive_expiry,
+    )
+
+
+def network_transport(limits: Optional[httpx.Limits] = None, http2: Optional[bool] = None) -> httpx.HTTPTransport:
+    """
+    Pooled transport that sends requests over the network.
+
+    Args:
+        limits: Connection pool limits (default: DEFAULT_LIMITS)
+        http2: Negotiate HTTP/2 (default: if the h2 package is installed)
+    """
+    return httpx.HTTPTransport(
+        limits=limits if limits is not None else DEFAULT_LIMITS,
+        http2=http2_available() if http2 is None else http2,
+    )
+
+
+@dataclass
+class ConnectionStats:
+    """
+    Counters for connection pool use, from httpcore's trace events.
+
+    Only requests that reach the network are counted; cached responses
+    and mocked transports leave the counters alone.
+    """
+
+    requests: int = 0
+    opened: int = 0
+    reused: int = 0
+    http2: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def tracer(self, forward: Optional[Trace] = None) -> Trace:
+        """
+        Trace callback for one request, to install as its "trace" extension.
+
+        A request sent without opening a connection first went over a
+        kept-alive one. Events are passed on to `forward`, if given.
+        """
+        opened = False
+
+        def trace(event: str, info: Dict[str, Any]) -> None:
+            nonlocal opened
+            if event == "connection.connect_tcp.complete":
+                opened = True
+                with self._lock:
+                    self.opened += 1
+            elif event.endswith(".send_request_headers.started"):
+                with self._lock:
+                    self.requests += 1
+                    if not opened:
+                        self.reused += 1
+                    if event.startswith("http2."):
+                        self.http2 += 1
+            if forward is not None:
+                forward(event, info)
+
+        return trace
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Share of requests sent over a kept-alive connection."""
+        return self.reused / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, int]:
+        """Convert stats to dictionary format."""
+        return {
+            "requests": self.requests,
+            "opened": self.opened,
+            "reused": self.reused,
+            "http2": self.http2,
+        }
@@ -0,0 +1,134 @@
+"""Decoding, parsing and saving threads in worker processes."""
+
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple
+
+from getred import jsonbackend
+from getred.filters import CommentFilter
+from getred.parser import parse_thread
+from getred.sqlite import ThreadDatabase
+from getred.timings import Timings
+from getred.utils import save_thread
+
+# (url, raw response body, output file or None)
+SaveJob = Tuple[str, bytes, Optional[Path]]
+
+# Seconds a worker waits for another worker's database transaction
+DATABASE_TIMEOUT = 300.0
+
+# Database connections opened by this worker process, by path
+_databases: Dict[str, ThreadDatabase] = {}
+
+
+@dataclass
+class ProcessedThread:
+    """Status of one thread saved by a worker; all that is sent back to the parent."""
+
+    comment_count: int = 0
+    parsed_comments: int = 0
+    error: Optional[str] = None
+    phases: Dict[str, float] = field(default_factory=dict)
+
+
+def _database(path: str) -> ThreadDatabase:
+    if path not in _databases:
+        _databases[path] = ThreadDatabase(path, timeout=DATABASE_TIMEOUT)
+    return _databases[path]
+
+
+def save_raw_thread(
+    url: str,
+    body: bytes,
+    output_path: Optional[Path],
+    output_format: str = "json",
+    pretty: bool = True,
+    database_path: Optional[str] = None,
+    comment_filter: Optional[CommentFilter] = None,
+    fields: Optional[FrozenSet[str]] = None,
+) -> ProcessedThread:
+    """
+    Decode, parse and save one fetched thread, capturing any error.
+
+    Args:
+        url: Thread URL, for error messages
+        body: Raw JSON response body
+        output_path: File to write, or None to only save to the database
+        output_format: Output format, a key of utils.OUTPUT_FORMATS
+        pretty: Whether to pretty-print the JSON
+        database_path: Also save to the SQLite database at this path; each
+            worker process keeps its own connection open
+        comment_filter: Only keep the comments that pass this filter
+        fields: Only extract and save these fields (see models.parse_fields)
+
+    Returns:
+        ProcessedThread with the thread's comment count and the number of
+        comments parsed, or the error, and the time spent decoding,
+        parsing and writing
+    """
+    timings = Timings()
+    try:
+        with timings.measure("decode"):
+            try:
+                json_data = jsonbackend.loads(body)
+            except ValueError as e:
+                raise ValueError(f"Non-JSON response from Reddit endpoint (url={url})") from e
+        with timings.measure("parse"):
+            thread = parse_thread(json_data, comment_filter, fields)
+        timings.add_thread(thread)
+        with timings.measure("write"):
+            if database_path is not None:
+                _database(database_path).save(thread)
+            if output_path is not None:
+                save_thread(thread, output_path, output_format, pretty=pretty)
+    except Exception as e:
+        return ProcessedThread(error=str(e) or type(e).__name__, phases=timings.phases)
+    return ProcessedThread(thread.comment_count, timings.comments, phases=timings.phases)
+
+
+def save_raw_threads(
+    jobs: Sequence[SaveJob],
+    output_format: str = "json",
+    pretty: bool = True,
+    database_path: Optional[str] = None,
+    comment_filter: Optional[CommentFilter] = None,
+    fields: Optional[FrozenSet[str]] = None,
+) -> List[ProcessedThread]:
+    """Run save_raw_thread for a chunk of jobs; the unit of work sent to a worker."""
+    return [
+        save_raw_thread(url, body, output_path, output_format, pretty, database_path, comment_filter, fields)
+        for url, body, output_path in jobs
+    ]
+
+
+def chunk_results(future: Future, jobs: Sequence[SaveJob]) -> Iterator[Tuple[SaveJob, ProcessedThread]]:
+    """
+    Pair the jobs of a finished save_raw_threads chunk with their statuses.
+
+    If the chunk failed as a whole, e.g. because its worker process died,
+    every job gets the error.
+    """
+    try:
+        statuses = future.result()
+    except Exception as e:
+        error = str(e) or type(e).__name__
+        statuses = [ProcessedThread(error=error) for _ in jobs]
+    return zip(jobs, statuses)
+
+
+def process_pool(processes: int) -> ProcessPoolExecutor:
+    """
+    Create a pool of `processes` workers.
+
+    Workers are spawned rather than forked: the parent has fetch threads
+    and open connections, which a forked child would inherit in whatever
+    state they were in. Workers use the same JSON backend as the parent.
+    """
+    return ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=jsonbackend.set_backend,
+        initargs=(jsonbackend.get_backend().name,),
+    )
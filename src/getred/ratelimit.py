@@ -0,0 +1,204 @@
+"""Rate limiting and retry policy for Reddit requests."""
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+import httpx
+
+from getred.timings import RATE_LIMIT_EVENT
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds from now."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RateLimiter:
+    """
+    Token bucket limiting the request rate, driven by Reddit's headers.
+
+    Tokens refill at `rate` per second up to `burst`. Each request takes one
+    token, waiting when none is left. Responses feed back into the bucket:
+    X-Ratelimit-Remaining / X-Ratelimit-Reset set the rate so the remaining
+    requests are spread evenly over the rest of the window, an exhausted
+    window blocks until it resets, and a 429 with Retry-After blocks for
+    that long.
+
+    One limiter can be shared by any number of threads and asyncio tasks;
+    waiting happens outside the lock with time.sleep or asyncio.sleep.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate: Initial requests per second, until headers say otherwise
+            burst: Maximum number of requests that can be sent back to back
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = burst
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Take a token and return how many seconds to wait before sending.
+
+        The token is taken immediately, so concurrent callers queue up
+        behind each other instead of all waking at the same moment.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            delay = max(0.0, self._blocked_until - now)
+            if self._tokens < 0:
+                delay = max(delay, -self._tokens / self.rate)
+            return delay
+
+    def acquire(self) -> float:
+        """Block the calling thread until a request may be sent; return the seconds waited."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self) -> float:
+        """Wait without blocking the event loop until a request may be sent; return the seconds waited."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def block_for(self, seconds: float) -> None:
+        """Hold back all requests for the given number of seconds."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+    def update(self, response: httpx.Response) -> None:
+        """Adjust the bucket from a response's rate limit headers."""
+        if response.status_code == 429:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                self.block_for(retry_after)
+
+        try:
+            remaining = float(response.headers["X-Ratelimit-Remaining"])
+            reset = float(response.headers["X-Ratelimit-Reset"])
+        except (KeyError, ValueError):
+            return
+
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if remaining < 1:
+                self._blocked_until = max(self._blocked_until, now + reset)
+                self._tokens = min(self._tokens, 0.0)
+            elif reset > 0:
+                self.rate = remaining / reset
+                self._tokens = min(self._tokens, remaining)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request.
+
+    Transport errors and responses with a status in `statuses` are retried
+    up to `max_retries` times. The wait honors Retry-After when present
+    (giving up if it exceeds `max_retry_after`), and otherwise grows
+    exponentially from `backoff_base`, capped at `backoff_max`, with random
+    jitter so that concurrent clients spread out instead of retrying in
+    lockstep.
+    """
+
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    max_retry_after: float = 300.0
+    statuses: frozenset = RETRY_STATUSES
+
+    def backoff(self, attempt: int) -> float:
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    def delay(self, attempt: int, response: Optional[httpx.Response] = None) -> Optional[float]:
+        """
+        Seconds to wait before retry number `attempt` + 1, or None to give up.
+
+        Args:
+            attempt: Number of retries already made
+            response: The response received, or None after a transport error
+        """
+        if attempt >= self.max_retries:
+            return None
+        if response is None:
+            return self.backoff(attempt)
+        if response.status_code not in self.statuses:
+            return None
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_retry_after else None
+        return self.backoff(attempt)
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """Transport wrapper that sends every request through a RateLimiter."""
+
+    def __init__(self, limiter: RateLimiter, transport: Optional[httpx.BaseTransport] = None):
+        self.limiter = limiter
+        self._transport = transport if transport is not None else httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        waited = self.limiter.acquire()
+        trace = request.extensions.get("trace")
+        if waited and trace is not None:
+            trace(RATE_LIMIT_EVENT, {"seconds": waited})
+        response = self._transport.handle_request(request)
+        self.limiter.update(response)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    """Async transport wrapper that sends every request through a RateLimiter."""
+
+    def __init__(self, limiter: RateLimiter, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.limiter = limiter
+        self._transport = transport if transport is not None else httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.acquire_async()
+        response = await self._transport.handle_async_request(request)
+        self.limiter.update(response)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,209 @@
+"""SQLite archive of threads and comments."""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from getred import jsonbackend
+from getred.models import Comment, Thread, created_iso, created_timestamp, iter_comments
+from getred.writer import COMMENT_KEYS, THREAD_KEYS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS threads (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    author TEXT,
+    subreddit TEXT,
+    url TEXT,
+    selftext TEXT,
+    score INTEGER,
+    created_utc TEXT,
+    fetched_at TEXT,
+    comment_count INTEGER,
+    pruned_count INTEGER
+);
+CREATE TABLE IF NOT EXISTS comments (
+    id TEXT PRIMARY KEY,
+    thread_id TEXT NOT NULL REFERENCES threads(id),
+    parent_id TEXT,
+    depth INTEGER,
+    author TEXT,
+    body TEXT,
+    score INTEGER,
+    created_utc TEXT
+);
+CREATE INDEX IF NOT EXISTS comments_thread_id ON comments(thread_id);
+CREATE INDEX IF NOT EXISTS comments_parent_id ON comments(parent_id);
+CREATE INDEX IF NOT EXISTS comments_author ON comments(author);
+CREATE INDEX IF NOT EXISTS comments_created_utc ON comments(created_utc);
+"""
+
+# pruned_count is NULL for a thread parsed without a filter
+_THREAD_COLUMNS = THREAD_KEYS + ("pruned_count",)
+_COMMENT_COLUMNS = ("id", "thread_id", "parent_id", "depth", "author", "body", "score", "created_utc")
+# Comment columns written whatever a thread's field projection
+_STRUCTURE_COLUMNS = ("id", "thread_id", "parent_id", "depth")
+
+
+def _upsert(table: str, columns: Iterable[str]) -> str:
+    columns = list(columns)
+    updates = ", ".join(f"{name} = excluded.{name}" for name in columns[1:])
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+        + (f"ON CONFLICT(id) DO UPDATE SET {updates}" if updates else "ON CONFLICT(id) DO NOTHING")
+    )
+
+
+UPSERT_THREAD = _upsert("threads", _THREAD_COLUMNS)
+UPSERT_COMMENT = _upsert("comments", _COMMENT_COLUMNS)
+
+
+class ThreadDatabase:
+    """
+    Threads and comments stored in normalized SQLite tables.
+
+    Each saved thread is written in a single transaction with bulk
+    upserts keyed by id, so saving a refetched thread updates it in place:
+    changed comments are updated, new ones added, and comments that have
+    since disappeared from Reddit are kept. The database runs in WAL mode
+    so it can be queried while a batch is writing to it.
+
+    One instance may be shared between threads; writes are serialized.
+    """
+
+    def __init__(self, path: Union[str, Path], timeout: float = 5.0):
+        """
+        Args:
+            path: Database file (created with the schema if missing)
+            timeout: Seconds to wait for another connection's write
+                transaction to finish before failing
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=timeout, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+
+    def __enter__(self) -> 'ThreadDatabase':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def save(self, thread: Thread) -> None:
+        """
+        Insert or update a thread and all of its comments.
+
+        For a thread parsed with a field projection only the projected
+        columns are written (plus the comments' place in the tree), so
+        stored values of the other columns are kept.
+
+        Args:
+            thread: Thread to save
+        """
+        if thread.fields is not None:
+            self._save_projected(thread)
+            return
+
+        thread_id = thread.id
+        rows = (
+            (
+                comment.id,
+                thread_id,
+                parent.id if parent is not None else None,
+                comment.depth,
+                comment.author,
+                comment.body,
+                comment.score,
+                created_iso(comment.created_utc),
+            )
+            for comment, parent in iter_comments(thread.comments)
+        )
+        with self._lock, self._conn:
+            self._conn.execute(UPSERT_THREAD, [getattr(thread, key) for key in _THREAD_COLUMNS])
+            self._conn.executemany(UPSERT_COMMENT, rows)
+
+    def _save_projected(self, thread: Thread) -> None:
+        fields = thread.fields
+        thread_keys = [key for key in THREAD_KEYS if key in fields] + ["pruned_count"]
+        comment_keys = [key for key in _COMMENT_COLUMNS[len(_STRUCTURE_COLUMNS):] if key in fields]
+        thread_id = thread.id
+        rows = (
+            (comment.id, thread_id, parent.id if parent is not None else None, comment.depth)
+            + tuple(
+                created_iso(comment.created_utc) if key == "created_utc" else getattr(comment, key)
+                for key in comment_keys
+            )
+            for comment, parent in iter_comments(thread.comments)
+        )
+        with self._lock, self._conn:
+            self._conn.execute(_upsert("threads", thread_keys), [getattr(thread, key) for key in thread_keys])
+            self._conn.executemany(_upsert("comments", _STRUCTURE_COLUMNS + tuple(comment_keys)), rows)
+
+    def import_json(self, path: Union[str, Path]) -> Thread:
+        """
+        Save a thread from a JSON file written by `getred fetch`.
+
+        Args:
+            path: JSON output file
+
+        Returns:
+            The imported thread
+        """
+        thread = Thread.from_dict(jsonbackend.loads(Path(path).read_bytes()))
+        self.save(thread)
+        return thread
+
+    def thread_ids(self) -> List[str]:
+        """Ids of all stored threads."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT id FROM threads ORDER BY id")]
+
+    def load_thread(self, thread_id: str) -> Optional[Thread]:
+        """
+        Rebuild a stored thread with its comment tree.
+
+        Comments are attached in insertion order, so a refetched thread
+        keeps its original order with new replies after existing ones.
+
+        Returns:
+            The thread, or None if it is not stored
+        """
+        with self._lock:
+            thread_row = self._conn.execute(
+                f"SELECT {', '.join(_THREAD_COLUMNS)} FROM threads WHERE id = ?", (thread_id,)
+            ).fetchone()
+            if thread_row is None:
+                return None
+            comment_rows = self._conn.execute(
+                f"SELECT parent_id, {', '.join(COMMENT_KEYS)} FROM comments "
+                "WHERE thread_id = ? ORDER BY rowid",
+                (thread_id,),
+            ).fetchall()
+
+        thread = Thread(**dict(zip(_THREAD_COLUMNS, thread_row)), comments=[])
+        by_id: Dict[str, Comment] = {}
+        for parent_id, *values in comment_rows:
+            comment = Comment(**dict(zip(COMMENT_KEYS, values)), replies=[])
+            comment.created_utc = created_timestamp(comment.created_utc)
+            by_id[comment.id] = comment
+            parent = by_id.get(parent_id) if parent_id is not None else None
+            (parent.replies if parent is not None else thread.comments).append(comment)
+        return thread
+
+    def comments_by_author(self, author: str) -> List[Dict[str, Any]]:
+        """Flat records of every stored comment by an author, oldest first."""
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT {', '.join(_COMMENT_COLUMNS)} FROM comments "
+                "WHERE author = ? ORDER BY created_utc",
+                (author,),
+            )
+            return [dict(zip(_COMMENT_COLUMNS, row)) for row in cursor]
@@ -0,0 +1,334 @@
+"""Incremental parsing of Reddit thread responses as they download."""
+
+import codecs
+import json
+import re
+from typing import Any, Callable, FrozenSet, Iterable, List, Optional, Tuple
+
+from getred.filters import CommentFilter
+from getred.models import Comment, Thread, iter_comments
+from getred.parser import _parse_comment, build_thread, collect_more_ids, count_comments
+
+Path = Tuple[Any, ...]
+
+_SIGNIFICANT = re.compile(r'[{}\[\]",]')
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# Unterminated string tail; group 1 is a trailing backslash escaping the next chunk's first character
+_STRING_PARTIAL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*(\\?)', re.DOTALL)
+_CAPTURE_SIGNIFICANT = re.compile(r'[{}\[\]"]')
+_WHITESPACE = ' \t\r\n'
+
+POST_PATH: Path = (0,)
+
+
+def _is_comment_path(path: Path) -> bool:
+    """Match top-level items of the comments listing: [1].data.children[i]."""
+    return len(path) == 4 and path[0] == 1 and path[1] == 'data' and path[2] == 'children'
+
+
+class JsonValueSplitter:
+    """
+    Decode selected nested values from a JSON byte stream as they complete.
+
+    The structure around the selected values is tracked by scanning only
+    structural characters. Text outside a selected value is discarded
+    once scanned. The text of a selected value is kept as a list of
+    chunks while bracket and string tracking follows it to its end; it is
+    then joined and decoded once by the C JSON decoder, so values that
+    span many chunks cost linear time.
+
+    A path is a tuple of array indexes and object keys, e.g. the first
+    item of the root array is (0,) and root[1]["data"] is (1, "data").
+    Only objects and arrays can be selected.
+    """
+
+    def __init__(self, select: Callable[[Path], bool]):
+        self._select = select
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        # Each frame: [container char, array index or object key, expecting key]
+        self._stack: List[list] = []
+        # Text of the selected value being captured, and where its scan is
+        self._parts: Optional[List[str]] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._finished = False
+
+    def feed(self, chunk: bytes) -> List[Tuple[Path, Any]]:
+        """Consume a chunk and return the selected values it completed."""
+        completed = self._consume(self._text_decoder.decode(chunk))
+        completed.extend(self._scan())
+        self._compact()
+        return completed
+
+    def close(self) -> List[Tuple[Path, Any]]:
+        """
+        Finish the stream and return any selected values still pending.
+
+        Raises:
+            ValueError: If the stream was not exactly one complete JSON value
+        """
+        completed = self._consume(self._text_decoder.decode(b'', True))
+        completed.extend(self._scan())
+        if self._parts is not None or not self._finished or self._buf[self._pos:].strip(_WHITESPACE):
+            raise ValueError("Incomplete or malformed JSON stream")
+        return completed
+
+    def _path(self) -> Path:
+        return tuple(frame[1] for frame in self._stack)
+
+    def _consume(self, text: str) -> List[Tuple[Path, Any]]:
+        """Add decoded text, first to the value being captured if there is one."""
+        if self._parts is None:
+            self._buf += text
+            return []
+        end = self._capture(text, 0)
+        if end is None:
+            self._parts.append(text)
+            return []
+        self._parts.append(text[:end])
+        captured = ''.join(self._parts)
+        self._parts = None
+        self._buf = text[end:]
+        self._pos = 0
+        return [(self._path(), self._decode(captured, 0, len(captured)))]
+
+    def _decode(self, text: str, start: int, end: int) -> Any:
+        value, value_end = self._json_decoder.raw_decode(text, start)
+        if value_end != end:
+            raise ValueError("Malformed JSON value in stream")
+        return value
+
+    def _capture(self, text: str, pos: int) -> Optional[int]:
+        """
+        Follow the captured value through text[pos:].
+
+        Returns:
+            The index just past the value's end, or None if it continues
+            after this text
+        """
+        if self._in_string:
+            pos = self._skip_string(text, pos)
+            if pos is None:
+                return None
+        depth = self._depth
+        while True:
+            match = _CAPTURE_SIGNIFICANT.search(text, pos)
+            if match is None:
+                self._depth = depth
+                return None
+            char = match.group()
+            pos = match.end()
+            if char == '"':
+                self._in_string = True
+                pos = self._skip_string(text, pos)
+                if pos is None:
+                    self._depth = depth
+                    return None
+            elif char == '{' or char == '[':
+                depth += 1
+            else:
+                depth -= 1
+                if not depth:
+                    self._depth = 0
+                    return pos
+
+    def _skip_string(self, text: str, pos: int) -> Optional[int]:
+        """Skip the rest of a string; return the index past its closing quote, or None."""
+        if self._escape:
+            if pos >= len(text):
+                return None
+            self._escape = False
+            pos += 1
+        tail = _STRING_TAIL.match(text, pos)
+        if tail is None:
+            # The string continues in the next chunk; note a dangling backslash
+            self._escape = _STRING_PARTIAL.match(text, pos).group(1) == '\\'
+            return None
+        self._in_string = False
+        return tail.end()
+
+    def _scan(self) -> List[Tuple[Path, Any]]:
+        buf = self._buf
+        stack = self._stack
+        completed = []
+        if self._parts is not None:
+            return completed
+
+        if not self._started:
+            stripped = buf.lstrip(_WHITESPACE)
+            if not stripped:
+                return completed
+            if stripped[0] not in '[{':
+                raise ValueError("Expected a JSON array or object")
+            self._started = True
+
+        while True:
+            match = _SIGNIFICANT.search(buf, self._pos)
+            if match is None:
+                self._pos = len(buf)
+                return completed
+
+            index = match.start()
+            char = buf[index]
+
+            if self._finished:
+                raise ValueError("Unexpected data after JSON value")
+
+            if char == '"':
+                tail = _STRING_TAIL.match(buf, index + 1)
+                if tail is None:
+                    # String continues in the next chunk
+                    self._pos = index
+                    return completed
+                if stack and stack[-1][0] == '{' and stack[-1][2]:
+                    stack[-1][1] = json.loads(buf[index:tail.end()])
+                    stack[-1][2] = False
+                self._pos = tail.end()
+                continue
+
+            self._pos = index + 1
+
+            if char == '{' or char == '[':
+                if self._select(self._path()):
+                    self._depth = 1
+                    end = self._capture(buf, index + 1)
+                    if end is None:
+                        # Keep the value's text aside until its end arrives
+                        self._parts = [buf[index:]]
+                        self._buf = ''
+                        self._pos = 0
+                        return completed
+                    completed.append((self._path(), self._decode(buf, index, end)))
+                    self._pos = end
+                else:
+                    stack.append([char, None, True] if char == '{' else [char, 0, False])
+            elif char == '}' or char == ']':
+                if not stack:
+                    raise ValueError("Unbalanced JSON stream")
+                stack.pop()
+                if not stack:
+                    self._finished = True
+            else:  # ','
+                if not stack:
+                    raise ValueError("Unexpected ',' outside a container")
+                if stack[-1][0] == '[':
+                    stack[-1][1] += 1
+                else:
+                    stack[-1][2] = True
+
+    def _compact(self) -> None:
+        """Drop text that has been scanned."""
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+
+
+class ThreadStreamParser:
+    """
+    Build a Thread from a Reddit thread response fed in byte chunks.
+
+    Each top-level comment (with its replies) is turned into a Comment as
+    soon as its JSON object has been decoded, and its raw data is released
+    right away.
+    """
+
+    def __init__(
+        self,
+        more_ids: Optional[List[str]] = None,
+        comment_filter: Optional[CommentFilter] = None,
+        fields: Optional[FrozenSet[str]] = None,
+    ):
+        """
+        Args:
+            more_ids: If given, ids behind "more" placeholders are appended
+                to this list, like parser.collect_more_ids does
+            comment_filter: Only build the comments that pass this filter,
+                like parser.parse_thread does
+            fields: Only extract these fields, like parser.parse_thread does
+        """
+        self._splitter = JsonValueSplitter(lambda path: path == POST_PATH or _is_comment_path(path))
+        self._post_data: Optional[dict] = None
+        self._comments: List[Comment] = []
+        self._more_ids = more_ids
+        self._filter = comment_filter
+        self._pruned = 0
+        self._fields = fields
+
+    def feed(self, chunk: bytes) -> List[Comment]:
+        """
+        Consume a chunk of the response body.
+
+        Returns:
+            Top-level comments completed by this chunk; with a `top`
+            filter, close() may still drop some of them
+        """
+        return self._handle(self._splitter.feed(chunk))
+
+    def _handle(self, values: List[Tuple[Path, Any]]) -> List[Comment]:
+        new_comments = []
+        for path, item in values:
+            if path == POST_PATH:
+                self._post_data = item['data']['children'][0]['data']
+                continue
+
+            if self._more_ids is not None:
+                self._more_ids.extend(collect_more_ids([item]))
+            # Only parse actual comments (kind = t1), skip "more" objects
+            if item.get('kind') != 't1':
+                continue
+            if self._filter is not None and not self._filter.keep(item.get('data', {}), 0):
+                self._pruned += count_comments(item)
+                continue
+            comment, pruned = _parse_comment(item, 0, self._filter, self._fields)
+            self._pruned += pruned
+            self._comments.append(comment)
+            new_comments.append(comment)
+        return new_comments
+
+    def close(self) -> Thread:
+        """Finish parsing and return the Thread."""
+        self._handle(self._splitter.close())
+        if self._post_data is None:
+            raise ValueError("Response did not contain a thread listing")
+        if self._filter is None:
+            return build_thread(self._post_data, self._comments, fields=self._fields)
+
+        top = self._filter.top
+        if top is not None and len(self._comments) > top:
+            # Stable sort: ties keep Reddit's order, as in parse_thread
+            self._comments.sort(key=lambda comment: comment.score, reverse=True)
+            self._pruned += sum(1 for _ in iter_comments(self._comments[top:]))
+            del self._comments[top:]
+        return build_thread(self._post_data, self._comments, self._pruned, self._fields)
+
+
+def parse_thread_stream(
+    chunks: Iterable[bytes],
+    more_ids: Optional[List[str]] = None,
+    comment_filter: Optional[CommentFilter] = None,
+    fields: Optional[FrozenSet[str]] = None,
+) -> Thread:
+    """
+    Parse a Reddit thread response from an iterable of byte chunks.
+
+    Produces the same Thread as parse_thread(json.loads(b"".join(chunks)),
+    comment_filter, fields).
+
+    Args:
+        chunks: Response body chunks, e.g. httpx.Response.iter_bytes()
+        more_ids: Optional list that collects ids behind "more" placeholders
+        comment_filter: Only build the comments that pass this filter
+        fields: Only extract these fields (see models.parse_fields)
+
+    Returns:
+        Thread object with all data and nested comments
+    """
+    parser = ThreadStreamParser(more_ids, comment_filter, fields)
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
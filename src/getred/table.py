@@ -0,0 +1,265 @@
+"""Columnar, memory-compact storage for comment trees."""
+
+import math
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from getred.models import Comment, timestamp_from_iso
+from getred.parser import parse_timestamp
+
+
+def _timestamp(value: Union[float, str, None]) -> float:
+    """A Comment.created_utc as a float; NaN if it has no timestamp (e.g. None under a projection)."""
+    if type(value) is float:
+        return value
+    if value is None:
+        return math.nan
+    try:
+        return timestamp_from_iso(value)
+    except (TypeError, ValueError, OverflowError):
+        return math.nan
+
+
+class CommentTable:
+    """
+    A comment tree stored as parallel arrays, one row per comment.
+
+    Rows are in pre-order: every comment comes after its parent and before
+    its next sibling. Numeric columns are packed arrays, timestamps are raw
+    floats formatted only when read (NaN for a comment without one), and
+    each distinct author name is stored once. Use table[i] for a lazy
+    CommentView of a row.
+    """
+
+    __slots__ = (
+        'ids', 'parents', 'scores', 'depths', 'created_utc',
+        'author_index', 'authors', 'bodies', '_author_lookup', '_children',
+    )
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.parents = array('i')  # row of the parent comment, -1 for top-level
+        self.scores = array('q')
+        self.depths = array('i')
+        self.created_utc = array('d')
+        self.author_index = array('i')  # row into self.authors
+        self.authors: List[str] = []
+        self.bodies: List[str] = []
+        self._author_lookup: Dict[str, int] = {}
+        self._children: Optional[List[List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, row: int) -> 'CommentView':
+        if row < 0:
+            row += len(self.ids)
+        if not 0 <= row < len(self.ids):
+            raise IndexError("comment row out of range")
+        return CommentView(self, row)
+
+    def __iter__(self) -> Iterator['CommentView']:
+        return (CommentView(self, row) for row in range(len(self.ids)))
+
+    def append(
+        self,
+        id: str,
+        author: str,
+        body: str,
+        score: int,
+        created_utc: float,
+        depth: int,
+        parent: int = -1,
+    ) -> int:
+        """
+        Add a comment row.
+
+        Args:
+            parent: Row of the parent comment, or -1 for a top-level comment
+
+        Returns:
+            Row of the new comment
+        """
+        author_row = self._author_lookup.get(author)
+        if author_row is None:
+            author_row = len(self.authors)
+            self._author_lookup[author] = author_row
+            self.authors.append(author)
+
+        self.ids.append(id)
+        self.parents.append(parent)
+        self.scores.append(score)
+        self.depths.append(depth)
+        self.created_utc.append(created_utc)
+        self.author_index.append(author_row)
+        self.bodies.append(body)
+        self._children = None
+        return len(self.ids) - 1
+
+    def children(self, row: int) -> List[int]:
+        """Rows of the direct replies to a row, in order."""
+        if self._children is None:
+            children: List[List[int]] = [[] for _ in range(len(self.ids))]
+            for child, parent in enumerate(self.parents):
+                if parent >= 0:
+                    children[parent].append(child)
+            self._children = children
+        return self._children[row]
+
+    def roots(self) -> List[int]:
+        """Rows of the top-level comments, in order."""
+        return [row for row, parent in enumerate(self.parents) if parent < 0]
+
+    @classmethod
+    def from_listing(cls, comments_listing: List[Dict[str, Any]]) -> 'CommentTable':
+        """
+        Build a table straight from a raw Reddit comments listing.
+
+        Like parser.parse_comments, "more" placeholders are skipped.
+        """
+        table = cls()
+        # Stack of (raw item, parent row, depth); reversed to keep pre-order
+        stack = [(item, -1, 0) for item in reversed(comments_listing)]
+        while stack:
+            item, parent, depth = stack.pop()
+            if item.get('kind') != 't1':
+                continue
+            data = item.get('data', {})
+            row = table.append(
+                id=data.get('id', ''),
+                author=data.get('author', '[deleted]'),
+                body=data.get('body', '[deleted]'),
+                score=data.get('score', 0),
+                created_utc=float(data.get('created_utc', 0)),
+                depth=depth,
+                parent=parent,
+            )
+            replies_data = data.get('replies')
+            if replies_data and isinstance(replies_data, dict):
+                replies = replies_data.get('data', {}).get('children', [])
+                stack.extend((reply, row, depth + 1) for reply in reversed(replies))
+        return table
+
+    @classmethod
+    def from_comments(cls, comments: List[Comment]) -> 'CommentTable':
+        """Build a table from Comment trees."""
+        table = cls()
+        stack = [(comment, -1) for comment in reversed(comments)]
+        while stack:
+            comment, parent = stack.pop()
+            row = table.append(
+                id=comment.id,
+                author=comment.author,
+                body=comment.body,
+                score=comment.score,
+                created_utc=_timestamp(comment.created_utc),
+                depth=comment.depth,
+                parent=parent,
+            )
+            stack.extend((reply, row) for reply in reversed(comment.replies))
+        return table
+
+    def to_comments(self) -> List[Comment]:
+        """Materialize the whole table as Comment trees."""
+        nodes: List[Comment] = []
+        roots: List[Comment] = []
+        for row in range(len(self.ids)):
+            comment = self._make_comment(row)
+            nodes.append(comment)
+            parent = self.parents[row]
+            if parent < 0:
+                roots.append(comment)
+            else:
+                nodes[parent].replies.append(comment)
+        return roots
+
+    def _make_comment(self, row: int) -> Comment:
+        return Comment(
+            id=self.ids[row],
+            author=self.authors[self.author_index[row]],
+            body=self.bodies[row],
+            score=self.scores[row],
+            created_utc=None if math.isnan(self.created_utc[row]) else self.created_utc[row],
+            depth=self.depths[row],
+            replies=[]
+        )
+
+
+class CommentView:
+    """Read-only, lazily evaluated view of one CommentTable row."""
+
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table: CommentTable, row: int):
+        self._table = table
+        self._row = row
+
+    def __repr__(self) -> str:
+        return f"CommentView(id={self.id!r}, depth={self.depth})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CommentView):
+            return NotImplemented
+        return self._table is other._table and self._row == other._row
+
+    def __hash__(self) -> int:
+        return hash((id(self._table), self._row))
+
+    @property
+    def row(self) -> int:
+        return self._row
+
+    @property
+    def id(self) -> str:
+        return self._table.ids[self._row]
+
+    @property
+    def author(self) -> str:
+        return self._table.authors[self._table.author_index[self._row]]
+
+    @property
+    def body(self) -> str:
+        return self._table.bodies[self._row]
+
+    @property
+    def score(self) -> int:
+        return self._table.scores[self._row]
+
+    @property
+    def created_utc(self) -> Optional[str]:
+        timestamp = self._table.created_utc[self._row]
+        return None if math.isnan(timestamp) else parse_timestamp(timestamp)
+
+    @property
+    def created_utc_timestamp(self) -> float:
+        return self._table.created_utc[self._row]
+
+    @property
+    def depth(self) -> int:
+        return self._table.depths[self._row]
+
+    @property
+    def parent(self) -> Optional['CommentView']:
+        parent = self._table.parents[self._row]
+        return CommentView(self._table, parent) if parent >= 0 else None
+
+    @property
+    def replies(self) -> List['CommentView']:
+        return [CommentView(self._table, row) for row in self._table.children(self._row)]
+
+    def to_comment(self) -> Comment:
+        """Materialize this row and its subtree as a Comment."""
+        table = self._table
+        root = table._make_comment(self._row)
+        stack = [(self._row, root)]
+        while stack:
+            row, comment = stack.pop()
+            for child in table.children(row):
+                reply = table._make_comment(child)
+                comment.replies.append(reply)
+                stack.append((child, reply))
+        return root
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert this row and its subtree to dictionary format."""
+        return self.to_comment().to_dict()
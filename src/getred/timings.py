@@ -0,0 +1,175 @@
+"""Per-phase timing and counters for fetching, parsing and writing threads."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from getred.models import Thread, iter_comments
+
+# Phases in pipeline order; reports list them in this order
+PHASES = ("wait", "connect", "ttfb", "download", "decode", "parse", "write")
+
+PHASE_DESCRIPTIONS = {
+    "wait": "rate limit and retry backoff",
+    "connect": "TCP connect and TLS handshake",
+    "ttfb": "request sent to response headers",
+    "download": "response body",
+    "decode": "JSON decode",
+    "parse": "parse_thread",
+    "write": "serialize and write output",
+}
+
+# Trace event recording time spent in RateLimitedTransport
+RATE_LIMIT_EVENT = "getred.rate_limit.complete"
+
+
+class Timings:
+    """
+    Accumulated time per phase plus transfer and volume counters.
+
+    Pass an instance to RedditFetcher(timings=...) and the fetcher, batch
+    and crawl functions record into it. Times from concurrent workers are
+    summed, so with several workers the phases add up to more than the
+    wall time.
+
+    `on_phase` is called as on_phase(phase, seconds) after every recorded
+    phase, e.g. to forward measurements to a metrics pipeline. It may be
+    called from worker threads.
+    """
+
+    def __init__(self, on_phase: Optional[Callable[[str, float], None]] = None):
+        self.on_phase = on_phase
+        self.phases: Dict[str, float] = {}
+        self.requests = 0
+        self.retries = 0
+        self.bytes_received = 0
+        self.threads = 0
+        self.comments = 0
+        self._lock = threading.Lock()
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Record `seconds` spent in `phase`."""
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        if self.on_phase is not None:
+            self.on_phase(phase, seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increase one of the counters (requests, retries, bytes_received, threads, comments)."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def add_thread(self, thread: Thread) -> None:
+        """Count a parsed thread and its comments."""
+        comments = sum(1 for _ in iter_comments(thread.comments))
+        with self._lock:
+            self.threads += 1
+            self.comments += comments
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Record the time spent in the with block as `phase`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start)
+
+    def request(self) -> 'RequestTimer':
+        """Start timing one HTTP request."""
+        return RequestTimer(self)
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert timings to dictionary format (seconds and counters)."""
+        return {
+            "phases": {phase: self.phases[phase] for phase in self._ordered_phases()},
+            "total": self.total,
+            "requests": self.requests,
+            "retries": self.retries,
+            "bytes_received": self.bytes_received,
+            "threads": self.threads,
+            "comments": self.comments,
+        }
+
+    def format(self) -> str:
+        """Human-readable breakdown, one phase per line."""
+        total = self.total
+        lines = ["Timings:"]
+        for phase in self._ordered_phases():
+            seconds = self.phases[phase]
+            share = seconds / total if total else 0.0
+            description = PHASE_DESCRIPTIONS.get(phase, "")
+            lines.append(f"  {phase:<9} {seconds * 1000:>10.1f} ms {share:>6.1%}  {description}")
+        lines.append(f"  {'total':<9} {total * 1000:>10.1f} ms")
+        lines.append(
+            f"  {self.requests} requests, {self.retries} retries, "
+            f"{self.bytes_received:,} bytes received, "
+            f"{self.threads} threads, {self.comments} comments"
+        )
+        return "\n".join(lines)
+
+    def _ordered_phases(self) -> List[str]:
+        known = [phase for phase in PHASES if phase in self.phases]
+        return known + sorted(phase for phase in self.phases if phase not in PHASES)
+
+
+class RequestTimer:
+    """
+    Splits one request's time into wait, connect, ttfb and download.
+
+    Install `trace` as the request's "trace" extension: httpcore reports
+    connection setup through it, and RateLimitedTransport reports time
+    spent waiting for the rate limiter. Whatever remains between sending
+    and receiving the headers is time to first byte.
+    """
+
+    def __init__(self, timings: Timings):
+        self.timings = timings
+        self.wait = 0.0
+        self.connect = 0.0
+        self._started: Dict[str, float] = {}
+        self._sent = time.perf_counter()
+        self._headers: Optional[float] = None
+
+    def trace(self, event: str, info: Dict[str, Any]) -> None:
+        if event == RATE_LIMIT_EVENT:
+            self.wait += info.get("seconds", 0.0)
+            return
+        name, _, stage = event.rpartition(".")
+        if name not in ("connection.connect_tcp", "connection.start_tls"):
+            return
+        if stage == "started":
+            self._started[name] = time.perf_counter()
+        elif name in self._started:
+            self.connect += time.perf_counter() - self._started.pop(name)
+
+    def headers_received(self) -> None:
+        """Mark the end of the time-to-first-byte phase."""
+        self._headers = time.perf_counter()
+        self.timings.count("requests")
+        if self.wait:
+            self.timings.add("wait", self.wait)
+        if self.connect:
+            self.timings.add("connect", self.connect)
+        self.timings.add("ttfb", max(0.0, self._headers - self._sent - self.wait - self.connect))
+
+    def body_received(self, num_bytes: int) -> None:
+        """Mark the end of the download phase."""
+        if self._headers is not None:
+            self.timings.add("download", time.perf_counter() - self._headers)
+        self.timings.count("bytes_received", num_bytes)
+
+
+@contextmanager
+def measure(timings: Optional[Timings], phase: str) -> Iterator[None]:
+    """Timings.measure, or nothing when timings is None."""
+    if timings is None:
+        yield
+    else:
+        with timings.measure(phase):
+            yield
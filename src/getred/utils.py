@@ -1,9 +1,20 @@
 """Utility functions for URL validation, slug generation, and file operations."""
 
+from __future__ import annotations
+
 import json
 import re
 from pathlib import Path
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, Optional, Union
+
+# The models and writers are imported where they are used: the CLI imports
+# this module at startup for URL validation
+if TYPE_CHECKING:
+    from getred.models import Thread
+    from getred.view import ThreadView
+
+# Output formats and the file extension used for each
+OUTPUT_FORMATS = {"json": "json", "ndjson": "ndjson", "archive": "grd"}
 
 
 def validate_reddit_url(url: str) -> bool:
@@ -50,34 +61,115 @@ def generate_slug(url: str) -> str:
     return "reddit_thread"
 
 
-def get_default_output_path(url: str) -> Path:
+def get_default_output_path(url: str, extension: str = "json") -> Path:
     """
     Generate default output path in ~/Downloads.
 
     Args:
         url: Reddit thread URL
+        extension: File extension, without the dot
 
     Returns:
         Path object for output file
     """
     downloads_dir = Path.home() / "Downloads"
     slug = generate_slug(url)
-    return downloads_dir / f"{slug}.json"
+    return downloads_dir / f"{slug}.{extension}"
 
 
-def save_json(data: Dict[str, Any], output_path: Path, pretty: bool = True) -> None:
+def save_json(data: Union[Thread, ThreadView, Dict[str, Any]], output_path: Path, pretty: bool = True) -> None:
     """
     Save data as JSON file.
 
+    A Thread or ThreadView is streamed straight to the file without building the
+    intermediate dict tree; the output is the same as for thread.to_dict().
+    With a fast JSON backend installed (see getred.jsonbackend), each
+    top-level comment subtree is encoded by it straight to bytes, so
+    memory stays bounded by the largest subtree, and a plain dict is
+    encoded by it in one go. Output is then byte-identical to json.dump's
+    when pretty; compact output has no spaces after separators.
+
     Args:
-        data: Dictionary to save
+        data: Thread, ThreadView or dictionary to save
         output_path: Path where to save the file
         pretty: Whether to pretty-print the JSON (default: True)
     """
+    from getred.jsonbackend import get_backend
+    from getred.models import Thread
+    from getred.view import ThreadView
+    from getred.writer import write_thread_json_bytes
+
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
+    backend = get_backend()
+    fast = backend.name != "json"
+
+    if isinstance(data, (Thread, ThreadView)):
+        encode_subtree = None
+        if fast:
+            def encode_subtree(obj: Dict[str, Any]) -> Optional[bytes]:
+                try:
+                    return backend.dumps(obj, pretty)
+                except RecursionError:
+                    # Too deep for the stdlib fallback; the streaming writer copes
+                    return None
+
+        with open(output_path, 'wb') as f:
+            write_thread_json_bytes(data, f, pretty=pretty, encode_subtree=encode_subtree)
+        return
+
+    if fast:
+        with open(output_path, 'wb') as f:
+            f.write(backend.dumps(data, pretty))
+        return
+
     with open(output_path, 'w', encoding='utf-8') as f:
         if pretty:
             json.dump(data, f, indent=2, ensure_ascii=False)
         else:
             json.dump(data, f, ensure_ascii=False)
+
+
+def save_ndjson(thread: Thread, output_path: Path) -> None:
+    """
+    Save a thread as newline-delimited JSON.
+
+    The first line holds the thread's fields and each following line one
+    comment with its id, parent_id and depth, in pre-order.
+
+    Args:
+        thread: Thread to save
+        output_path: Path where to save the file
+    """
+    from getred.writer import write_thread_ndjson
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        write_thread_ndjson(thread, f)
+
+
+def save_thread(
+    thread: Union[Thread, ThreadView],
+    output_path: Path,
+    output_format: str = "json",
+    pretty: bool = True,
+) -> None:
+    """
+    Save a thread in one of OUTPUT_FORMATS.
+
+    Args:
+        thread: Thread or ThreadView to save
+        output_path: Path where to save the file
+        output_format: Key of OUTPUT_FORMATS
+        pretty: Whether to pretty-print (JSON only)
+    """
+    if output_format == "ndjson":
+        save_ndjson(thread, output_path)
+    elif output_format == "archive":
+        from getred.archive import save_archive
+        save_archive(thread, output_path)
+    elif output_format == "json":
+        save_json(thread, output_path, pretty=pretty)
+    else:
+        raise ValueError(f"Unknown output format: {output_format}")
@@ -0,0 +1,99 @@
+"""Lazy view of a raw Reddit thread response, parsing comments on demand."""
+
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from getred.models import THREAD_FIELDS, Comment, Thread
+from getred.parser import build_thread, parse_comment
+
+
+class LazyComments(Sequence):
+    """
+    Top-level comments of a raw comment listing, parsed on first access.
+
+    Each comment is parsed together with its replies the first time it is
+    indexed or iterated over, and the Comment is cached, so a subtree is
+    built at most once. "more" placeholders are skipped like in
+    parser.parse_comments.
+    """
+
+    __slots__ = ('_items', '_parsed')
+
+    def __init__(self, comments_listing: List[Dict[str, Any]]):
+        """
+        Args:
+            comments_listing: List of comment objects from Reddit API
+        """
+        self._items: List[Optional[Dict[str, Any]]] = [
+            item for item in comments_listing if item.get('kind') == 't1'
+        ]
+        self._parsed: List[Optional[Comment]] = [None] * len(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Comment, List[Comment]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+        comment = self._parsed[index]
+        if comment is None:
+            comment = parse_comment(self._items[index], depth=0)
+            self._parsed[index] = comment
+            # The raw subtree is no longer needed by the view
+            self._items[index] = None
+        return comment
+
+    def __iter__(self) -> Iterator[Comment]:
+        for index in range(len(self._items)):
+            yield self[index]
+
+    @property
+    def parsed_count(self) -> int:
+        """Number of top-level comments parsed so far."""
+        return sum(1 for comment in self._parsed if comment is not None)
+
+
+class ThreadView:
+    """
+    Read-only Thread over a raw Reddit response, without parsing comments up front.
+
+    The post's fields are read on construction, which is cheap; `comments`
+    is a LazyComments sequence whose top-level comments (with their
+    replies) are parsed when first accessed. The attributes are those of
+    Thread, so the writers and utils.save_thread accept a view as well.
+    Use to_thread() for a real Thread.
+    """
+
+    __slots__ = THREAD_FIELDS + ('comments',)
+
+    # Views are never filtered or projected
+    pruned_count = None
+    fields = None
+
+    def __init__(self, json_data: List[Dict[str, Any]]):
+        """
+        Args:
+            json_data: Raw JSON response from Reddit API (list with 2 elements)
+        """
+        # Same defaults as parser.parse_thread
+        post = build_thread(json_data[0]['data']['children'][0]['data'], [])
+        for key in THREAD_FIELDS:
+            setattr(self, key, getattr(post, key))
+        self.comments = LazyComments(json_data[1]['data']['children'])
+
+    def __repr__(self) -> str:
+        return (
+            f"ThreadView(id={self.id!r}, title={self.title!r}, "
+            f"parsed {self.comments.parsed_count}/{len(self.comments)} comments)"
+        )
+
+    def to_thread(self) -> Thread:
+        """Parse the remaining comments and return a Thread sharing the view's Comment objects."""
+        return Thread(
+            **{key: getattr(self, key) for key in THREAD_FIELDS},
+            comments=list(self.comments),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the thread to dictionary format, like Thread.to_dict()."""
+        return self.to_thread().to_dict()
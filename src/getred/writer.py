@@ -0,0 +1,318 @@
+"""Streaming JSON and NDJSON serialization of Thread and Comment trees."""
+
+import json
+from json.encoder import encode_basestring
+from typing import Any, BinaryIO, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, TextIO, Union
+
+from getred.models import COMMENT_FIELDS, THREAD_FIELDS, Comment, Thread, created_iso, iter_comments
+
+THREAD_KEYS = THREAD_FIELDS
+COMMENT_KEYS = COMMENT_FIELDS
+
+# Order of a comment_record's keys
+_RECORD_KEYS = ("id", "parent_id", "depth", "author", "body", "score", "created_utc")
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+# Encodes a comment's to_dict() to UTF-8 JSON bytes, indented by two spaces for
+# pretty output and without spaces otherwise, or returns None to leave it to
+# the streaming writer
+SubtreeEncoder = Callable[[Dict[str, Any]], Optional[bytes]]
+
+
+def comment_record(
+    comment: Comment,
+    parent_id: Optional[str],
+    fields: Optional[FrozenSet[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Flat record of a single comment, without its replies.
+
+    Args:
+        comment: Comment to convert
+        parent_id: Id of the parent comment, or None for top-level comments
+        fields: Only include these fields besides id and parent_id
+
+    Returns:
+        Dict with id, parent_id, depth and the remaining comment fields
+    """
+    if fields is not None:
+        record = {"id": comment.id, "parent_id": parent_id}
+        record.update((key, _comment_value(comment, key)) for key in _RECORD_KEYS[2:] if key in fields)
+        return record
+    return {
+        "id": comment.id,
+        "parent_id": parent_id,
+        "depth": comment.depth,
+        "author": comment.author,
+        "body": comment.body,
+        "score": comment.score,
+        "created_utc": created_iso(comment.created_utc),
+    }
+
+
+def _comment_value(comment: Comment, key: str) -> Any:
+    """A comment field as it is written out; timestamps are formatted here."""
+    value = getattr(comment, key)
+    return created_iso(value) if key == "created_utc" else value
+
+
+def thread_keys(thread: Thread) -> tuple:
+    """THREAD_KEYS in the thread's projection, plus pruned_count if it was parsed with a filter."""
+    keys = THREAD_KEYS
+    if thread.fields is not None:
+        keys = tuple(key for key in keys if key in thread.fields)
+    if thread.pruned_count is None:
+        return keys
+    return keys + ("pruned_count",)
+
+
+def comment_keys(thread: Thread) -> tuple:
+    """COMMENT_KEYS in the projection of the thread the comments belong to."""
+    if thread.fields is None:
+        return COMMENT_KEYS
+    return tuple(key for key in COMMENT_KEYS if key in thread.fields)
+
+
+def thread_record(thread: Thread) -> Dict[str, Any]:
+    """Flat record of a thread's own fields, without its comments."""
+    return {key: getattr(thread, key) for key in thread_keys(thread)}
+
+
+def encode_value(value: Any) -> str:
+    """Encode a scalar exactly like json.dumps(value, ensure_ascii=False)."""
+    value_type = type(value)
+    if value_type is str:
+        return encode_basestring(value)
+    if value_type is int:
+        return int.__repr__(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def iter_thread_json(thread: Thread, pretty: bool = True) -> Iterator[str]:
+    """
+    Yield the JSON text of a thread piece by piece.
+
+    The concatenated output is identical to json.dumps(thread.to_dict())
+    with indent=2 (pretty) or default separators (compact), and
+    ensure_ascii=False, but no intermediate dicts are built and deep reply
+    chains do not recurse.
+
+    Args:
+        thread: Thread to serialize
+        pretty: Whether to pretty-print the JSON
+
+    Yields:
+        Chunks of JSON text
+    """
+    return _iter_thread_json(thread, pretty)
+
+
+def _iter_thread_json(
+    thread: Thread,
+    pretty: bool,
+    encode_subtree: Optional[SubtreeEncoder] = None,
+) -> Iterator[Union[str, bytes]]:
+    """
+    iter_thread_json, optionally with top-level comments encoded by `encode_subtree`.
+
+    Each top-level comment is then converted with to_dict() and encoded in
+    one call, yielding its bytes (re-indented in place when pretty); only
+    one subtree's dicts exist at a time. Compact output then has no spaces
+    after separators, like the fast JSON libraries' compact output.
+    """
+    if pretty:
+        def newline(level: int) -> str:
+            return "\n" + "  " * level
+        item_sep = ","
+        key_sep = ": "
+    else:
+        def newline(level: int) -> str:
+            return ""
+        item_sep = ", " if encode_subtree is None else ","
+        key_sep = ": " if encode_subtree is None else ":"
+
+    def open_object(obj: Any, keys: tuple, level: int, children_key: str, get: Callable = getattr) -> str:
+        inner = newline(level + 1)
+        members = [
+            f"{encode_basestring(key)}{key_sep}{encode_value(get(obj, key))}"
+            for key in keys
+        ]
+        members.append(f'"{children_key}"{key_sep}')
+        return "{" + inner + (item_sep + inner).join(members)
+
+    yield open_object(thread, thread_keys(thread), 0, "comments")
+    keys = comment_keys(thread)
+
+    if not thread.comments:
+        yield "[]" + newline(0) + "}"
+        return
+
+    yield "["
+    # Each entry: [iterator over a comment list, level of that list, items emitted]
+    stack: List[list] = [[iter(thread.comments), 1, 0]]
+    while stack:
+        entry = stack[-1]
+        comment: Comment = next(entry[0], None)
+        list_level = entry[1]
+
+        if comment is None:
+            stack.pop()
+            yield newline(list_level) + "]"
+            # Close the comment (or thread) that owns this list
+            yield newline(list_level - 1) + "}"
+            continue
+
+        prefix = item_sep if entry[2] else ""
+        entry[2] += 1
+        object_level = list_level + 1
+
+        if encode_subtree is not None and list_level == 1:
+            encoded = encode_subtree(comment.to_dict(thread.fields))
+            if encoded is not None:
+                yield prefix + newline(object_level)
+                # JSON strings cannot contain raw newlines, so this only re-indents
+                yield encoded.replace(b"\n", newline(object_level).encode()) if pretty else encoded
+                continue
+
+        head = open_object(comment, keys, object_level, "replies", _comment_value)
+
+        if comment.replies:
+            yield prefix + newline(object_level) + head + "["
+            stack.append([iter(comment.replies), object_level + 1, 0])
+        else:
+            yield prefix + newline(object_level) + head + "[]" + newline(object_level) + "}"
+
+
+def iter_thread_ndjson(thread: Thread) -> Iterator[str]:
+    """
+    Yield a thread as newline-delimited JSON, one line per record.
+
+    The first line is the thread_record() header; every following line is
+    the comment_record() of one comment, in pre-order, so a parent always
+    comes before its replies. Each line equals json.dumps(record,
+    ensure_ascii=False) plus a newline.
+
+    Args:
+        thread: Thread to serialize
+
+    Yields:
+        Lines of JSON text, each ending in a newline
+    """
+    yield "{" + ", ".join(
+        f"{encode_basestring(key)}: {encode_value(getattr(thread, key))}"
+        for key in thread_keys(thread)
+    ) + "}\n"
+
+    if thread.fields is not None:
+        keys = [key for key in _RECORD_KEYS[2:] if key in thread.fields]
+        for comment, parent in iter_comments(thread.comments):
+            parent_id = encode_basestring(parent.id) if parent is not None else "null"
+            yield '{"id": ' + encode_value(comment.id) + ', "parent_id": ' + parent_id + "".join(
+                f", {encode_basestring(key)}: {encode_value(_comment_value(comment, key))}" for key in keys
+            ) + "}\n"
+        return
+
+    for comment, parent in iter_comments(thread.comments):
+        parent_id = encode_basestring(parent.id) if parent is not None else "null"
+        yield (
+            '{"id": ' + encode_value(comment.id)
+            + ', "parent_id": ' + parent_id
+            + ', "depth": ' + encode_value(comment.depth)
+            + ', "author": ' + encode_value(comment.author)
+            + ', "body": ' + encode_value(comment.body)
+            + ', "score": ' + encode_value(comment.score)
+            + ', "created_utc": ' + encode_value(created_iso(comment.created_utc))
+            + "}\n"
+        )
+
+
+def write_thread_json(
+    thread: Thread,
+    fp: TextIO,
+    pretty: bool = True,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> None:
+    """
+    Write a thread as JSON to an open text file in buffered chunks.
+
+    Args:
+        thread: Thread to serialize
+        fp: Text file opened for writing
+        pretty: Whether to pretty-print the JSON
+        buffer_size: Approximate number of characters per write call
+    """
+    _write_buffered(iter_thread_json(thread, pretty=pretty), fp, buffer_size)
+
+
+def write_thread_json_bytes(
+    thread: Thread,
+    fp: BinaryIO,
+    pretty: bool = True,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    encode_subtree: Optional[SubtreeEncoder] = None,
+) -> None:
+    """
+    Write a thread as UTF-8 JSON to an open binary file in buffered chunks.
+
+    With `encode_subtree`, e.g. a faster JSON library's encoder, each
+    top-level comment is encoded by it straight to bytes that are written
+    as they are; compact output then has no spaces after separators.
+
+    Args:
+        thread: Thread to serialize
+        fp: Binary file opened for writing
+        pretty: Whether to pretty-print the JSON
+        buffer_size: Approximate number of bytes or characters per write call
+        encode_subtree: Encoder for whole top-level comments
+    """
+    text: List[str] = []
+    data: List[bytes] = []
+    buffered = 0
+    for chunk in _iter_thread_json(thread, pretty, encode_subtree):
+        if type(chunk) is bytes:
+            if text:
+                data.append("".join(text).encode("utf-8"))
+                text.clear()
+            data.append(chunk)
+        else:
+            text.append(chunk)
+        buffered += len(chunk)
+        if buffered >= buffer_size:
+            data.append("".join(text).encode("utf-8"))
+            text.clear()
+            fp.write(b"".join(data))
+            data.clear()
+            buffered = 0
+    data.append("".join(text).encode("utf-8"))
+    fp.write(b"".join(data))
+
+
+def write_thread_ndjson(
+    thread: Thread,
+    fp: TextIO,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> None:
+    """
+    Write a thread as NDJSON to an open text file in buffered chunks.
+
+    Args:
+        thread: Thread to serialize
+        fp: Text file opened for writing
+        buffer_size: Approximate number of characters per write call
+    """
+    _write_buffered(iter_thread_ndjson(thread), fp, buffer_size)
+
+
+def _write_buffered(chunks: Iterable[str], fp: TextIO, buffer_size: int) -> None:
+    buffer: List[str] = []
+    buffered = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= buffer_size:
+            fp.write("".join(buffer))
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        fp.write("".join(buffer))
@@ -1,5 +1,7 @@
 """Shared fixtures for getred tests."""
 
+import copy
+
 import pytest
 
 
@@ -103,3 +105,32 @@ def sample_thread_json():
             }
         }
     ]
+
+
+@pytest.fixture
+def raw_comment():
+    """Factory for raw "t1" comments as in the API's listings, with optional raw replies."""
+    def make(comment_id, score=1, created_utc=1609459200.0, replies=(), author="user", body=None):
+        return {
+            "kind": "t1",
+            "data": {
+                "id": comment_id,
+                "author": author,
+                "body": comment_id if body is None else body,
+                "score": score,
+                "created_utc": created_utc,
+                "replies": {"kind": "Listing", "data": {"children": list(replies)}} if replies else "",
+            },
+        }
+
+    return make
+
+
+@pytest.fixture
+def sample_thread_with_reply(sample_thread_json, raw_comment):
+    """Copy of sample_thread_json with a reply, reply1, under comment1."""
+    thread_json = copy.deepcopy(sample_thread_json)
+    thread_json[1]["data"]["children"][0]["data"]["replies"] = {"kind": "Listing", "data": {"children": [
+        raw_comment("reply1", 3, created_utc=1609466400.0, author="user2", body="Reply"),
+    ]}}
+    return thread_json
@@ -0,0 +1,129 @@
+"""Tests for the binary archive format."""
+
+import pytest
+
+import getred
+from getred.archive import ThreadArchive, save_archive
+from getred.filters import CommentFilter
+from getred.models import Comment, Thread
+from getred.parser import parse_thread
+
+
+def make_comment(comment_id, depth, replies=None, created_utc="2021-01-01T00:00:00Z", author="user"):
+    return Comment(
+        id=comment_id,
+        author=author,
+        body=f"body of {comment_id} ✓",
+        score=-7 if comment_id == "b" else 2 ** 40,
+        created_utc=created_utc,
+        depth=depth,
+        replies=replies or [],
+    )
+
+
+def make_thread(comments):
+    return Thread(
+        id="thread123",
+        title="Ünïcödé title",
+        author="op",
+        subreddit="python",
+        url="https://reddit.com/r/python/comments/thread123/test/",
+        selftext="",
+        score=500,
+        created_utc="2021-01-01T00:00:00Z",
+        fetched_at="2021-01-01T02:00:00.123456Z",
+        comment_count=5,
+        comments=comments,
+    )
+
+
+@pytest.fixture
+def nested_thread():
+    return make_thread([
+        make_comment("a", 0, [
+            make_comment("b", 1, [make_comment("c", 2, author="other")]),
+            # Not the format parse_timestamp produces; must survive as-is
+            make_comment("d", 1, created_utc="2021-01-01 00:00:00"),
+        ]),
+        make_comment("e", 0, created_utc=""),
+    ])
+
+
+def test_round_trip_is_lossless(tmp_path, nested_thread):
+    path = tmp_path / "thread.grd"
+    save_archive(nested_thread, path)
+
+    with getred.load_archive(path) as archive:
+        assert archive.to_thread() == nested_thread
+
+
+def test_round_trip_parsed_thread(tmp_path, sample_thread_json):
+    thread = parse_thread(sample_thread_json)
+    path = tmp_path / "thread.grd"
+    save_archive(thread, path)
+
+    with getred.load_archive(path) as archive:
+        assert archive.to_thread() == thread
+        assert archive[0].to_dict() == thread.comments[0].to_dict()
+
+
+def test_round_trip_keeps_pruned_count(tmp_path, sample_thread_json):
+    thread = parse_thread(sample_thread_json, CommentFilter(min_score=100))
+    path = tmp_path / "thread.grd"
+    save_archive(thread, path)
+
+    with getred.load_archive(path) as archive:
+        assert archive.pruned_count == thread.pruned_count == 1
+        assert archive.to_thread().to_dict() == thread.to_dict()
+
+
+def test_random_access_and_navigation(tmp_path, nested_thread):
+    path = tmp_path / "thread.grd"
+    save_archive(nested_thread, path)
+
+    with getred.load_archive(path) as archive:
+        assert len(archive) == 5
+        assert archive.title == "Ünïcödé title"
+        assert archive.comment_count == 5
+        assert [c.id for c in archive] == ["a", "b", "c", "d", "e"]
+        assert archive.roots() == [0, 4]
+
+        c = archive[2]
+        assert (c.id, c.author, c.depth, c.score) == ("c", "other", 2, 2 ** 40)
+        assert c.parent.id == "b"
+        assert c.parent.parent.parent is None
+        assert [r.id for r in archive[0].replies] == ["b", "d"]
+        assert archive[3].created_utc == "2021-01-01 00:00:00"
+        assert archive[-1].created_utc == ""
+        assert archive[1].to_comment() == nested_thread.comments[0].replies[0]
+
+
+def test_strings_are_deduplicated(tmp_path):
+    comments = [make_comment(str(i), 0, author="same") for i in range(50)]
+    path = tmp_path / "thread.grd"
+    save_archive(make_thread(comments), path)
+
+    with getred.load_archive(path) as archive:
+        assert archive._string_count < 2 * 50 + 10
+
+
+def test_empty_thread(tmp_path):
+    path = tmp_path / "thread.grd"
+    save_archive(make_thread([]), path)
+
+    with getred.load_archive(path) as archive:
+        assert len(archive) == 0
+        assert archive.roots() == []
+        assert archive.to_thread().comments == []
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "thread.json"
+    path.write_text('{"id": "x"}' * 10)
+    with pytest.raises(ValueError, match="Not a getred archive"):
+        ThreadArchive(path)
+
+    empty = tmp_path / "empty.grd"
+    empty.write_bytes(b"")
+    with pytest.raises(ValueError):
+        getred.load_archive(empty)
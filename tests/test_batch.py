@@ -0,0 +1,156 @@
+"""Tests for concurrent batch fetching."""
+
+import json
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from getred.batch import read_urls, run_batch
+from getred.cli import main
+from getred.fetcher import RedditFetcher
+from getred.parser import parse_thread
+from getred.sqlite import ThreadDatabase
+from getred.timings import Timings
+
+
+def make_fetcher(sample_thread_json, fail_ids=()):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if any(f"/comments/{thread_id}/" in request.url.path for thread_id in fail_ids):
+            return httpx.Response(404, request=request)
+        return httpx.Response(200, json=sample_thread_json, request=request)
+
+    return RedditFetcher(transport=httpx.MockTransport(handler))
+
+
+def test_read_urls_skips_blank_and_comment_lines():
+    lines = ["https://reddit.com/r/a/comments/one/x/\n", "\n", "# note\n", "  https://reddit.com/r/a/comments/two/y/  \n"]
+    assert list(read_urls(lines)) == [
+        "https://reddit.com/r/a/comments/one/x/",
+        "https://reddit.com/r/a/comments/two/y/",
+    ]
+
+
+def test_run_batch_writes_one_file_per_thread(tmp_path, sample_thread_json):
+    urls = [
+        "https://www.reddit.com/r/python/comments/aaa/first/",
+        "https://www.reddit.com/r/python/comments/bbb/second/",
+    ]
+
+    result = run_batch(urls, workers=2, output_dir=tmp_path, fetcher=make_fetcher(sample_thread_json))
+
+    assert result.succeeded == 2
+    assert result.failed == 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["aaa_first.json", "bbb_second.json"]
+    saved = json.loads((tmp_path / "aaa_first.json").read_text(encoding="utf-8"))
+    assert saved["id"] == "thread123"
+
+
+def test_run_batch_reads_urls_as_fetches_finish(tmp_path, sample_thread_json):
+    read = []
+
+    def urls():
+        for n in range(20):
+            read.append(n)
+            yield f"https://www.reddit.com/r/python/comments/t{n}/title/"
+
+    in_flight = []
+    result = run_batch(
+        urls(), workers=2, output_dir=tmp_path, fetcher=make_fetcher(sample_thread_json),
+        on_result=lambda item: in_flight.append(len(read) - len(in_flight)),
+    )
+
+    assert result.succeeded == 20
+    assert max(in_flight) <= 4
+
+
+def test_run_batch_keeps_an_open_shared_client(tmp_path, sample_thread_json):
+    fetcher = make_fetcher(sample_thread_json)
+
+    with fetcher:
+        client = fetcher._client
+        run_batch(["https://www.reddit.com/r/python/comments/aaa/first/"], output_dir=tmp_path, fetcher=fetcher)
+        run_batch(["https://www.reddit.com/r/python/comments/bbb/second/"], output_dir=tmp_path, fetcher=fetcher)
+
+        assert fetcher._client is client
+        assert not client.is_closed
+    assert fetcher._client is None
+    assert client.is_closed
+
+
+def test_run_batch_writes_ndjson(tmp_path, sample_thread_json):
+    urls = ["https://www.reddit.com/r/python/comments/aaa/first/"]
+
+    result = run_batch(urls, output_dir=tmp_path, fetcher=make_fetcher(sample_thread_json), output_format="ndjson")
+
+    assert result.succeeded == 1
+    lines = (tmp_path / "aaa_first.ndjson").read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[0])["id"] == "thread123"
+    assert json.loads(lines[1])["parent_id"] is None
+
+
+def test_run_batch_saves_to_database_without_files(tmp_path, sample_thread_json, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    urls = ["https://www.reddit.com/r/python/comments/aaa/first/"]
+
+    with ThreadDatabase(tmp_path / "archive.db") as db:
+        result = run_batch(urls, fetcher=make_fetcher(sample_thread_json), database=db)
+        assert db.thread_ids() == ["thread123"]
+
+    assert result.succeeded == 1
+    assert result.items[0].output_path is None
+    assert not (tmp_path / "Downloads").exists()
+
+
+def test_run_batch_reports_failures_without_aborting(tmp_path, sample_thread_json):
+    urls = [
+        "https://www.reddit.com/r/python/comments/good/ok/",
+        "https://www.reddit.com/r/python/comments/bad/broken/",
+        "not a url",
+    ]
+
+    result = run_batch(
+        urls, workers=3, output_dir=tmp_path, fetcher=make_fetcher(sample_thread_json, fail_ids=["bad"])
+    )
+
+    errors = {item.url: item.error for item in result.items if not item.ok}
+    assert result.succeeded == 1
+    assert set(errors) == {urls[1], urls[2]}
+    assert "404" in errors[urls[1]]
+    assert errors[urls[2]] == "Invalid Reddit thread URL"
+    assert [p.name for p in tmp_path.iterdir()] == ["good_ok.json"]
+
+
+def test_run_batch_parses_and_saves_in_processes(tmp_path, sample_thread_json):
+    urls = [f"https://www.reddit.com/r/python/comments/t{i}/title/" for i in range(5)] + [
+        "https://www.reddit.com/r/python/comments/bad/broken/",
+        "not a url",
+    ]
+    timings = Timings()
+    fetcher = make_fetcher(sample_thread_json, fail_ids=["bad"])
+    fetcher.timings = timings
+
+    with ThreadDatabase(tmp_path / "archive.db") as db:
+        result = run_batch(
+            urls, workers=2, output_dir=tmp_path, fetcher=fetcher, database=db, processes=2, chunksize=2
+        )
+        assert db.thread_ids() == ["thread123"]
+
+    assert result.succeeded == 5
+    assert {item.url for item in result.items if not item.ok} == set(urls[5:])
+    assert all(item.comment_count == parse_thread(sample_thread_json).comment_count for item in result.items if item.ok)
+    assert len(list(tmp_path.glob("t*_title.json"))) == 5
+    assert {"decode", "parse", "write"} <= set(timings.phases)
+    assert (timings.threads, timings.comments) == (5, 5)
+
+
+def test_run_batch_rejects_expand_with_processes(sample_thread_json):
+    with pytest.raises(ValueError, match="expand"):
+        run_batch([], fetcher=make_fetcher(sample_thread_json), expand=True, processes=2)
+
+
+def test_cli_defaults_to_single_fetch_command():
+    runner = CliRunner()
+    result = runner.invoke(main, ["not-a-url"])
+    assert result.exit_code == 1
+    assert "Invalid Reddit thread URL" in result.output
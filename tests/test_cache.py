@@ -0,0 +1,119 @@
+"""Tests for the on-disk caching transport."""
+
+import gzip
+
+import httpx
+
+from getred.cache import CachingTransport
+from getred.fetcher import RedditFetcher
+
+URL = "https://www.reddit.com/r/python/comments/abc123/cool_title/"
+
+
+class FakeClock:
+    def __init__(self, monkeypatch):
+        self.now = 1000.0
+        monkeypatch.setattr("getred.cache.time.time", lambda: self.now)
+
+
+def counting_handler(requests, etag=None, body=b'{"ok": true}'):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if etag and request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, request=request)
+        headers = {"Content-Type": "application/json"}
+        if etag:
+            headers["ETag"] = etag
+        return httpx.Response(200, headers=headers, content=body, request=request)
+
+    return handler
+
+
+def test_fresh_entries_skip_the_network(tmp_path):
+    requests = []
+    transport = CachingTransport(tmp_path, ttl=60, transport=httpx.MockTransport(counting_handler(requests)))
+
+    with RedditFetcher(transport=transport) as fetcher:
+        assert fetcher.fetch_thread(URL) == {"ok": True}
+        assert fetcher.fetch_thread(URL) == {"ok": True}
+
+    assert len(requests) == 1
+    assert transport.stats.to_dict() == {"hits": 1, "misses": 1, "revalidated": 0, "evictions": 0}
+
+
+def test_cache_persists_across_instances(tmp_path):
+    requests = []
+    inner = httpx.MockTransport(counting_handler(requests))
+    RedditFetcher(transport=CachingTransport(tmp_path, transport=inner)).fetch_thread(URL)
+
+    second = CachingTransport(tmp_path, transport=inner)
+    assert RedditFetcher(transport=second).fetch_thread(URL) == {"ok": True}
+    assert len(requests) == 1
+    assert second.stats.hits == 1
+
+
+def test_stale_entries_are_revalidated_with_etag(tmp_path, monkeypatch):
+    clock = FakeClock(monkeypatch)
+    requests = []
+    transport = CachingTransport(
+        tmp_path, ttl=60, transport=httpx.MockTransport(counting_handler(requests, etag='"v1"'))
+    )
+    fetcher = RedditFetcher(transport=transport)
+
+    fetcher.fetch_thread(URL)
+    clock.now += 120
+    assert fetcher.fetch_thread(URL) == {"ok": True}
+    assert fetcher.fetch_thread(URL) == {"ok": True}
+
+    assert len(requests) == 2
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+    assert transport.stats.revalidated == 1
+    assert transport.stats.hits == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = FakeClock(monkeypatch)
+    requests = []
+    body = b'{"pad": "' + b"x" * 100 + b'"}'
+    transport = CachingTransport(
+        tmp_path, max_bytes=2 * len(body), transport=httpx.MockTransport(counting_handler(requests, body=body))
+    )
+    fetcher = RedditFetcher(transport=transport)
+    urls = [f"https://www.reddit.com/r/python/comments/id{i}/t/" for i in range(3)]
+
+    for url in urls[:2]:
+        fetcher.fetch_thread(url)
+        clock.now += 1
+    fetcher.fetch_thread(urls[0])  # refresh id0 so id1 is least recently used
+    clock.now += 1
+    fetcher.fetch_thread(urls[2])
+
+    assert transport.stats.evictions == 1
+    assert transport.total_bytes == 2 * len(body)
+    fetcher.fetch_thread(urls[0])
+    assert transport.stats.hits == 2
+    fetcher.fetch_thread(urls[1])
+    assert len(requests) == 4
+
+
+def test_compressed_bodies_are_cached_raw(tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers={"Content-Encoding": "gzip", "Content-Type": "application/json"},
+            content=gzip.compress(b'{"ok": true}'),
+            request=request,
+        )
+
+    transport = CachingTransport(tmp_path, transport=httpx.MockTransport(handler))
+    fetcher = RedditFetcher(transport=transport)
+
+    assert fetcher.fetch_thread(URL) == {"ok": True}
+    assert fetcher.fetch_thread(URL) == {"ok": True}
+    assert transport.stats.hits == 1
+
+
+def test_query_parameter_order_does_not_change_key():
+    a = CachingTransport.cache_key(httpx.URL("https://reddit.com/x.json?a=1&b=2"))
+    b = CachingTransport.cache_key(httpx.URL("https://reddit.com/x.json?b=2&a=1"))
+    assert a == b
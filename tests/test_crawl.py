@@ -0,0 +1,132 @@
+"""Tests for the subreddit crawler."""
+
+import copy
+import threading
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from getred.cli import main
+from getred.crawl import crawl, iter_listing, parse_subreddit
+from getred.fetcher import RedditFetcher
+
+
+def listing_page(ids, after):
+    return {
+        "kind": "Listing",
+        "data": {
+            "after": after,
+            "children": [
+                {"kind": "t3", "data": {"id": i, "permalink": f"/r/python/comments/{i}/title_{i}/"}}
+                for i in ids
+            ],
+        },
+    }
+
+
+PAGES = {
+    None: listing_page(["p1", "p2"], "t3_p2"),
+    "t3_p2": listing_page(["p2", "p3"], "t3_p3"),  # p2 shifted onto the next page
+    "t3_p3": listing_page(["p4"], None),
+}
+
+
+def make_handler(sample_thread_json, pages=PAGES, fail_ids=(), on_listing=None, on_thread=None):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        path = request.url.path
+        if path == "/r/python/new.json":
+            after = request.url.params.get("after")
+            if on_listing is not None:
+                on_listing(after)
+            return httpx.Response(200, json=pages[after], request=request)
+        thread_id = path.split("/")[4]
+        if on_thread is not None:
+            on_thread(thread_id)
+        if thread_id in fail_ids:
+            return httpx.Response(404, request=request)
+        data = copy.deepcopy(sample_thread_json)
+        data[0]["data"]["children"][0]["data"]["id"] = thread_id
+        return httpx.Response(200, json=data, request=request)
+
+    return handler, requests
+
+
+@pytest.mark.parametrize("value", ["python", "r/python", "/r/python/", "https://www.reddit.com/r/python/new/"])
+def test_parse_subreddit(value):
+    assert parse_subreddit(value) == "python"
+
+
+def test_parse_subreddit_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_subreddit("not a subreddit")
+
+
+def test_iter_listing_pages_with_after_and_skips_duplicates(sample_thread_json):
+    handler, requests = make_handler(sample_thread_json)
+    fetcher = RedditFetcher(transport=httpx.MockTransport(handler))
+
+    urls = list(iter_listing(fetcher, "python"))
+
+    assert urls == [f"https://www.reddit.com/r/python/comments/{i}/title_{i}/" for i in ("p1", "p2", "p3", "p4")]
+    assert [r.url.params.get("after") for r in requests] == [None, "t3_p2", "t3_p3"]
+
+
+def test_iter_listing_stops_at_limit(sample_thread_json):
+    handler, requests = make_handler(sample_thread_json)
+    fetcher = RedditFetcher(transport=httpx.MockTransport(handler))
+
+    assert len(list(iter_listing(fetcher, "python", limit=3))) == 3
+    assert requests[0].url.params["limit"] == "3"
+    assert len(requests) == 2
+
+
+def test_crawl_saves_every_thread(tmp_path, sample_thread_json):
+    handler, _ = make_handler(sample_thread_json, fail_ids={"p3"})
+    fetcher = RedditFetcher(transport=httpx.MockTransport(handler))
+
+    result = crawl("python", output_dir=tmp_path, workers=2, fetcher=fetcher, queue_size=1)
+
+    assert result.succeeded == 3
+    assert [item.url for item in result.items if not item.ok] == [
+        "https://www.reddit.com/r/python/comments/p3/title_p3/"
+    ]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["p1_title_p1.json", "p2_title_p2.json", "p4_title_p4.json"]
+
+
+def test_crawl_fetches_threads_while_listing_continues(tmp_path, sample_thread_json):
+    first_thread_fetched = threading.Event()
+
+    def on_listing(after):
+        if after is not None:
+            # Later pages wait until a thread from the first page was fetched
+            assert first_thread_fetched.wait(timeout=5)
+
+    handler, _ = make_handler(
+        sample_thread_json, on_listing=on_listing, on_thread=lambda thread_id: first_thread_fetched.set()
+    )
+    fetcher = RedditFetcher(transport=httpx.MockTransport(handler))
+
+    result = crawl("python", output_dir=tmp_path, workers=2, fetcher=fetcher)
+
+    assert result.succeeded == 4
+
+
+def test_crawl_raises_listing_errors(tmp_path, sample_thread_json):
+    pages = dict(PAGES)
+    pages["t3_p2"] = {"error": 403}
+    handler, _ = make_handler(sample_thread_json, pages=pages)
+    fetcher = RedditFetcher(transport=httpx.MockTransport(handler))
+
+    with pytest.raises(ValueError, match="Not a subreddit listing"):
+        crawl("python", output_dir=tmp_path, fetcher=fetcher)
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_crawl_command_rejects_invalid_subreddit():
+    result = CliRunner().invoke(main, ["crawl", "not a subreddit"])
+    assert result.exit_code == 1
+    assert "Invalid subreddit" in result.output
@@ -0,0 +1,120 @@
+"""Tests for resolving "more" placeholders."""
+
+import httpx
+import pytest
+
+from getred.expand import expand_more
+from getred.fetcher import RedditFetcher
+from getred.filters import CommentFilter
+from getred.parser import collect_more_ids, parse_thread
+
+
+def thing(comment_id, parent_id, kind="t1", children=None):
+    if kind == "more":
+        return {"kind": "more", "data": {"id": comment_id, "parent_id": parent_id, "children": children or []}}
+    return {
+        "kind": "t1",
+        "data": {
+            "id": comment_id,
+            "parent_id": parent_id,
+            "author": "user",
+            "body": f"body {comment_id}",
+            "score": 1,
+            "created_utc": 1609459200.0,
+            "replies": "",
+        },
+    }
+
+
+def test_collect_more_ids_walks_nested_replies(sample_comment_with_replies):
+    child = sample_comment_with_replies["data"]["replies"]["data"]["children"][0]
+    child["data"]["replies"] = {
+        "kind": "Listing",
+        "data": {"children": [thing("stub", "t1_child123", kind="more", children=["x1", "x2"])]},
+    }
+    listing = [
+        sample_comment_with_replies,
+        thing("top", "t3_thread123", kind="more", children=["y1"]),
+        thing("_", "t1_parent123", kind="more"),
+    ]
+
+    assert collect_more_ids(listing) == ["x1", "x2", "y1"]
+
+
+def test_expand_more_stitches_comments_at_correct_depth(sample_thread_json):
+    requests = []
+    responses = {
+        ("abc", "def"): [
+            thing("abc", "t3_thread123"),
+            thing("def", "t1_abc"),
+            thing("stub", "t1_def", kind="more", children=["ghi"]),
+        ],
+        ("ghi",): [thing("ghi", "t1_def")],
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        children = tuple(request.url.params["children"].split(","))
+        return httpx.Response(200, json={"json": {"errors": [], "data": {"things": responses[children]}}})
+
+    fetcher = RedditFetcher(transport=httpx.MockTransport(handler))
+    thread = parse_thread(sample_thread_json)
+    more_ids = collect_more_ids(sample_thread_json[1]["data"]["children"])
+
+    with fetcher:
+        added = expand_more(thread, more_ids, fetcher)
+
+    assert added == 3
+    assert [c.id for c in thread.comments] == ["comment1", "abc"]
+    abc = thread.comments[1]
+    assert abc.depth == 0
+    assert abc.replies[0].id == "def"
+    assert abc.replies[0].depth == 1
+    assert abc.replies[0].replies[0].id == "ghi"
+    assert abc.replies[0].replies[0].depth == 2
+    assert requests[0].url.params["link_id"] == "t3_thread123"
+
+
+def test_expand_more_applies_comment_filter(sample_thread_json):
+    things = [thing("abc", "t1_comment1"), thing("def", "t1_comment1"), thing("ghi", "t1_def")]
+    things[1]["data"]["score"] = -5
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"json": {"errors": [], "data": {"things": things}}})
+
+    comment_filter = CommentFilter(min_score=0)
+    fetcher = RedditFetcher(transport=httpx.MockTransport(handler))
+    thread = parse_thread(sample_thread_json, comment_filter)
+
+    with fetcher:
+        added = expand_more(thread, ["abc", "def", "ghi"], fetcher, comment_filter=comment_filter)
+
+    assert added == 1
+    assert [c.id for c in thread.comments[0].replies] == ["abc"]
+    assert thread.pruned_count == 2
+
+
+def test_expand_more_batches_to_endpoint_limit(sample_thread_json):
+    batch_sizes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        ids = request.url.params["children"].split(",")
+        batch_sizes.append(len(ids))
+        things = [thing(i, "t3_thread123") for i in ids]
+        return httpx.Response(200, json={"json": {"errors": [], "data": {"things": things}}})
+
+    fetcher = RedditFetcher(transport=httpx.MockTransport(handler))
+    thread = parse_thread(sample_thread_json)
+    more_ids = [f"id{i}" for i in range(250)]
+
+    added = expand_more(thread, more_ids, fetcher, workers=3)
+
+    assert added == 250
+    assert sorted(batch_sizes) == [50, 100, 100]
+    assert len(thread.comments) == 251
+
+
+def test_fetch_more_children_rejects_oversized_batch():
+    fetcher = RedditFetcher(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+    with pytest.raises(ValueError):
+        fetcher.fetch_more_children("thread123", [str(i) for i in range(101)])
@@ -1,9 +1,11 @@
 """Tests for RedditFetcher URL handling and redirect safety."""
 
+import asyncio
+
 import httpx
 import pytest
 
-from getred.fetcher import RedditFetcher
+from getred.fetcher import AsyncRedditFetcher, RedditFetcher
 
 
 def test_fetch_thread_preserves_query_params():
@@ -113,3 +115,58 @@ def test_fetch_thread_non_json_body_raises_clear_error():
     assert "Non-JSON response" in message
     assert "content_type=text/html" in message
 
+
+def test_async_fetch_thread_uses_same_json_url():
+    seen_urls: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen_urls.append(str(request.url))
+        return httpx.Response(200, json={"ok": True}, request=request)
+
+    fetcher = AsyncRedditFetcher(transport=httpx.MockTransport(handler))
+
+    url = "https://www.reddit.com/r/python/comments/abc123/cool_title/?sort=top"
+    data = asyncio.run(fetcher.fetch_thread(url))
+
+    assert data == {"ok": True}
+    assert seen_urls == [
+        "https://www.reddit.com/r/python/comments/abc123/cool_title/.json?sort=top"
+    ]
+
+
+def test_async_fetch_many_bounds_concurrency(sample_thread_json):
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json=sample_thread_json, request=request)
+
+    fetcher = AsyncRedditFetcher(transport=httpx.MockTransport(handler))
+    urls = [f"https://www.reddit.com/r/python/comments/id{i}/title/" for i in range(10)]
+
+    async def collect():
+        return [thread async for thread in fetcher.fetch_many(urls, concurrency=3)]
+
+    threads = asyncio.run(collect())
+
+    assert len(threads) == 10
+    assert all(thread.id == "thread123" for thread in threads)
+    assert max_in_flight == 3
+
+
+def test_async_fetch_many_raises_on_error():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404, request=request)
+
+    fetcher = AsyncRedditFetcher(transport=httpx.MockTransport(handler))
+
+    async def collect():
+        return [thread async for thread in fetcher.fetch_many(["https://www.reddit.com/r/a/comments/x/y/"])]
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(collect())
@@ -0,0 +1,113 @@
+"""Tests for field projection while parsing and writing."""
+
+import json
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from getred import cli
+from getred.archive import save_archive
+from getred.fetcher import RedditFetcher
+from getred.filters import CommentFilter
+from getred.models import parse_fields
+from getred.parser import parse_thread
+from getred.sqlite import ThreadDatabase
+from getred.stream import parse_thread_stream
+from getred.writer import iter_thread_json, iter_thread_ndjson
+
+URL = "https://www.reddit.com/r/python/comments/thread123/title/"
+FIELDS = parse_fields(["author", "score", "created_utc"])
+
+
+def test_parse_fields_always_includes_id_and_rejects_unknown_names():
+    assert parse_fields(["author", " score", ""]) == {"id", "author", "score"}
+    with pytest.raises(ValueError, match="Unknown field: bogus"):
+        parse_fields(["author", "bogus"])
+
+
+def test_unrequested_fields_are_not_stored(sample_thread_with_reply):
+    thread = parse_thread(sample_thread_with_reply, fields=FIELDS)
+
+    assert thread.fields == FIELDS
+    assert (thread.title, thread.selftext, thread.fetched_at) == (None, None, None)
+    assert thread.author == "thread_author"
+    reply = thread.comments[0].replies[0]
+    assert reply.body is None
+    assert (reply.author, reply.score, reply.depth) == ("user2", 3, 1)
+
+
+def test_to_dict_and_json_writer_emit_only_requested_fields(sample_thread_with_reply):
+    thread = parse_thread(sample_thread_with_reply, fields=FIELDS)
+    data = thread.to_dict()
+
+    assert list(data) == ["id", "author", "score", "created_utc", "comments"]
+    assert list(data["comments"][0]) == ["id", "author", "score", "created_utc", "replies"]
+    for pretty in (True, False):
+        expected = json.dumps(data, indent=2 if pretty else None, ensure_ascii=False)
+        assert "".join(iter_thread_json(thread, pretty=pretty)) == expected
+
+
+def test_ndjson_keeps_parent_ids(sample_thread_with_reply):
+    thread = parse_thread(sample_thread_with_reply, CommentFilter(min_score=0), parse_fields(["depth", "body"]))
+
+    lines = [json.loads(line) for line in iter_thread_ndjson(thread)]
+
+    assert lines[0] == {"id": "thread123", "pruned_count": 0}
+    assert lines[2] == {"id": "reply1", "parent_id": "comment1", "depth": 1, "body": "Reply"}
+
+
+def test_stream_parser_applies_the_same_projection(sample_thread_with_reply):
+    body = json.dumps(sample_thread_with_reply).encode()
+    expected = parse_thread(sample_thread_with_reply, fields=FIELDS).to_dict()
+
+    thread = parse_thread_stream([body[:100], body[100:]], fields=FIELDS)
+
+    assert thread.to_dict()["comments"] == expected["comments"]
+
+
+def test_projected_save_keeps_other_columns(tmp_path, sample_thread_with_reply):
+    with ThreadDatabase(tmp_path / "threads.db") as database:
+        database.save(parse_thread(sample_thread_with_reply))
+        sample_thread_with_reply[1]["data"]["children"][0]["data"]["score"] = 99
+        database.save(parse_thread(sample_thread_with_reply, fields=parse_fields(["score"])))
+        database.save(parse_thread(sample_thread_with_reply, fields=parse_fields([])))
+
+        stored = database.load_thread("thread123")
+
+    assert stored.title == "Test Thread Title"
+    assert (stored.comments[0].score, stored.comments[0].body) == (99, "First comment")
+
+
+def test_archive_rejects_projected_threads(tmp_path, sample_thread_with_reply):
+    with pytest.raises(ValueError, match="--fields"):
+        save_archive(parse_thread(sample_thread_with_reply, fields=FIELDS), tmp_path / "thread.grd")
+
+
+def test_fetch_command_writes_projected_json(tmp_path, sample_thread_with_reply, monkeypatch):
+    def make_fetcher(*args, **kwargs):
+        return RedditFetcher(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json=sample_thread_with_reply, request=request)
+        ))
+
+    monkeypatch.setattr(cli, "make_fetcher", make_fetcher)
+    output = tmp_path / "thread.json"
+
+    result = CliRunner().invoke(cli.main, ["fetch", URL, "-o", str(output), "-q", "--fields", "author,score"])
+
+    assert result.exit_code == 0, result.output
+    data = json.loads(output.read_text())
+    assert list(data) == ["id", "author", "score", "comments"]
+    assert data["comments"][0]["replies"][0] == {"id": "reply1", "author": "user2", "score": 3, "replies": []}
+
+
+def test_fields_option_rejects_unknown_names_and_archive_format():
+    runner = CliRunner()
+
+    result = runner.invoke(cli.main, ["fetch", URL, "--fields", "id,bogus"])
+    assert result.exit_code == 2
+    assert "Unknown field: bogus" in result.output
+
+    result = runner.invoke(cli.main, ["fetch", URL, "--fields", "id", "-f", "archive"])
+    assert result.exit_code == 1
+    assert "--fields cannot be combined with --format archive" in result.output
@@ -0,0 +1,125 @@
+"""Tests for comment filters applied while parsing."""
+
+import json
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from getred.fetcher import RedditFetcher
+from getred.filters import CommentFilter, parse_since
+from getred.parser import count_comments, parse_thread
+from getred.stream import parse_thread_stream
+from getred.writer import iter_thread_json
+
+URL = "https://www.reddit.com/r/python/comments/thread123/title/"
+
+
+@pytest.fixture
+def thread_json(sample_thread_json, raw_comment):
+    # a (5)            b (20)           c (-3)
+    # ├─ a1 (1)        └─ b1 (30)       └─ c1 (50)
+    # │  └─ a11 (8)       └─ more
+    # └─ a2 (12, newer)
+    sample_thread_json[1]["data"]["children"] = [
+        raw_comment("a", 5, replies=[
+            raw_comment("a1", 1, replies=[raw_comment("a11", 8)]),
+            raw_comment("a2", 12, created_utc=1609545600.0),
+        ]),
+        raw_comment("b", 20, replies=[
+            raw_comment("b1", 30),
+            {"kind": "more", "data": {"children": ["b2"]}},
+        ]),
+        raw_comment("c", -3, replies=[raw_comment("c1", 50)]),
+        {"kind": "more", "data": {"children": ["d"]}},
+    ]
+    return sample_thread_json
+
+
+def ids(comments):
+    return [(c.id, ids(c.replies)) if c.replies else c.id for c in comments]
+
+
+def test_count_comments_skips_more_placeholders(thread_json):
+    assert [count_comments(item) for item in thread_json[1]["data"]["children"]] == [4, 2, 2, 0]
+
+
+def test_unfiltered_thread_has_no_pruned_count(thread_json):
+    thread = parse_thread(thread_json)
+    assert thread.pruned_count is None
+    assert "pruned_count" not in thread.to_dict()
+
+
+@pytest.mark.parametrize("comment_filter, expected, pruned", [
+    (CommentFilter(), ["a", "b", "c"], 0),
+    (CommentFilter(max_depth=0), ["a", "b", "c"], 5),
+    (CommentFilter(max_depth=1), [("a", ["a1", "a2"]), ("b", ["b1"]), ("c", ["c1"])], 1),
+    (CommentFilter(min_score=5), [("a", ["a2"]), ("b", ["b1"])], 4),
+    (CommentFilter(since=1609500000.0), [], 8),
+    (CommentFilter(top=2), [("b", ["b1"]), ("a", [("a1", ["a11"]), "a2"])], 2),
+    (CommentFilter(top=1, min_score=0, max_depth=0), ["b"], 7),
+])
+def test_parse_thread_prunes_while_parsing(thread_json, comment_filter, expected, pruned):
+    thread = parse_thread(thread_json, comment_filter)
+
+    if comment_filter == CommentFilter():
+        expected = ids(parse_thread(thread_json).comments)
+    assert ids(thread.comments) == expected
+    assert thread.pruned_count == pruned
+
+
+@pytest.mark.parametrize("comment_filter", [CommentFilter(min_score=5), CommentFilter(top=2, max_depth=1)])
+def test_stream_parser_applies_the_same_filter(thread_json, comment_filter):
+    raw = json.dumps(thread_json).encode("utf-8")
+    expected = parse_thread(thread_json, comment_filter)
+
+    thread = parse_thread_stream([raw[i:i + 50] for i in range(0, len(raw), 50)], comment_filter=comment_filter)
+
+    thread.fetched_at = expected.fetched_at
+    assert thread == expected
+
+
+def test_pruned_count_is_written_after_comment_count(thread_json):
+    thread = parse_thread(thread_json, CommentFilter(max_depth=0))
+
+    text = "".join(iter_thread_json(thread))
+
+    assert text == json.dumps(thread.to_dict(), ensure_ascii=False, indent=2)
+    assert list(json.loads(text))[-3:] == ["comment_count", "pruned_count", "comments"]
+
+
+@pytest.mark.parametrize("comment_filter, params", [
+    (CommentFilter(min_score=1, since=0.0), {}),
+    (CommentFilter(max_depth=2), {"depth": "3"}),
+    (CommentFilter(top=10), {"sort": "top"}),
+    (CommentFilter(top=10, max_depth=0), {"depth": "1", "sort": "top", "limit": "10"}),
+])
+def test_query_params_push_filters_to_reddit(comment_filter, params):
+    assert comment_filter.query_params() == params
+
+
+def test_fetch_thread_sends_filter_params_replacing_existing_ones(thread_json):
+    seen = []
+
+    def handler(request):
+        seen.append(request.url)
+        return httpx.Response(200, json=thread_json, request=request)
+
+    fetcher = RedditFetcher(transport=httpx.MockTransport(handler))
+    params = CommentFilter(top=3, max_depth=0).query_params()
+
+    fetcher.fetch_thread(URL + "?sort=new&context=2", params)
+
+    assert seen[0].path == "/r/python/comments/thread123/title/.json"
+    assert dict(seen[0].params) == {"sort": "top", "context": "2", "depth": "1", "limit": "3"}
+
+
+def test_parse_since_accepts_ages_and_dates():
+    now = datetime(2024, 2, 1, tzinfo=timezone.utc)
+
+    assert parse_since("24h", now=now) == datetime(2024, 1, 31, tzinfo=timezone.utc).timestamp()
+    assert parse_since("1w", now=now) == datetime(2024, 1, 25, tzinfo=timezone.utc).timestamp()
+    assert parse_since("2024-01-31") == datetime(2024, 1, 31, tzinfo=timezone.utc).timestamp()
+    assert parse_since("2024-01-31T12:00:00+01:00") == datetime(2024, 1, 31, 11, tzinfo=timezone.utc).timestamp()
+    with pytest.raises(ValueError, match="Invalid time"):
+        parse_since("yesterday")
@@ -0,0 +1,133 @@
+"""Tests for live thread following."""
+
+import copy
+
+import httpx
+import pytest
+
+from getred.fetcher import RedditFetcher
+from getred import follow
+from getred.follow import follow_thread, sorted_by_new
+from getred.ratelimit import RetryPolicy
+
+
+class Poller:
+    """Serves a sequence of comment listings, then repeats the last one."""
+
+    def __init__(self, thread_json, listings):
+        self.thread_json = thread_json
+        self.listings = listings
+        self.urls = []
+        self.sleeps = []
+        self.now = 0.0
+
+    def handler(self, request):
+        self.urls.append(str(request.url))
+        data = copy.deepcopy(self.thread_json)
+        index = min(len(self.urls), len(self.listings)) - 1
+        data[1]["data"]["children"] = self.listings[index]
+        return httpx.Response(200, json=data, request=request)
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def run(self, **kwargs):
+        fetcher = RedditFetcher(transport=httpx.MockTransport(self.handler))
+        return list(follow_thread(
+            fetcher,
+            "https://www.reddit.com/r/python/comments/thread123/title/",
+            sleep=self.sleep,
+            clock=lambda: self.now,
+            **kwargs,
+        ))
+
+
+def test_follow_emits_each_comment_once_with_parent(sample_thread_json, raw_comment):
+    poller = Poller(sample_thread_json, [
+        [raw_comment("a")],
+        [raw_comment("a", replies=[raw_comment("b")])],
+        [raw_comment("c"), raw_comment("a", replies=[raw_comment("b")])],
+    ])
+
+    records = poller.run(min_interval=1, max_interval=8, max_idle=20)
+
+    assert [(r["id"], r["parent_id"], r["depth"]) for r in records] == [
+        ("a", None, 0), ("b", "a", 1), ("c", None, 0)
+    ]
+    assert poller.urls[0].endswith("/title/.json?sort=new")
+
+
+def test_follow_builds_only_new_comments(sample_thread_json, raw_comment, monkeypatch):
+    built = []
+    build_comment = follow.build_comment
+
+    def counting_build_comment(data, depth):
+        built.append(data["id"])
+        return build_comment(data, depth)
+
+    monkeypatch.setattr(follow, "build_comment", counting_build_comment)
+    poller = Poller(sample_thread_json, [
+        [raw_comment("old", replies=[raw_comment("old1")])],
+        [raw_comment("new"), raw_comment("old", replies=[raw_comment("old1"), raw_comment("old2")])],
+    ])
+
+    records = poller.run(min_interval=1, max_interval=1, max_idle=3, skip_existing=True)
+
+    assert [(r["id"], r["parent_id"]) for r in records] == [("new", None), ("old2", "old")]
+    assert built == ["new", "old2"]
+
+
+def test_follow_backs_off_when_quiet_and_speeds_up_on_activity(sample_thread_json, raw_comment):
+    poller = Poller(sample_thread_json, [[], [], [], [raw_comment("a")], [raw_comment("a"), raw_comment("b")]])
+
+    poller.run(min_interval=1, max_interval=4, max_idle=10)
+
+    assert poller.sleeps[:5] == [1, 2, 4, 2, 1]
+    assert poller.sleeps[-1] == 4
+
+
+def test_follow_skip_existing(sample_thread_json, raw_comment):
+    poller = Poller(sample_thread_json, [[raw_comment("old")], [raw_comment("new"), raw_comment("old")]])
+
+    records = poller.run(min_interval=1, max_interval=1, max_idle=3, skip_existing=True)
+
+    assert [r["id"] for r in records] == ["new"]
+
+
+def test_follow_reports_errors_and_keeps_polling(sample_thread_json):
+    errors = []
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503, request=request)
+        data = copy.deepcopy(sample_thread_json)
+        return httpx.Response(200, json=data, request=request)
+
+    fetcher = RedditFetcher(transport=httpx.MockTransport(handler), retry=RetryPolicy(max_retries=0))
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    records = list(follow_thread(
+        fetcher, "https://www.reddit.com/r/python/comments/thread123/title/",
+        min_interval=1, max_interval=2, max_idle=5, on_error=errors.append, sleep=sleep, clock=lambda: now[0],
+    ))
+
+    assert len(errors) == 1
+    assert [r["id"] for r in records] == ["comment1"]
+
+
+def test_follow_raises_without_error_handler():
+    fetcher = RedditFetcher(transport=httpx.MockTransport(lambda request: httpx.Response(404, request=request)))
+    with pytest.raises(httpx.HTTPStatusError):
+        next(follow_thread(fetcher, "https://www.reddit.com/r/python/comments/thread123/title/"))
+
+
+def test_sorted_by_new_replaces_existing_sort():
+    assert sorted_by_new("https://www.reddit.com/r/a/comments/x/y/?sort=top") == (
+        "https://www.reddit.com/r/a/comments/x/y/?sort=new"
+    )
@@ -0,0 +1,82 @@
+"""Tests for the comment tree index."""
+
+import pytest
+
+import getred
+from getred.filters import CommentFilter
+from getred.index import CommentIndex
+from getred.models import Comment
+from getred.parser import parse_thread
+
+
+@pytest.fixture
+def thread_json(sample_thread_json, raw_comment):
+    # a (5)                   b (20)
+    # ├─ a1 (1)               └─ b1 (30, newest)
+    # │  └─ a11 (8)
+    # └─ a2 (12)
+    sample_thread_json[1]["data"]["children"] = [
+        raw_comment("a", 5, replies=[
+            raw_comment("a1", 1, replies=[raw_comment("a11", 8)]),
+            raw_comment("a2", 12),
+        ]),
+        raw_comment("b", 20, replies=[raw_comment("b1", 30, created_utc=1609545600.0)]),
+        {"kind": "more", "data": {"children": ["c"]}},
+    ]
+    return sample_thread_json
+
+
+@pytest.fixture
+def index(thread_json):
+    index = CommentIndex()
+    parse_thread(thread_json, index=index)
+    return index
+
+
+def test_index_is_filled_while_parsing(thread_json, index):
+    thread = parse_thread(thread_json)
+
+    assert len(index) == 6
+    assert "a11" in index and "c" not in index
+    assert index["a11"] is index.get("a11")
+    assert index.get("c") is None
+    assert CommentIndex.from_comments(thread.comments)["a11"] == index["a11"]
+
+
+def test_parents_and_ancestors(index):
+    assert index.parent("a") is None
+    assert index.parent("a11").id == "a1"
+    assert [c.id for c in index.ancestors("a11")] == ["a", "a1"]
+    assert index.ancestors("b") == []
+    with pytest.raises(KeyError):
+        index.ancestors("missing")
+
+
+def test_subtree_sizes_and_depths(index):
+    assert [index.subtree_size(i) for i in ("a", "a1", "a11", "b")] == [4, 2, 1, 2]
+    assert [c.id for c in index.at_depth(1)] == ["a1", "a2", "b1"]
+    assert index.at_depth(5) == []
+    assert index.max_depth == 2
+
+
+def test_top_by_score_and_recency(index):
+    assert [c.id for c in index.top(3)] == ["b1", "b", "a2"]
+    assert index.top(1, by="recent")[0].id == "b1"
+    with pytest.raises(ValueError, match="Unknown top key"):
+        index.top(1, by="bogus")
+
+
+def test_filtered_comments_are_not_indexed(thread_json):
+    index = CommentIndex()
+    parse_thread(thread_json, CommentFilter(min_score=5), index=index)
+
+    assert sorted(c.id for c in index.top(10)) == ["a", "a2", "b", "b1"]
+    assert index.subtree_size("a") == 2
+
+
+def test_sizes_follow_later_additions(index):
+    index.subtree_size("b")
+    index.add(Comment(id="b11", author="user", body="", score=0, created_utc="", depth=2), index["b1"])
+
+    assert index.subtree_size("b") == 3
+    assert getred.CommentIndex is CommentIndex
@@ -0,0 +1,139 @@
+"""Tests for the pluggable JSON backends."""
+
+import json
+import tracemalloc
+
+import pytest
+from click.testing import CliRunner
+
+from getred import jsonbackend
+from getred.cli import main
+from getred.models import Comment, Thread
+from getred.parser import parse_thread
+from getred.utils import save_json
+from getred.writer import iter_thread_json
+
+BACKENDS = jsonbackend.available_backends()
+
+
+@pytest.fixture(autouse=True)
+def reset_backend(monkeypatch):
+    # Restores whatever backend was selected before the test
+    monkeypatch.setattr(jsonbackend, "_backend", None)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_backends_round_trip_bytes(name, sample_thread_json):
+    backend = jsonbackend.load_backend(name)
+    data = json.dumps(sample_thread_json).encode("utf-8")
+
+    assert backend.loads(data) == sample_thread_json
+    assert json.loads(backend.dumps(sample_thread_json, False)) == sample_thread_json
+    assert json.loads(backend.dumps(sample_thread_json, True)) == sample_thread_json
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_backends_accept_what_the_stdlib_accepts(name):
+    backend = jsonbackend.load_backend(name)
+    # Deeper than orjson nests when encoding
+    deep = json.loads("[" * 300 + "]" * 300)
+
+    assert backend.loads(json.dumps(deep).encode("utf-8")) == deep
+    assert json.loads(backend.dumps(deep, True)) == deep
+    assert backend.dumps({"big": 2 ** 70}, False) == b'{"big": 1180591620717411303424}'
+    with pytest.raises(ValueError):
+        backend.loads(b"<html>Too Many Requests</html>")
+
+
+def test_stdlib_backend_matches_json_dumps():
+    backend = jsonbackend.load_backend("json")
+    data = {"body": "café ☃", "score": 1.5, "replies": []}
+
+    assert backend.dumps(data, False) == json.dumps(data, ensure_ascii=False).encode("utf-8")
+    assert backend.dumps(data, True) == json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def test_environment_variable_selects_backend(monkeypatch):
+    monkeypatch.setenv(jsonbackend.ENV_VAR, "json")
+    assert jsonbackend.get_backend().name == "json"
+
+
+def test_unknown_or_missing_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown JSON backend"):
+        jsonbackend.load_backend("yaml")
+    for name in set(jsonbackend.BACKENDS) - set(BACKENDS):
+        with pytest.raises(ValueError, match="not installed"):
+            jsonbackend.load_backend(name)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+@pytest.mark.parametrize("pretty", [True, False])
+def test_save_json_output_only_depends_on_backend_when_compact(name, pretty, tmp_path, sample_thread_json):
+    thread = parse_thread(sample_thread_json)
+    thread.comments[0].body = "naïve ✓ \"quoted\"\nline"
+    jsonbackend.set_backend(name)
+
+    save_json(thread, tmp_path / "thread.json", pretty=pretty)
+    save_json(thread.to_dict(), tmp_path / "dict.json", pretty=pretty)
+
+    text = (tmp_path / "thread.json").read_text(encoding="utf-8")
+    if pretty:
+        expected = json.dumps(thread.to_dict(), ensure_ascii=False, indent=2)
+    else:
+        # The fast backends' compact output has no spaces after separators
+        separators = (", ", ": ") if name == "json" else (",", ":")
+        expected = json.dumps(thread.to_dict(), ensure_ascii=False, separators=separators)
+    assert text == expected
+    assert (tmp_path / "dict.json").read_text(encoding="utf-8") == expected
+
+
+def large_thread(top_level, depth=1):
+    comments = []
+    for i in range(top_level):
+        comment = None
+        for level in reversed(range(depth)):
+            comment = Comment(
+                id=f"c{i}_{level}", author=f"user{i}", body="naïve ✓ text " * 40, score=i,
+                created_utc="2021-01-01T00:00:00Z", depth=level, replies=[comment] if comment else [],
+            )
+        comments.append(comment)
+    return Thread(
+        id="t", title="Title", author="op", subreddit="python", url="https://example.com", selftext="",
+        score=1, created_utc="2021-01-01T00:00:00Z", fetched_at="2021-01-01T00:00:00Z",
+        comment_count=top_level * depth, comments=comments,
+    )
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_save_json_memory_is_bounded_by_a_subtree(name, tmp_path):
+    thread = large_thread(3000)
+    jsonbackend.set_backend(name)
+    output = tmp_path / "thread.json"
+
+    tracemalloc.start()
+    try:
+        save_json(thread, output)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    # Encoding the 2.5 MB document whole peaks at about twice its size;
+    # streaming stays near the write buffer
+    assert peak < output.stat().st_size / 4
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_save_json_handles_reply_chains_too_deep_for_the_backend(name, tmp_path):
+    thread = large_thread(2, depth=1500)
+    jsonbackend.set_backend(name)
+
+    save_json(thread, tmp_path / "thread.json")
+
+    assert (tmp_path / "thread.json").read_text(encoding="utf-8") == "".join(iter_thread_json(thread))
+
+
+def test_cli_rejects_unknown_backend():
+    result = CliRunner().invoke(main, ["fetch", "https://www.reddit.com/r/a/comments/b/c/", "--json-backend", "yaml"])
+
+    assert result.exit_code == 2
+    assert "Unknown JSON backend" in result.output
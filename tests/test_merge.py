@@ -0,0 +1,132 @@
+"""Tests for merging refreshed threads."""
+
+import copy
+import json
+
+import httpx
+from click.testing import CliRunner
+
+from getred.cli import main
+from getred.fetcher import RedditFetcher
+from getred.merge import merge_thread, thread_permalink
+from getred.models import Thread, parse_fields
+from getred.parser import parse_thread
+
+
+def with_comments(thread_json, comments):
+    data = copy.deepcopy(thread_json)
+    data[1]["data"]["children"] = comments
+    return data
+
+
+def test_merge_adds_new_and_updates_changed_comments(sample_thread_json, raw_comment):
+    old = parse_thread(with_comments(sample_thread_json, [
+        raw_comment("a", replies=[raw_comment("b")]),
+        raw_comment("gone"),
+    ]))
+    fresh = parse_thread(with_comments(sample_thread_json, [
+        raw_comment("a", body="edited", replies=[raw_comment("b", score=7, replies=[raw_comment("c")])]),
+        raw_comment("d", replies=[raw_comment("e")]),
+    ]))
+
+    delta = merge_thread(old, fresh)
+
+    assert [c.id for c in old.comments] == ["a", "gone", "d"]
+    a = old.comments[0]
+    assert a.body == "edited"
+    assert a.replies[0].score == 7
+    assert a.replies[0].replies[0].id == "c"
+    assert a.replies[0].replies[0].depth == 2
+    assert old.comments[2].replies[0].id == "e"
+    assert delta.updated == [{"id": "a", "body": "edited"}, {"id": "b", "score": 7}]
+    assert [(r["id"], r["parent_id"]) for r in delta.added] == [("c", "b"), ("d", None), ("e", "d")]
+    assert old.fetched_at == fresh.fetched_at
+
+
+def test_merge_without_changes_keeps_fetched_at(sample_thread_json):
+    old = parse_thread(sample_thread_json)
+    old.fetched_at = "2020-01-01T00:00:00Z"
+    fresh = parse_thread(sample_thread_json)
+
+    delta = merge_thread(old, fresh)
+
+    assert not delta.changed
+    assert old.fetched_at == "2020-01-01T00:00:00Z"
+
+
+def test_thread_from_dict_round_trip(sample_thread_json, raw_comment):
+    thread = parse_thread(with_comments(sample_thread_json, [raw_comment("a", replies=[raw_comment("b")])]))
+    assert Thread.from_dict(json.loads(json.dumps(thread.to_dict()))) == thread
+
+
+def test_thread_permalink(sample_thread_json):
+    thread = parse_thread(sample_thread_json)
+    assert thread_permalink(thread) == "https://www.reddit.com/r/python/comments/thread123/?sort=new"
+
+
+def test_refresh_command_writes_merged_thread_and_delta(tmp_path, sample_thread_json, raw_comment, monkeypatch):
+    saved = tmp_path / "thread.json"
+    saved.write_text(json.dumps(parse_thread(sample_thread_json).to_dict()), encoding="utf-8")
+    fresh_json = with_comments(sample_thread_json, [raw_comment("comment1"), raw_comment("new")])
+    seen_urls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_urls.append(str(request.url))
+        return httpx.Response(200, json=fresh_json, request=request)
+
+    monkeypatch.setattr(
+        "getred.cli.make_fetcher", lambda *args, **kwargs: RedditFetcher(transport=httpx.MockTransport(handler))
+    )
+    delta_path = tmp_path / "delta.json"
+
+    result = CliRunner().invoke(main, ["refresh", str(saved), "--delta", str(delta_path)])
+
+    assert result.exit_code == 0, result.output
+    assert seen_urls == ["https://www.reddit.com/r/python/comments/thread123/.json?sort=new"]
+    merged = json.loads(saved.read_text(encoding="utf-8"))
+    assert [c["id"] for c in merged["comments"]] == ["comment1", "new"]
+    delta = json.loads(delta_path.read_text(encoding="utf-8"))
+    assert [c["id"] for c in delta["added"]] == ["new"]
+    assert "1 new comments" in result.output
+
+
+def test_thread_from_dict_restores_field_projection(sample_thread_json, raw_comment):
+    thread = parse_thread(
+        with_comments(sample_thread_json, [raw_comment("a", replies=[raw_comment("b")])]), fields=parse_fields(["body"])
+    )
+
+    loaded = Thread.from_dict(json.loads(json.dumps(thread.to_dict())))
+
+    assert loaded.fields == thread.fields == frozenset({"id", "body"})
+    assert loaded.to_dict() == thread.to_dict()
+    assert loaded.comments[0].replies[0].depth == 1
+    assert thread_permalink(loaded) == "https://www.reddit.com/comments/thread123/?sort=new"
+
+
+def test_refresh_command_keeps_field_projection(tmp_path, sample_thread_json, raw_comment, monkeypatch):
+    fields = parse_fields(["author", "body"])
+    saved = tmp_path / "thread.json"
+    saved.write_text(json.dumps(parse_thread(sample_thread_json, fields=fields).to_dict()), encoding="utf-8")
+    fresh_json = with_comments(sample_thread_json, [
+        raw_comment("comment1", score=99, author="user1", body="First comment"),
+        raw_comment("new"),
+    ])
+    seen_urls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_urls.append(str(request.url))
+        return httpx.Response(200, json=fresh_json, request=request)
+
+    monkeypatch.setattr(
+        "getred.cli.make_fetcher", lambda *args, **kwargs: RedditFetcher(transport=httpx.MockTransport(handler))
+    )
+
+    result = CliRunner().invoke(main, ["refresh", str(saved)])
+
+    assert result.exit_code == 0, result.output
+    assert seen_urls == ["https://www.reddit.com/comments/thread123/.json?sort=new"]
+    merged = json.loads(saved.read_text(encoding="utf-8"))
+    assert set(merged) == {"id", "author", "comments"}
+    assert merged["comments"][1] == {"id": "new", "author": "user", "body": "new", "replies": []}
+    # score is not in the projection, so its change is not an update
+    assert "1 new comments, 0 updated comments" in result.output
@@ -62,6 +62,26 @@ class TestCommentToDict:
         assert result["replies"][0]["depth"] == 1
         assert result["replies"][0]["replies"] == []
 
+    def test_comment_to_dict_deep_chain(self):
+        """Serializes reply chains deeper than the recursion limit."""
+        comment = Comment(
+            id="leaf", author="u", body="b", score=0,
+            created_utc="2021-01-01T00:00:00Z", depth=4999, replies=[]
+        )
+        for depth in range(4998, -1, -1):
+            comment = Comment(
+                id=str(depth), author="u", body="b", score=0,
+                created_utc="2021-01-01T00:00:00Z", depth=depth, replies=[comment]
+            )
+
+        result = comment.to_dict()
+
+        for depth in range(4999):
+            assert result["depth"] == depth
+            result = result["replies"][0]
+        assert result["id"] == "leaf"
+        assert result["replies"] == []
+
 
 class TestThreadToDict:
     """Tests for Thread.to_dict() method."""
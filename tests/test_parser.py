@@ -1,7 +1,7 @@
 """Tests for Reddit JSON parser."""
 
 import pytest
-from getred.parser import parse_timestamp, parse_comment, parse_comments, parse_thread
+from getred.parser import build_comment, parse_timestamp, parse_comment, parse_comments, parse_thread
 from getred.models import Comment, Thread
 
 
@@ -26,10 +26,20 @@ class TestParseComment:
         assert comment.author == "test_user"
         assert comment.body == "This is a test comment"
         assert comment.score == 42
-        assert comment.created_utc == "2021-01-01T00:00:00Z"
+        # Kept as the raw timestamp, formatted on output
+        assert comment.created_utc == 1609459200.0
+        assert comment.to_dict()["created_utc"] == "2021-01-01T00:00:00Z"
         assert comment.depth == 0
         assert comment.replies == []
 
+    def test_build_comment_ignores_replies(self, sample_comment_with_replies):
+        """build_comment builds only the comment itself."""
+        comment = build_comment(sample_comment_with_replies["data"], depth=2)
+
+        assert comment.id == "parent123"
+        assert comment.depth == 2
+        assert comment.replies == []
+
     def test_parse_comment_with_replies(self, sample_comment_with_replies):
         """Handles nested replies and depth tracking."""
         parent = parse_comment(sample_comment_with_replies, depth=0)
@@ -64,6 +74,19 @@ class TestParseComment:
         assert comment.author == "[deleted]"
         assert comment.body == "[removed]"
 
+    def test_parse_comment_null_author(self):
+        """A null author is treated as deleted, in replies and projections too."""
+        def raw(comment_id, replies=""):
+            return {"kind": "t1", "data": {"id": comment_id, "author": None, "body": "text", "replies": replies}}
+
+        data = raw("parent", {"kind": "Listing", "data": {"children": [raw("child")]}})
+
+        comment = parse_comment(data, depth=0)
+        assert comment.author == "[deleted]"
+        assert comment.replies[0].author == "[deleted]"
+        projected = parse_comment(data, depth=0, fields=frozenset({"id", "author"}))
+        assert projected.author == projected.replies[0].author == "[deleted]"
+
 
 class TestParseComments:
     """Tests for parse_comments function."""
@@ -130,3 +153,45 @@ class TestParseThread:
         # Should only parse t1 comments, not 'more' objects
         assert len(thread.comments) == 1
         assert thread.comments[0].id == "comment1"
+
+
+class TestDeepThreads:
+    """Tests for reply chains deeper than the recursion limit."""
+
+    def test_parse_comment_deep_chain(self):
+        """Parses a reply chain far deeper than sys.getrecursionlimit()."""
+        depth = 5000
+        raw = {"kind": "t1", "data": {"id": str(depth - 1), "replies": ""}}
+        for i in range(depth - 2, -1, -1):
+            raw = {
+                "kind": "t1",
+                "data": {
+                    "id": str(i),
+                    "replies": {"kind": "Listing", "data": {"children": [raw]}},
+                },
+            }
+
+        comment = parse_comment(raw)
+
+        for i in range(depth):
+            assert comment.id == str(i)
+            assert comment.depth == i
+            if i < depth - 1:
+                assert len(comment.replies) == 1
+                comment = comment.replies[0]
+        assert comment.replies == []
+
+    def test_parse_comment_preserves_reply_order(self):
+        """Siblings keep their listing order."""
+        children = [
+            {"kind": "t1", "data": {"id": f"c{i}", "replies": ""}}
+            for i in range(5)
+        ]
+        raw = {
+            "kind": "t1",
+            "data": {"id": "root", "replies": {"kind": "Listing", "data": {"children": children}}},
+        }
+
+        comment = parse_comment(raw)
+
+        assert [reply.id for reply in comment.replies] == ["c0", "c1", "c2", "c3", "c4"]
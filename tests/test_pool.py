@@ -0,0 +1,126 @@
+"""Tests for the pooled session and connection reuse statistics."""
+
+import importlib.util
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from getred.fetcher import RedditFetcher
+from getred import pool
+from getred.cli import make_fetcher
+from getred.pool import DEFAULT_LIMITS, ConnectionStats, accept_encoding, http2_available, pool_limits
+from getred.ratelimit import RateLimiter
+from getred.timings import Timings
+
+
+@pytest.fixture
+def server(sample_thread_json):
+    body = json.dumps(sample_thread_json).encode()
+    headers_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            headers_seen.append(dict(self.headers))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}/r/python/comments/thread123/title/", headers_seen
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_shared_client_reuses_one_connection(server):
+    url, headers_seen = server
+    timings = Timings()
+    fetcher = RedditFetcher(rate_limiter=RateLimiter(rate=1000, burst=10), timings=timings)
+
+    with fetcher:
+        for _ in range(3):
+            fetcher.fetch_thread(url)
+
+    assert fetcher.connection_stats.to_dict() == {"requests": 3, "opened": 1, "reused": 2, "http2": 0}
+    assert fetcher.connection_stats.reuse_ratio == pytest.approx(2 / 3)
+    assert timings.requests == 3 and "connect" in timings.phases
+    assert headers_seen[0]["Accept-Encoding"] == accept_encoding()
+
+
+def test_one_off_clients_open_a_connection_per_call(server):
+    url, _ = server
+    fetcher = RedditFetcher()
+
+    fetcher.fetch_thread(url)
+    fetcher.fetch_thread(url)
+
+    assert (fetcher.connection_stats.opened, fetcher.connection_stats.reused) == (2, 0)
+
+
+def test_mocked_transport_is_not_counted(sample_thread_json):
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=sample_thread_json))
+    fetcher = RedditFetcher(transport=transport)
+
+    fetcher.fetch_thread("https://www.reddit.com/r/python/comments/thread123/title/")
+
+    assert fetcher.connection_stats.requests == 0
+
+
+def test_pool_settings():
+    limits = httpx.Limits(max_connections=4, max_keepalive_connections=2)
+    fetcher = RedditFetcher(limits=limits)
+
+    assert fetcher.limits is limits
+    assert fetcher.http2 is http2_available()
+    assert "gzip" in accept_encoding()
+    brotli = any(importlib.util.find_spec(name) for name in ("brotli", "brotlicffi"))
+    assert ("br" in accept_encoding()) == brotli
+
+
+def test_cli_fetcher_pools_with_its_settings(monkeypatch):
+    built = []
+
+    def network_transport(limits=None, http2=None):
+        built.append((limits, http2))
+        return httpx.MockTransport(lambda request: httpx.Response(200))
+
+    monkeypatch.setattr(pool, "network_transport", network_transport)
+
+    with make_fetcher(max_connections=4, http2=False) as fetcher:
+        assert fetcher.limits.max_connections == 4
+        assert fetcher.http2 is False
+    assert built == [(fetcher.limits, False)]
+
+    with make_fetcher() as fetcher:
+        assert fetcher.limits is DEFAULT_LIMITS
+        assert fetcher.http2 is http2_available()
+    assert built[-1] == (DEFAULT_LIMITS, http2_available())
+
+
+def test_pool_limits_keep_every_connection_alive():
+    limits = pool_limits(8)
+
+    assert limits.max_connections == limits.max_keepalive_connections == 8
+    assert limits.keepalive_expiry == DEFAULT_LIMITS.keepalive_expiry
+    assert pool_limits() is DEFAULT_LIMITS
+
+
+def test_tracer_forwards_events():
+    events = []
+    trace = ConnectionStats().tracer(lambda event, info: events.append(event))
+
+    trace("http11.send_request_headers.started", {})
+
+    assert events == ["http11.send_request_headers.started"]
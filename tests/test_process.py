@@ -0,0 +1,47 @@
+"""Tests for the worker process side of batch runs."""
+
+import json
+from concurrent.futures import Future
+
+from getred.parser import parse_thread
+from getred.process import ProcessedThread, chunk_results, save_raw_thread, save_raw_threads
+from getred.sqlite import ThreadDatabase
+
+URL = "https://www.reddit.com/r/python/comments/thread123/title/"
+
+
+def test_save_raw_thread_writes_file_and_database(tmp_path, sample_thread_json):
+    body = json.dumps(sample_thread_json).encode("utf-8")
+    output_path = tmp_path / "thread.ndjson"
+
+    processed = save_raw_thread(URL, body, output_path, "ndjson", database_path=str(tmp_path / "archive.db"))
+
+    assert processed.error is None
+    assert processed.comment_count == parse_thread(sample_thread_json).comment_count
+    assert set(processed.phases) == {"decode", "parse", "write"}
+    assert json.loads(output_path.read_text(encoding="utf-8").splitlines()[0])["id"] == "thread123"
+    with ThreadDatabase(tmp_path / "archive.db") as db:
+        assert db.thread_ids() == ["thread123"]
+
+
+def test_save_raw_threads_captures_errors_per_job(tmp_path, sample_thread_json):
+    jobs = [
+        (URL, b"<html>Too Many Requests</html>", tmp_path / "bad.json"),
+        (URL, json.dumps(sample_thread_json).encode("utf-8"), tmp_path / "good.json"),
+    ]
+
+    bad, good = save_raw_threads(jobs)
+
+    assert "Non-JSON response" in bad.error
+    assert good.error is None
+    assert [p.name for p in tmp_path.iterdir()] == ["good.json"]
+
+
+def test_chunk_results_reports_failed_chunk_for_every_job():
+    future = Future()
+    future.set_exception(RuntimeError("worker died"))
+    jobs = [(URL, b"", None), (URL, b"", None)]
+
+    results = list(chunk_results(future, jobs))
+
+    assert [processed for _, processed in results] == [ProcessedThread(error="worker died")] * 2
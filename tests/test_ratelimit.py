@@ -0,0 +1,150 @@
+"""Tests for rate limiting and retries."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from getred.fetcher import AsyncRedditFetcher, RedditFetcher
+from getred.ratelimit import RateLimitedTransport, RateLimiter, RetryPolicy, parse_retry_after
+
+URL = "https://www.reddit.com/r/python/comments/abc123/title/"
+NO_WAIT = RetryPolicy(max_retries=2, backoff_base=0)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_limiter_allows_burst_then_spaces_requests():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=2.0, burst=2, clock=clock)
+
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(0.5)
+    assert limiter.reserve() == pytest.approx(1.0)
+
+    clock.now = 10.0
+    assert limiter.reserve() == 0
+
+
+def test_limiter_follows_rate_limit_headers():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=10.0, burst=5, clock=clock)
+
+    limiter.update(httpx.Response(200, headers={"X-Ratelimit-Remaining": "10", "X-Ratelimit-Reset": "100"}))
+    assert limiter.rate == pytest.approx(0.1)
+
+    limiter.update(httpx.Response(200, headers={"X-Ratelimit-Remaining": "0", "X-Ratelimit-Reset": "30"}))
+    assert limiter.reserve() == pytest.approx(30.0)
+
+
+def test_limiter_blocks_after_429():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=1.0, burst=5, clock=clock)
+    limiter.update(httpx.Response(429, headers={"Retry-After": "7"}))
+    assert limiter.reserve() == pytest.approx(7.0)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_retry_policy_delays():
+    policy = RetryPolicy(max_retries=2, backoff_base=1.0, backoff_max=3.0)
+    assert 0.5 <= policy.delay(0, httpx.Response(503)) <= 1.0
+    assert 1.0 <= policy.delay(1, None) <= 2.0
+    assert policy.delay(2, httpx.Response(503)) is None
+    assert policy.delay(0, httpx.Response(404)) is None
+    assert policy.delay(0, httpx.Response(429, headers={"Retry-After": "4"})) == 4.0
+    assert policy.delay(0, httpx.Response(429, headers={"Retry-After": "3600"})) is None
+
+
+def flaky_handler(failures, status=503):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) <= failures:
+            return httpx.Response(status, headers={"Retry-After": "0"}, request=request)
+        return httpx.Response(200, json={"ok": True}, request=request)
+
+    return handler, calls
+
+
+def test_fetcher_retries_transient_errors():
+    handler, calls = flaky_handler(2)
+    fetcher = RedditFetcher(transport=httpx.MockTransport(handler), retry=NO_WAIT)
+
+    assert fetcher.fetch_thread(URL) == {"ok": True}
+    assert len(calls) == 3
+    assert fetcher.retry_count == 2
+
+
+def test_fetcher_gives_up_after_max_retries():
+    handler, calls = flaky_handler(5, status=429)
+    fetcher = RedditFetcher(transport=httpx.MockTransport(handler), retry=NO_WAIT)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        fetcher.fetch_thread(URL)
+    assert len(calls) == 3
+
+
+def test_fetcher_retries_transport_errors():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("connection reset", request=request)
+        return httpx.Response(200, json={"ok": True}, request=request)
+
+    fetcher = RedditFetcher(transport=httpx.MockTransport(handler), retry=NO_WAIT)
+    assert fetcher.fetch_thread(URL) == {"ok": True}
+
+
+def test_stream_thread_retries(sample_thread_json):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(502, request=request)
+        return httpx.Response(200, json=sample_thread_json, request=request)
+
+    fetcher = RedditFetcher(transport=httpx.MockTransport(handler), retry=NO_WAIT)
+    thread = fetcher.stream_thread(URL)
+    assert thread.id == "thread123"
+    assert fetcher.retry_count == 1
+
+
+def test_rate_limiter_sees_every_request():
+    clock = FakeClock()
+    limiter = RateLimiter(rate=1.0, burst=3, clock=clock)
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={}, request=request))
+    fetcher = RedditFetcher(transport=transport, rate_limiter=limiter)
+    assert isinstance(fetcher.transport, RateLimitedTransport)
+
+    with fetcher:
+        for _ in range(3):
+            fetcher.fetch_thread(URL)
+    assert limiter.reserve() == pytest.approx(1.0)
+
+
+def test_async_fetcher_retries():
+    handler, calls = flaky_handler(1, status=500)
+
+    async def run():
+        fetcher = AsyncRedditFetcher(transport=httpx.MockTransport(handler), retry=NO_WAIT)
+        result = await fetcher.fetch_thread(URL)
+        return result, fetcher.retry_count
+
+    assert asyncio.run(run()) == ({"ok": True}, 1)
@@ -0,0 +1,100 @@
+"""Tests for the SQLite archive."""
+
+import sqlite3
+
+from click.testing import CliRunner
+
+from getred.cli import main
+from getred.filters import CommentFilter
+from getred.models import parse_fields
+from getred.parser import parse_thread
+from getred.sqlite import ThreadDatabase
+from getred.utils import save_json
+
+
+def test_save_and_load_round_trip(tmp_path, sample_thread_with_reply):
+    thread = parse_thread(sample_thread_with_reply)
+
+    with ThreadDatabase(tmp_path / "archive.db") as db:
+        db.save(thread)
+        assert db.thread_ids() == ["thread123"]
+        assert db.load_thread("thread123") == thread
+        assert db.load_thread("missing") is None
+
+
+def test_round_trip_keeps_pruned_count(tmp_path, sample_thread_with_reply):
+    thread = parse_thread(sample_thread_with_reply, CommentFilter(min_score=5))
+
+    with ThreadDatabase(tmp_path / "archive.db") as db:
+        db.save(thread)
+        loaded = db.load_thread("thread123")
+
+    assert loaded.pruned_count == thread.pruned_count == 1
+    assert loaded.to_dict() == thread.to_dict()
+
+
+def test_refetch_updates_in_place(tmp_path, sample_thread_json, sample_thread_with_reply):
+    thread = parse_thread(sample_thread_json)
+    changed = sample_thread_with_reply
+    changed[1]["data"]["children"][0]["data"]["score"] = 99
+    refetched = parse_thread(changed)
+
+    with ThreadDatabase(tmp_path / "archive.db") as db:
+        db.save(thread)
+        db.save(refetched)
+        count = db._conn.execute("SELECT COUNT(*) FROM comments").fetchone()[0]
+        stored = db.load_thread("thread123")
+
+    assert count == 2
+    assert stored.comments[0].score == 99
+    assert stored.comments[0].replies[0].id == "reply1"
+
+
+def test_comments_by_author_uses_index(tmp_path, sample_thread_with_reply):
+    with ThreadDatabase(tmp_path / "archive.db") as db:
+        db.save(parse_thread(sample_thread_with_reply))
+        records = db.comments_by_author("user2")
+        plan = db._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM comments WHERE author = ?", ("x",)
+        ).fetchall()
+
+    assert [(r["id"], r["parent_id"], r["thread_id"]) for r in records] == [("reply1", "comment1", "thread123")]
+    assert "comments_author" in str(plan)
+
+
+def test_database_uses_wal(tmp_path):
+    ThreadDatabase(tmp_path / "archive.db").close()
+    conn = sqlite3.connect(str(tmp_path / "archive.db"))
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+
+def test_import_command(tmp_path, sample_thread_with_reply):
+    thread = parse_thread(sample_thread_with_reply)
+    json_path = tmp_path / "thread.json"
+    save_json(thread, json_path)
+    bad_path = tmp_path / "bad.json"
+    bad_path.write_text("not json")
+    db_path = tmp_path / "archive.db"
+
+    result = CliRunner().invoke(main, ["import", str(db_path), str(json_path), str(bad_path)])
+
+    assert result.exit_code == 1
+    assert "Imported 1/2 files" in result.output
+    with ThreadDatabase(db_path) as db:
+        assert db.load_thread("thread123") == thread
+
+
+def test_import_command_accepts_field_projection(tmp_path, sample_thread_with_reply):
+    json_path = tmp_path / "thread.json"
+    save_json(parse_thread(sample_thread_with_reply, fields=parse_fields(["author", "score"])), json_path)
+    db_path = tmp_path / "archive.db"
+
+    result = CliRunner().invoke(main, ["import", str(db_path), str(json_path)])
+
+    assert result.exit_code == 0, result.output
+    with ThreadDatabase(db_path) as db:
+        thread = db.load_thread("thread123")
+    assert (thread.author, thread.score, thread.title) == ("thread_author", 500, None)
+    reply = thread.comments[0].replies[0]
+    assert (reply.id, reply.author, reply.score, reply.depth, reply.body) == ("reply1", "user2", 3, 1, None)
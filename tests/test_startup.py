@@ -0,0 +1,52 @@
+"""Tests that starting the CLI stays cheap."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Modules only the commands that fetch, parse or write may load
+HEAVY_MODULES = ["httpx", "importlib.metadata", "sqlite3", "getred.fetcher", "getred.parser", "getred.writer"]
+
+# Generous wall-clock budget for importing getred.cli in a fresh interpreter
+# (about 40 ms on a laptop), so that slow CI machines do not fail
+IMPORT_BUDGET_SECONDS = 0.5
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from getred.cli import main
+elapsed = time.perf_counter() - start
+try:
+    main(sys.argv[1:], standalone_mode=False)
+except SystemExit:
+    pass
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "heavy": heavy}}), file=sys.stderr)
+"""
+
+
+def run_cli(*args):
+    code = PROBE.format(heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, "-c", code, *args], capture_output=True, text=True, check=True)
+    report = json.loads(result.stderr.strip().splitlines()[-1])
+    return result.stdout, report["elapsed"], report["heavy"]
+
+
+@pytest.mark.parametrize("args", [["--help"], ["not-a-url"], ["crawl", "not a subreddit"]])
+def test_cli_startup_does_not_import_heavy_modules(args):
+    _, _, heavy = run_cli(*args)
+    assert heavy == []
+
+
+def test_version_is_read_only_when_asked_for():
+    output, _, heavy = run_cli("--version")
+    assert "getred, version" in output
+    assert heavy == ["importlib.metadata"]
+
+
+def test_cli_import_time_budget():
+    # Best of three to ignore a cold disk cache
+    elapsed = min(run_cli("--help")[1] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_SECONDS
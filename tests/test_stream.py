@@ -0,0 +1,130 @@
+"""Tests for incremental parsing of thread responses."""
+
+import json
+
+import httpx
+import pytest
+
+from getred.fetcher import RedditFetcher
+from getred.parser import collect_more_ids, parse_thread
+from getred.stream import JsonValueSplitter, ThreadStreamParser, parse_thread_stream
+
+
+def chunked(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.fixture
+def tricky_thread_json(sample_thread_json, sample_comment_with_replies):
+    comments = sample_thread_json[1]["data"]["children"]
+    comments.insert(0, sample_comment_with_replies)
+    comments[0]["data"]["body"] = 'Braces {[ ]} "quoted" \\ back\\slash, commas: ✓ 🐍'
+    comments[0]["data"]["author"] = "ünïcödé"
+    return sample_thread_json
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 100000])
+def test_parse_thread_stream_matches_parse_thread(tricky_thread_json, chunk_size):
+    raw = json.dumps(tricky_thread_json, ensure_ascii=False).encode("utf-8")
+    expected = parse_thread(tricky_thread_json)
+    more_ids = []
+
+    thread = parse_thread_stream(chunked(raw, chunk_size), more_ids=more_ids)
+
+    thread.fetched_at = expected.fetched_at
+    assert thread == expected
+    assert more_ids == collect_more_ids(tricky_thread_json[1]["data"]["children"])
+
+
+def test_feed_emits_comments_as_they_close(sample_thread_json):
+    raw = json.dumps(sample_thread_json).encode("utf-8")
+    end_of_comment = raw.index(b'"more"')
+    parser = ThreadStreamParser()
+
+    emitted = parser.feed(raw[:end_of_comment])
+    assert [c.id for c in emitted] == ["comment1"]
+    assert parser.feed(raw[end_of_comment:]) == []
+    assert parser.close().comments == emitted
+
+
+def test_splitter_discards_bytes_outside_selected_values():
+    splitter = JsonValueSplitter(lambda path: path == (1,))
+    splitter.feed(b'[{"skip": "' + b"x" * 10000 + b'"}, ')
+    assert len(splitter._buf) < 100
+
+    values = splitter.feed(b'{"keep": [1, 2]}]')
+    assert splitter.close() == []
+    assert values == [((1,), {"keep": [1, 2]})]
+
+
+def test_splitter_decodes_values_spanning_many_chunks():
+    raw = json.dumps([{"big": ["x" * 10] * 1000}]).encode("utf-8")
+    splitter = JsonValueSplitter(lambda path: path == (0,))
+
+    values = []
+    for chunk in chunked(raw, 50):
+        values.extend(splitter.feed(chunk))
+    values.extend(splitter.close())
+
+    assert values == [((0,), {"big": ["x" * 10] * 1000})]
+
+
+def test_splitter_decodes_a_large_value_once(monkeypatch):
+    big = {"replies": [{"body": "y" * 1000, "replies": [{"id": i}]} for i in range(4000)]}
+    raw = json.dumps([big]).encode("utf-8")
+    splitter = JsonValueSplitter(lambda path: path == (0,))
+    decode = splitter._json_decoder.raw_decode
+    calls = []
+    monkeypatch.setattr(splitter._json_decoder, "raw_decode", lambda *args: calls.append(1) or decode(*args))
+
+    values = []
+    for chunk in chunked(raw, 4096):
+        values.extend(splitter.feed(chunk))
+    values.extend(splitter.close())
+
+    assert len(raw) > 4_000_000
+    assert values == [((0,), big)]
+    assert len(calls) == 1
+
+
+def test_splitter_tracks_strings_split_anywhere():
+    value = {"body": 'a "quoted" ] } [ { \\ and \\" ✓', "nested": [{"x": "\\"}]}
+    raw = json.dumps([value, {"after": 1}]).encode("utf-8")
+    splitter = JsonValueSplitter(lambda path: len(path) == 1)
+
+    values = []
+    for chunk in chunked(raw, 1):
+        values.extend(splitter.feed(chunk))
+    values.extend(splitter.close())
+
+    assert values == [((0,), value), ((1,), {"after": 1})]
+
+
+@pytest.mark.parametrize("raw", [b"<html>nope</html>", b'[{"a": 1}', b"[] []"])
+def test_splitter_rejects_malformed_streams(raw):
+    splitter = JsonValueSplitter(lambda path: False)
+    with pytest.raises(ValueError):
+        splitter.feed(raw)
+        splitter.close()
+
+
+def test_stream_thread_over_http(sample_thread_json):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=sample_thread_json, request=request)
+
+    fetcher = RedditFetcher(transport=httpx.MockTransport(handler))
+    thread = fetcher.stream_thread("https://www.reddit.com/r/python/comments/thread123/title/")
+
+    assert thread.id == "thread123"
+    assert [c.id for c in thread.comments] == ["comment1"]
+
+
+def test_stream_thread_non_json_body_raises_clear_error():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, headers={"Content-Type": "text/html"}, content=b"<html>not json</html>", request=request
+        )
+
+    fetcher = RedditFetcher(transport=httpx.MockTransport(handler))
+    with pytest.raises(ValueError, match="Non-JSON response"):
+        fetcher.stream_thread("https://www.reddit.com/r/python/comments/thread123/title/")
@@ -0,0 +1,72 @@
+"""Tests for the columnar CommentTable."""
+
+import pytest
+
+from getred.models import parse_fields
+from getred.parser import parse_comments, parse_thread
+from getred.table import CommentTable
+
+
+@pytest.fixture
+def listing(sample_comment_with_replies, sample_thread_json):
+    return [sample_comment_with_replies] + sample_thread_json[1]["data"]["children"]
+
+
+def test_from_listing_matches_parse_comments(listing):
+    table = CommentTable.from_listing(listing)
+
+    assert len(table) == 3
+    assert table.ids == ["parent123", "child123", "comment1"]
+    assert list(table.parents) == [-1, 0, -1]
+    assert table.to_comments() == parse_comments(listing)
+
+
+def test_from_comments_round_trip(listing):
+    comments = parse_comments(listing)
+
+    table = CommentTable.from_comments(comments)
+
+    assert table.to_comments() == comments
+    assert list(table.created_utc) == [1609459200.0, 1609462800.0, 1609462800.0]
+
+
+def test_from_comments_without_timestamps(listing):
+    comments = parse_comments(listing, fields=parse_fields(["author"]))
+
+    table = CommentTable.from_comments(comments)
+
+    assert table[0].created_utc is None
+    assert table.to_comments() == comments
+
+
+def test_authors_are_stored_once():
+    table = CommentTable()
+    for i in range(5):
+        table.append(id=str(i), author="same_user", body="b", score=i, created_utc=0.0, depth=0)
+
+    assert table.authors == ["same_user"]
+    assert list(table.author_index) == [0] * 5
+
+
+def test_views_are_lazy_and_navigable(listing):
+    table = CommentTable.from_listing(listing)
+
+    parent = table[0]
+    child = parent.replies[0]
+
+    assert child.id == "child123"
+    assert child.author == "child_user"
+    assert child.created_utc == "2021-01-01T01:00:00Z"
+    assert child.created_utc_timestamp == 1609462800.0
+    assert child.parent == parent
+    assert [view.id for view in table] == table.ids
+    assert [table[row].id for row in table.roots()] == ["parent123", "comment1"]
+    assert parent.to_dict() == parse_comments(listing)[0].to_dict()
+    with pytest.raises(IndexError):
+        table[3]
+
+
+def test_thread_comments_into_table(sample_thread_json):
+    thread = parse_thread(sample_thread_json)
+    table = CommentTable.from_comments(thread.comments)
+    assert table[0].body == "First comment"
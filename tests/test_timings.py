@@ -0,0 +1,101 @@
+"""Tests for per-phase timings."""
+
+import json
+
+import httpx
+from click.testing import CliRunner
+
+from getred import cli
+from getred.batch import fetch_one
+from getred.fetcher import RedditFetcher
+from getred.ratelimit import RateLimitedTransport, RateLimiter, RetryPolicy
+from getred.timings import Timings
+
+URL = "https://www.reddit.com/r/python/comments/abc123/title/"
+
+
+def mock_transport(sample_thread_json, failures=0):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) <= failures:
+            return httpx.Response(503, request=request)
+        return httpx.Response(200, json=sample_thread_json, request=request)
+
+    return httpx.MockTransport(handler)
+
+
+def test_fetch_one_records_every_phase(tmp_path, sample_thread_json):
+    events = []
+    timings = Timings(on_phase=lambda phase, seconds: events.append(phase))
+    fetcher = RedditFetcher(
+        transport=mock_transport(sample_thread_json, failures=1),
+        retry=RetryPolicy(backoff_base=0),
+        timings=timings,
+    )
+
+    item = fetch_one(fetcher, URL, output_dir=tmp_path)
+
+    assert item.ok
+    assert set(timings.phases) == {"wait", "ttfb", "download", "decode", "parse", "write"}
+    assert events.count("ttfb") == 2
+    assert timings.requests == 2
+    assert timings.retries == 1
+    assert timings.bytes_received == len(httpx.Response(200, json=sample_thread_json).content)
+    assert (timings.threads, timings.comments) == (1, 1)
+
+
+def test_stream_thread_records_download_and_counts(sample_thread_json):
+    timings = Timings()
+    fetcher = RedditFetcher(transport=mock_transport(sample_thread_json), timings=timings)
+
+    fetcher.stream_thread(URL)
+
+    assert "download" in timings.phases
+    assert timings.bytes_received > 0
+    assert timings.comments == 1
+
+
+def test_rate_limit_wait_is_separated_from_ttfb(sample_thread_json):
+    timings = Timings()
+    limiter = RateLimiter(rate=100, burst=1)
+    transport = RateLimitedTransport(limiter, mock_transport(sample_thread_json))
+    fetcher = RedditFetcher(transport=transport, timings=timings)
+
+    with fetcher:
+        fetcher.fetch_thread(URL)
+        fetcher.fetch_thread(URL)
+
+    assert timings.phases["wait"] > 0.005
+
+
+def test_report_formats(sample_thread_json):
+    timings = Timings()
+    timings.add("parse", 0.25)
+    timings.add("ttfb", 0.75)
+    timings.count("bytes_received", 2048)
+
+    data = timings.to_dict()
+    assert list(data["phases"]) == ["ttfb", "parse"]
+    assert data["total"] == 1.0
+    text = timings.format()
+    assert "75.0%" in text and "2,048 bytes" in text
+
+
+def test_timings_flag_prints_json_breakdown(tmp_path, sample_thread_json, monkeypatch):
+    def make_fetcher(*args, **kwargs):
+        return RedditFetcher(transport=mock_transport(sample_thread_json), timings=args[-1])
+
+    monkeypatch.setattr(cli, "make_fetcher", make_fetcher)
+    source = tmp_path / "urls.txt"
+    source.write_text(URL)
+
+    result = CliRunner().invoke(
+        cli.main, ["batch", str(source), "-d", str(tmp_path), "-q", "--timings=json"]
+    )
+
+    assert result.exit_code == 0
+    report = json.loads(result.output.strip().splitlines()[-1])
+    assert report["requests"] == 1
+    assert {"ttfb", "decode", "parse", "write"} <= set(report["phases"])
@@ -0,0 +1,68 @@
+"""Tests for the lazy ThreadView."""
+
+import json
+
+import pytest
+
+import getred
+from getred.models import THREAD_FIELDS
+from getred.parser import parse_thread
+from getred.utils import OUTPUT_FORMATS, save_thread
+from getred.view import ThreadView
+from getred.writer import iter_thread_json
+
+
+@pytest.fixture
+def thread_json(sample_thread_with_reply, raw_comment):
+    listing = sample_thread_with_reply[1]["data"]["children"]
+    listing.insert(1, raw_comment("comment2", created_utc=1609470000.0, author="user3", body="Second"))
+    return sample_thread_with_reply
+
+
+def test_post_fields_match_parse_thread_without_parsing_comments(thread_json):
+    view = ThreadView(thread_json)
+    thread = parse_thread(thread_json)
+
+    for key in THREAD_FIELDS:
+        if key != "fetched_at":
+            assert getattr(view, key) == getattr(thread, key)
+    assert len(view.comments) == 2
+    assert view.comments.parsed_count == 0
+
+
+def test_comments_are_parsed_once_on_access(thread_json):
+    view = ThreadView(thread_json)
+
+    second = view.comments[1]
+    assert second.id == "comment2"
+    assert view.comments.parsed_count == 1
+    assert view.comments[-1] is second
+
+    first = next(iter(view.comments))
+    assert first.replies[0].id == "reply1"
+    assert view.comments[0] is first
+    assert view.comments[:] == [first, second]
+
+
+def test_to_thread_and_writers_match_parse_thread(thread_json):
+    view = ThreadView(thread_json)
+    thread = view.to_thread()
+
+    expected = parse_thread(thread_json)
+    expected.fetched_at = thread.fetched_at
+    assert thread == expected
+    assert "".join(iter_thread_json(view)) == json.dumps(view.to_dict(), indent=2, ensure_ascii=False)
+
+
+@pytest.mark.parametrize("output_format", list(OUTPUT_FORMATS))
+def test_save_thread_accepts_a_view(thread_json, tmp_path, output_format):
+    view = ThreadView(thread_json)
+
+    save_thread(view, tmp_path / "view", output_format)
+    save_thread(view.to_thread(), tmp_path / "thread", output_format)
+
+    assert (tmp_path / "view").read_bytes() == (tmp_path / "thread").read_bytes()
+
+
+def test_thread_view_is_exported():
+    assert getred.ThreadView is ThreadView
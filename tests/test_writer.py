@@ -0,0 +1,123 @@
+"""Tests for the streaming JSON writer."""
+
+import io
+import json
+
+import pytest
+
+from getred.models import Comment, Thread
+from getred.models import iter_comments
+from getred.utils import save_json, save_thread
+from getred.writer import comment_record, iter_thread_json, iter_thread_ndjson, thread_record, write_thread_json
+
+
+def make_comment(comment_id, depth, replies=None, body="text"):
+    return Comment(
+        id=comment_id,
+        author="user",
+        body=body,
+        score=-3,
+        created_utc="2021-01-01T00:00:00Z",
+        depth=depth,
+        replies=replies or [],
+    )
+
+
+def make_thread(comments):
+    return Thread(
+        id="thread123",
+        title='Quotes " and \\ backslashes',
+        author="thread_author",
+        subreddit="python",
+        url="https://reddit.com/r/python/comments/thread123/test/",
+        selftext="Ünïcödé ✓ and emoji 🐍\nnew line",
+        score=500,
+        created_utc="2021-01-01T00:00:00Z",
+        fetched_at="2021-01-01T02:00:00Z",
+        comment_count=4,
+        comments=comments,
+    )
+
+
+THREADS = {
+    "no_comments": make_thread([]),
+    "flat": make_thread([make_comment("a", 0), make_comment("b", 0)]),
+    "nested": make_thread([
+        make_comment("a", 0, [
+            make_comment("b", 1, [make_comment("c", 2)]),
+            make_comment("d", 1, body=" \x00 control"),
+        ]),
+        make_comment("e", 0),
+    ]),
+}
+
+
+@pytest.mark.parametrize("name", sorted(THREADS))
+@pytest.mark.parametrize("pretty", [True, False])
+def test_streamed_output_matches_json_dump(name, pretty):
+    thread = THREADS[name]
+    expected = json.dumps(thread.to_dict(), indent=2 if pretty else None, ensure_ascii=False)
+
+    assert "".join(iter_thread_json(thread, pretty=pretty)) == expected
+
+
+def test_write_thread_json_flushes_in_chunks():
+    class CountingWriter(io.StringIO):
+        writes = 0
+
+        def write(self, s):
+            self.writes += 1
+            return super().write(s)
+
+    thread = make_thread([make_comment(str(i), 0) for i in range(100)])
+    fp = CountingWriter()
+
+    write_thread_json(thread, fp, buffer_size=1000)
+
+    assert fp.writes > 1
+    assert json.loads(fp.getvalue()) == thread.to_dict()
+
+
+def test_deep_chain_does_not_recurse():
+    leaf = make_comment("0", 0)
+    root = leaf
+    for i in range(1, 5000):
+        root = make_comment(str(i), 0, [root])
+    thread = make_thread([root])
+
+    text = "".join(iter_thread_json(thread, pretty=False))
+
+    assert text.count('"replies": [{') == 4999
+
+
+def test_save_json_streams_thread(tmp_path):
+    thread = THREADS["nested"]
+    path = tmp_path / "out" / "thread.json"
+
+    save_json(thread, path)
+
+    expected = json.dumps(thread.to_dict(), indent=2, ensure_ascii=False)
+    assert path.read_text(encoding="utf-8") == expected
+
+
+@pytest.mark.parametrize("name", sorted(THREADS))
+def test_ndjson_lines_match_json_dumps_of_records(name):
+    thread = THREADS[name]
+    expected = [json.dumps(thread_record(thread), ensure_ascii=False) + "\n"] + [
+        json.dumps(comment_record(comment, parent.id if parent else None), ensure_ascii=False) + "\n"
+        for comment, parent in iter_comments(thread.comments)
+    ]
+
+    assert list(iter_thread_ndjson(thread)) == expected
+
+
+def test_save_thread_ndjson_is_flat_and_in_tree_order(tmp_path):
+    path = tmp_path / "thread.ndjson"
+
+    save_thread(THREADS["nested"], path, "ndjson")
+
+    header, *comments = [json.loads(line) for line in path.read_text(encoding="utf-8").split("\n")[:-1]]
+    assert "comments" not in header and header["id"] == "thread123"
+    assert [(c["id"], c["parent_id"], c["depth"]) for c in comments] == [
+        ("a", None, 0), ("b", "a", 1), ("c", "b", 2), ("d", "a", 1), ("e", None, 0),
+    ]